@@ -0,0 +1,120 @@
+"""
+Moteur de test de conformité des machines de Mealy sous restrictions d'entrées.
+
+Les sous-modules sont importés à la première utilisation d'un nom exporté : importer
+le paquet ne charge ni Graphviz, ni matplotlib, ni les modules qui ne servent pas.
+"""
+import importlib
+
+# Nom exporté -> sous-module qui le définit
+_EXPORTS = {
+    "MealyMachine": "core",
+    "NFA": "core",
+    "generate_tests": "core",
+    "generate_restricted_tests": "core",
+    "execute_tests": "core",
+    "simple_method": "core",
+    "complex_method": "core",
+    "compare_methods": "core",
+    "validate_methods": "core",
+    "deduplicate_tests": "core",
+    "CompiledMealy": "compiled",
+    "NULL_STATE": "compiled",
+    "DEFAULT_OUTPUT": "compiled",
+    "load_fsm": "fsmlib",
+    "loads_fsm": "fsmlib",
+    "save_fsm": "fsmlib",
+    "dumps_fsm": "fsmlib",
+    "Renderer": "rendering",
+    "build_dot_source": "rendering",
+    "render_graph": "rendering",
+    "render_mealy": "rendering",
+    "render_nfa": "rendering",
+    "load_mealy": "loaders",
+    "load_mealy_json": "loaders",
+    "load_mealy_xml": "loaders",
+    "load_nfa": "loaders",
+    "load_nfa_json": "loaders",
+    "load_nfa_xml": "loaders",
+    "save_mealy_json": "loaders",
+    "save_mealy_xml": "loaders",
+    "save_nfa_json": "loaders",
+    "save_nfa_xml": "loaders",
+    "CompiledNFA": "compiled",
+    "random_mealy": "generators",
+    "random_nfa": "generators",
+    "state_classes": "generators",
+    "METRICS": "metrics",
+    "Metrics": "metrics",
+    "MemoryBudgetExceeded": "memory",
+    "MemoryMonitor": "memory",
+    "IncrementalSuite": "incremental",
+    "MachineDiff": "incremental",
+    "RestrictedSuite": "restriction_update",
+    "MutantSet": "mutation",
+    "compare_suites": "mutation",
+    "greedy_cover": "minimization",
+    "minimize_suite": "minimization",
+    "RestrictedProduct": "product",
+    "checking_sequence": "checking_sequence",
+    "cost_report": "checking_sequence",
+    "find_uio": "uio",
+    "uio_sequences": "uio",
+    "TransferIndex": "transfer",
+    "transition_cover": "transfer",
+    "k_complete_tests": "transfer",
+    "transition_tour": "tour",
+    "check_equivalence": "equivalence",
+    "InputClasses": "alphabet",
+    "compress_alphabet": "alphabet",
+    "IntervalSet": "symbolic",
+    "SymbolicMealy": "symbolic",
+    "SymbolicNFA": "symbolic",
+    "concretize": "symbolic",
+    "generate_symbolic_tests": "symbolic",
+    "minterms": "symbolic",
+    "symbolic_alphabet": "symbolic",
+    "Mealy": "model",
+    "MealyRunner": "model",
+    "Nfa": "model",
+    "State": "model",
+    "Transition": "model",
+    "visualize_performance": "plotting",
+    "iter_tests": "batch",
+    "run_job": "batch",
+    "run_batch": "batch",
+    "read_manifest": "batch",
+    "ResultSink": "sinks",
+    "JsonlSink": "sinks",
+    "CsvSink": "sinks",
+    "ColumnarSink": "sinks",
+    "ColumnarResults": "sinks",
+    "open_sink": "sinks",
+    "load_results": "sinks",
+    "VerdictSink": "sinks",
+    "iter_verdicts": "verdict",
+    "execute_verdicts": "verdict",
+    "ObservationTree": "shrink",
+    "shrink_counterexample": "shrink",
+    "TestEnumerator": "checkpoint",
+    "read_checkpoint": "checkpoint",
+    "write_checkpoint": "checkpoint",
+    "Coordinator": "distributed",
+    "plan_shards": "distributed",
+    "run_worker": "distributed",
+    "run_distributed": "distributed",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    """Importe à la demande le sous-module définissant `name`."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
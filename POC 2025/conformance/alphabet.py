@@ -0,0 +1,98 @@
+from itertools import product
+
+from .compiled import CompiledMealy, CompiledNFA, compile_pair
+from .core import MealyMachine, NFA, generate_restricted_tests, generate_tests
+
+# Classes d'entrées indistinguables dans la machine et dans la restriction
+class InputClasses:
+    def __init__(self, mealy_machine, nfa=None):
+        """
+        Regroupe les entrées qui ont le même effet dans tous les états : même état
+        suivant et même sortie dans la machine de Mealy, mêmes successeurs dans le NFA.
+        La génération peut alors se faire sur un représentant par classe, les séquences
+        concrètes n'étant produites qu'à la demande (voir expand).
+        :param mealy_machine: Instance de MealyMachine ou de CompiledMealy.
+        :param nfa: Instance de NFA ou de CompiledNFA (facultatif).
+        """
+        machine, compiled_nfa = compile_pair(mealy_machine, nfa)
+        self.mealy_machine = mealy_machine.to_mealy() if isinstance(mealy_machine, CompiledMealy) else mealy_machine
+        self.nfa = nfa.to_nfa() if isinstance(nfa, CompiledNFA) else nfa
+        k = machine.num_inputs
+        nfa_columns = {}
+        if compiled_nfa is not None:
+            for input_id, input_symbol in enumerate(compiled_nfa.inputs):
+                nfa_columns[input_symbol] = tuple(tuple(compiled_nfa.successors(state, input_id))
+                                                  for state in range(compiled_nfa.num_states))
+        # Signature d'une entrée : sa colonne dans chaque table
+        classes = {}
+        for input_id, input_symbol in enumerate(machine.inputs):
+            signature = (tuple(machine.next_state[input_id::k]), tuple(machine.output[input_id::k]),
+                         nfa_columns.get(input_symbol))
+            classes.setdefault(signature, []).append(input_symbol)
+        self.classes = list(classes.values())
+        self.representative = {input_symbol: members[0]
+                               for members in self.classes for input_symbol in members}
+        self.members = {members[0]: members for members in self.classes}
+
+    def __len__(self):
+        return len(self.classes)
+
+    def reduce_mealy(self):
+        """Retourne la machine restreinte aux représentants des classes."""
+        transitions = {(state, input_symbol): value
+                       for (state, input_symbol), value in self.mealy_machine.transitions.items()
+                       if input_symbol in self.members}
+        return MealyMachine(transitions, self.mealy_machine.initial_state)
+
+    def reduce_nfa(self):
+        """Retourne le NFA restreint aux représentants des classes (None sans restriction)."""
+        nfa = self.nfa
+        if nfa is None:
+            return None
+        alphabet = [input_symbol for input_symbol in nfa.alphabet if input_symbol in self.members]
+        transitions = {key: value for key, value in nfa.transitions.items() if key[1] in self.members}
+        return NFA(nfa.states, alphabet, transitions, nfa.initial_state, nfa.accepting_states)
+
+    def generate(self, max_length):
+        """
+        Génère les séquences sur les représentants (restreintes si un NFA est fourni).
+        :param max_length: Longueur maximale des séquences.
+        :return: Liste des séquences de représentants.
+        """
+        if self.nfa is None:
+            return generate_tests(self.reduce_mealy().transitions, max_length)
+        return generate_restricted_tests(self.reduce_nfa(), max_length)
+
+    def expand(self, test):
+        """
+        Énumère paresseusement les séquences concrètes représentées par une séquence.
+        :param test: Séquence de représentants.
+        :return: Itérateur de listes de symboles.
+        """
+        members = self.members
+        for concrete in product(*(members[input_symbol] for input_symbol in test)):
+            yield list(concrete)
+
+    def expand_all(self, tests):
+        """Énumère paresseusement les séquences concrètes de toute une suite."""
+        for test in tests:
+            yield from self.expand(test)
+
+    def count(self, tests):
+        """Nombre de séquences concrètes représentées par une suite, sans les énumérer."""
+        total = 0
+        for test in tests:
+            size = 1
+            for input_symbol in test:
+                size *= len(self.members[input_symbol])
+            total += size
+        return total
+
+def compress_alphabet(mealy_machine, nfa=None):
+    """
+    Calcule les classes d'entrées équivalentes d'une machine et de sa restriction.
+    :param mealy_machine: Instance de MealyMachine ou de CompiledMealy.
+    :param nfa: Instance de NFA ou de CompiledNFA (facultatif).
+    :return: Instance de InputClasses.
+    """
+    return InputClasses(mealy_machine, nfa)
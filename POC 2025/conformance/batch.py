@@ -0,0 +1,269 @@
+import json
+import os
+import shlex
+import sys
+import time
+from contextlib import ExitStack
+from itertools import islice
+
+from .core import execute_tests
+from .loaders import load_mealy, load_nfa
+from .sinks import open_sink, result_path, verdict_format
+
+METHODS = ("simple", "complex", "restricted", "k-complete")
+
+def iter_tests(method, mealy_machine, nfa=None, max_length=3, k=1):
+    """
+    Énumère les séquences d'une méthode de génération sans construire la suite entière.
+    L'ordre est celui de simple_method, product(entrées, repeat=longueur) (complex, entrées
+    dans l'ordre de première apparition), generate_restricted_tests et k_complete_tests.
+    :param method: "simple", "complex", "restricted" ou "k-complete".
+    :param mealy_machine: Instance de MealyMachine.
+    :param nfa: Restriction (obligatoire pour "restricted").
+    :param max_length: Longueur maximale (complex, restricted).
+    :param k: Longueur des prolongements (k-complete).
+    :return: Instance de TestEnumerator (itérateur de listes de symboles, reprenable).
+    """
+    from .checkpoint import TestEnumerator
+    return TestEnumerator(method, mealy_machine, nfa, max_length, k)
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _execute(mealy_machine, chunk, implementation=None, start=0):
+    if implementation is None:
+        return execute_tests(mealy_machine, chunk)
+    from .verdict import iter_verdicts
+    return list(iter_verdicts(mealy_machine, implementation, chunk, start))
+
+def execute_chunks(mealy_machine, chunks, workers=1, implementation=None, start=0):
+    """
+    Exécute des lots de tests dans l'ordre, éventuellement dans plusieurs processus ;
+    au plus deux lots par processus sont en attente, pour borner la mémoire.
+    :param mealy_machine: Instance de MealyMachine (sérialisable).
+    :param chunks: Itérable de listes de séquences.
+    :param workers: Nombre de processus (1 : exécution dans le processus courant).
+    :param implementation: Machine testée : si elle est donnée, les lots sont exécutés
+                           en mode verdict contre mealy_machine (voir verdict.iter_verdicts).
+    :param start: Identifiant du premier test (mode verdict).
+    :return: Itérateur des résultats de execute_tests (ou des verdicts), lot par lot.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield _execute(mealy_machine, chunk, implementation, start)
+            start += len(chunk)
+        return
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(_execute, mealy_machine, chunk, implementation, start))
+                start += len(chunk)
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Arrêt anticipé (par exemple au premier échec) : les lots en attente sont abandonnés
+            for future in pending:
+                future.cancel()
+
+def run_job(job, output_file, chunk_size=1000, memory_limit=None, workers=1, progress=None,
+            checkpoint_interval=None, resume=False):
+    """
+    Génère et exécute la suite d'une paire (machine, restriction) en écrivant les
+    résultats au fil de l'eau, lot par lot, dans un puits de résultats (voir sinks).
+    Si le travail désigne une implémentation, seuls les verdicts sont écrits.
+    Avec des points de reprise, la frontière de l'énumération, le nombre de tests écrits
+    et la taille du fichier de résultats sont enregistrés dans output_file + ".checkpoint" ;
+    une reprise tronque les résultats à cette taille et repart de cette frontière, sans
+    test dupliqué ni sauté.
+    :param job: Dictionnaire {"model", "restriction", "method", "max_length", "k", "format", "compress",
+                "implementation", "stop_on_failure"} ; format et compression sont déduits de
+                l'extension de output_file s'ils sont absents. Avec une implementation, les
+                verdicts sont écrits en JSONL : un format CSV ou en colonnes est une erreur.
+    :param output_file: Fichier des résultats.
+    :param chunk_size: Nombre de tests générés et exécutés par lot.
+    :param memory_limit: Budget de croissance du RSS en octets (MemoryMonitor) ; au-delà,
+                         le travail est interrompu et marqué "memory_exceeded".
+    :param workers: Nombre de processus d'exécution des lots.
+    :param progress: Fonction appelée avec (travail, nombre de tests exécutés), facultative.
+    :param checkpoint_interval: Délai minimal (s) entre deux points de reprise (None : aucun,
+                                sauf avec resume, qui utilise DEFAULT_CHECKPOINT_INTERVAL).
+    :param resume: Reprendre depuis le point de reprise s'il existe (un travail terminé
+                   n'est pas réexécuté).
+    :return: Dictionnaire résumé {"model", "restriction", "method", "tests", "errors", "time", "status", "output"},
+             avec "verdict", "failures" et "inconclusive" en mode verdict.
+    """
+    from collections import deque
+
+    from .checkpoint import DEFAULT_CHECKPOINT_INTERVAL, read_checkpoint, write_checkpoint
+    from .memory import MemoryBudgetExceeded, MemoryMonitor
+
+    method = job.get("method", "restricted")
+    summary = {"model": job["model"], "restriction": job.get("restriction"), "method": method,
+               "tests": 0, "errors": 0, "time": 0.0, "status": "ok", "output": output_file}
+    verdicts = bool(job.get("implementation"))
+    if verdicts:
+        from .verdict import FAIL, INCONCLUSIVE, PASS
+        summary.update({"implementation": job["implementation"], "verdict": PASS, "failures": 0, "inconclusive": 0})
+    checkpointing = checkpoint_interval is not None or resume
+    if checkpointing and checkpoint_interval is None:
+        checkpoint_interval = DEFAULT_CHECKPOINT_INTERVAL
+    checkpoint_file = output_file + ".checkpoint"
+    start_time = time.time()
+    try:
+        state = read_checkpoint(checkpoint_file) if resume else None
+        if state is not None:
+            if state["job"] != json.loads(json.dumps(job)):
+                raise ValueError(f"Le point de reprise {checkpoint_file} correspond à un autre travail")
+            if state["done"]:
+                return state["summary"]
+            summary.update(state["summary"])
+            start_time -= summary["time"]
+        with MemoryMonitor(budget=memory_limit, enabled=memory_limit is not None, trace=False):
+            mealy_machine = load_mealy(job["model"])
+            nfa = load_nfa(job["restriction"]) if job.get("restriction") else None
+            implementation = load_mealy(job["implementation"]) if verdicts else None
+            tests = iter_tests(method, mealy_machine, nfa, job.get("max_length", 3), job.get("k", 1))
+            if state is not None:
+                tests.restore(state["frontier"])
+                with open(output_file, "r+b") as f:
+                    f.truncate(state["offset"])
+            # Frontière après chaque lot généré : elle devient le point de reprise quand ce lot est écrit
+            frontiers = deque()
+
+            def chunks():
+                for chunk in _chunks(tests, chunk_size):
+                    if checkpointing:
+                        frontiers.append(tests.state())
+                    yield chunk
+
+            format = verdict_format(output_file, job.get("format")) if verdicts else job.get("format")
+            last_checkpoint = time.time()
+            with open_sink(output_file, format, compress=job.get("compress"), append=state is not None) as sink:
+                for results in execute_chunks(mealy_machine, chunks(), workers, implementation, summary["tests"]):
+                    if not verdicts:
+                        summary["errors"] += sum(isinstance(result[1], str) for result in results)
+                    else:
+                        if job.get("stop_on_failure"):
+                            failed = next((position for position, result in enumerate(results)
+                                           if result[1] == FAIL), None)
+                            if failed is not None:
+                                results = results[:failed + 1]
+                        summary["failures"] += sum(result[1] == FAIL for result in results)
+                        summary["inconclusive"] += sum(result[1] == INCONCLUSIVE for result in results)
+                        if summary["failures"]:
+                            summary["verdict"] = FAIL
+                    sink.write_many(results)
+                    summary["tests"] += len(results)
+                    if progress is not None:
+                        progress(job, summary["tests"])
+                    if verdicts and summary["failures"] and job.get("stop_on_failure"):
+                        break
+                    if checkpointing:
+                        frontier = frontiers.popleft()
+                        if time.time() - last_checkpoint >= checkpoint_interval:
+                            summary["time"] = time.time() - start_time
+                            write_checkpoint(checkpoint_file, {"job": job, "frontier": frontier, "done": False,
+                                                               "offset": sink.checkpoint(), "summary": summary})
+                            last_checkpoint = time.time()
+        if checkpointing:
+            summary["time"] = time.time() - start_time
+            write_checkpoint(checkpoint_file, {"job": job, "done": True, "summary": summary})
+    except MemoryBudgetExceeded as e:
+        summary["status"] = "memory_exceeded"
+        summary["message"] = str(e)
+    except (OSError, ValueError) as e:
+        summary["status"] = "error"
+        summary["message"] = str(e)
+    summary["time"] = time.time() - start_time
+    return summary
+
+def read_manifest(file_path, defaults=None):
+    """
+    Lit la liste des travaux d'un lot : une ligne JSON {"model", "restriction", "implementation", ...}
+    ou une ligne "modèle restriction" par travail, chemins entre guillemets s'ils
+    contiennent des espaces (lignes vides et # ignorées).
+    Les chemins relatifs sont résolus depuis le répertoire du manifeste.
+    :param file_path: Chemin du manifeste.
+    :param defaults: Paramètres par défaut (method, max_length, k).
+    :return: Liste des travaux.
+    """
+    base = os.path.dirname(os.path.abspath(file_path))
+    jobs = []
+    with open(file_path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                job = json.loads(line)
+            else:
+                fields = shlex.split(line)
+                job = {"model": fields[0], "restriction": fields[1] if len(fields) > 1 else None}
+            job = {**(defaults or {}), **job}
+            for key in ("model", "restriction", "implementation"):
+                if job.get(key):
+                    job[key] = os.path.join(base, job[key])
+            jobs.append(job)
+    return jobs
+
+def _run_indexed(arguments):
+    index, job, output_file, chunk_size, memory_limit, checkpoint_interval, resume = arguments
+    summary = run_job(job, output_file, chunk_size, memory_limit,
+                      checkpoint_interval=checkpoint_interval, resume=resume)
+    summary["job"] = index
+    return summary
+
+def run_batch(jobs, output_dir, workers=1, chunk_size=1000, memory_limit=None, progress=None,
+              checkpoint_interval=None, resume=False):
+    """
+    Exécute un lot de travaux sans surveillance, chacun dans son propre fichier de résultats ;
+    un résumé par travail est ajouté à output_dir/summary.jsonl dès qu'il se termine.
+    :param jobs: Liste des travaux (voir run_job).
+    :param output_dir: Répertoire des résultats.
+    :param workers: Nombre de travaux simultanés (processus).
+    :param chunk_size: Nombre de tests par lot d'exécution.
+    :param memory_limit: Budget mémoire par travail (octets).
+    :param progress: Fonction appelée avec (résumé, nombre de travaux terminés, total).
+    :param checkpoint_interval: Délai entre deux points de reprise de chaque travail (voir run_job).
+    :param resume: Reprendre chaque travail depuis son point de reprise ; les travaux
+                   terminés ne sont pas réexécutés.
+    :return: Liste des résumés, dans l'ordre de fin.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    arguments = []
+    for index, job in enumerate(jobs):
+        name = os.path.splitext(os.path.basename(job["model"]))[0]
+        output_file = result_path(os.path.join(output_dir, f"{index:05d}-{name}"),
+                                  job.get("format") or "jsonl", job.get("compress"))
+        arguments.append((index, job, output_file, chunk_size, memory_limit, checkpoint_interval, resume))
+    summaries = []
+    with open(os.path.join(output_dir, "summary.jsonl"), "w") as summary_file, ExitStack() as stack:
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            futures = [executor.submit(_run_indexed, argument) for argument in arguments]
+            completed = (future.result() for future in as_completed(futures))
+        else:
+            completed = map(_run_indexed, arguments)
+        for summary in completed:
+            summaries.append(summary)
+            summary_file.write(json.dumps(summary) + "\n")
+            summary_file.flush()
+            if progress is not None:
+                progress(summary, len(summaries), len(jobs))
+    return summaries
+
+def print_progress(summary, done, total):
+    """Affiche l'avancement d'un lot sur la sortie d'erreur."""
+    print(f"[{done}/{total}] {summary['status']:<15} {summary['tests']:>9} tests "
+          f"{summary['time']:8.2f} s  {os.path.basename(summary['model'])}", file=sys.stderr)
@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from itertools import product
+
+from .core import complex_method, execute_tests, generate_restricted_tests
+from .loaders import load_mealy, load_nfa
+
+# Répertoire des modèles fournis
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Modèles de référence (nom -> fichier dans DATA_DIR)
+MEALY_MODELS = {
+    "mealy_4": "Mealy_Machine_4_States.xml",
+    "mealy_10": "Mealy_Machine_10_States.xml",
+    "mealy_100": "Mealy_Machine_100_States.xml",
+    "mealy_pds_100": "Mealy_R100_PDS_l99.fsm",
+}
+NFA_MODELS = {
+    "nfa_3": "example_nfa.xml",
+    "nfa_10": "nfa_10_states.xml",
+    "nfa_100": "nfa_100_states.xml",
+}
+DEFAULT_LENGTHS = (1, 2, 3, 4, 5)
+
+def percentile(sorted_values, fraction):
+    """
+    Calcule un percentile par interpolation linéaire.
+    :param sorted_values: Valeurs triées.
+    :param fraction: Fraction entre 0 et 1.
+    :return: Valeur du percentile.
+    """
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def measure(function, warmup=1, repeat=7, steps=None, sequences=None):
+    """
+    Mesure une fonction avec échauffement et répétitions (time.perf_counter).
+    :param function: Fonction sans argument à mesurer.
+    :param warmup: Nombre d'exécutions non mesurées.
+    :param repeat: Nombre d'exécutions mesurées.
+    :param steps: Nombre de pas traités par exécution (pour le débit en pas/s).
+    :param sequences: Nombre de séquences traitées par exécution (pour le débit en séquences/s).
+    :return: Dictionnaire des statistiques (secondes).
+    """
+    for _ in range(warmup):
+        function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    ordered = sorted(timings)
+    median = percentile(ordered, 0.5)
+    stats = {
+        "repeat": repeat,
+        "warmup": warmup,
+        "min": ordered[0],
+        "median": median,
+        "mean": sum(ordered) / len(ordered),
+        "p90": percentile(ordered, 0.9),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1],
+        "timings": timings,
+    }
+    if steps is not None:
+        stats["steps"] = steps
+        stats["steps_per_s"] = steps / median if median > 0 else None
+    if sequences is not None:
+        stats["sequences"] = sequences
+        stats["sequences_per_s"] = sequences / median if median > 0 else None
+    return stats
+
+def _model_path(file_name):
+    return os.path.join(DATA_DIR, file_name)
+
+def run_benchmarks(lengths=DEFAULT_LENGTHS, warmup=1, repeat=7, mealy_models=None, nfa_models=None):
+    """
+    Exécute la suite de performances : chargement, génération, acceptation NFA et exécution.
+    :param lengths: Valeurs de max_length balayées.
+    :param warmup: Nombre d'exécutions d'échauffement par mesure.
+    :param repeat: Nombre d'exécutions mesurées.
+    :param mealy_models: Modèles de Mealy {nom: fichier} (par défaut, MEALY_MODELS).
+    :param nfa_models: NFA {nom: fichier} (par défaut, NFA_MODELS).
+    :return: Liste des résultats (un dictionnaire par mesure).
+    """
+    mealy_models = MEALY_MODELS if mealy_models is None else mealy_models
+    nfa_models = NFA_MODELS if nfa_models is None else nfa_models
+    results = []
+
+    def record(benchmark, model, max_length, stats):
+        results.append({"benchmark": benchmark, "model": model, "max_length": max_length, **stats})
+
+    machines = {}
+    for name, file_name in mealy_models.items():
+        path = _model_path(file_name)
+        record("load", name, None, measure(lambda: load_mealy(path), warmup, repeat))
+        machines[name] = load_mealy(path)
+    nfas = {}
+    for name, file_name in nfa_models.items():
+        path = _model_path(file_name)
+        record("load", name, None, measure(lambda: load_nfa(path), warmup, repeat))
+        nfas[name] = load_nfa(path)
+
+    for max_length in lengths:
+        for name, machine in machines.items():
+            tests = complex_method(machine, max_length)
+            steps = sum(len(test) for test in tests)
+            record("generation", name, max_length,
+                   measure(lambda: complex_method(machine, max_length), warmup, repeat, steps, len(tests)))
+            record("execution", name, max_length,
+                   measure(lambda: execute_tests(machine, tests), warmup, repeat, steps, len(tests)))
+        for name, nfa in nfas.items():
+            candidates = [test for length in range(1, max_length + 1)
+                          for test in product(nfa.alphabet, repeat=length)]
+            steps = sum(len(test) for test in candidates)
+            accepted = generate_restricted_tests(nfa, max_length)
+            record("acceptance", name, max_length,
+                   measure(lambda: [nfa.is_accepted(test) for test in candidates],
+                           warmup, repeat, steps, len(candidates)))
+            record("restricted_generation", name, max_length,
+                   measure(lambda: generate_restricted_tests(nfa, max_length),
+                           warmup, repeat, steps, len(accepted)))
+    return results
+
+def environment():
+    """Décrit l'environnement d'exécution pour rendre les résultats comparables."""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+def save_report(results, file_path, parameters):
+    """
+    Enregistre les résultats au format JSON.
+    :param results: Résultats de run_benchmarks.
+    :param file_path: Chemin du fichier JSON.
+    :param parameters: Paramètres de la campagne.
+    """
+    report = {"environment": environment(), "parameters": parameters, "results": results}
+    with open(file_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def compare_reports(baseline, current):
+    """
+    Compare les médianes de deux rapports JSON.
+    :param baseline: Rapport de référence (dictionnaire).
+    :param current: Nouveau rapport (dictionnaire).
+    :return: Liste des tuples (benchmark, modèle, max_length, rapport médiane nouvelle / ancienne).
+    """
+    def key(entry):
+        return entry["benchmark"], entry["model"], entry["max_length"]
+    previous = {key(entry): entry["median"] for entry in baseline["results"]}
+    ratios = []
+    for entry in current["results"]:
+        old = previous.get(key(entry))
+        if old:
+            ratios.append((*key(entry), entry["median"] / old))
+    return ratios
+
+# Instructions d'import surveillées et modules qui ne doivent pas être chargés par elles
+IMPORT_STATEMENTS = (
+    "import conformance",
+    "from conformance import MealyMachine, NFA, execute_tests, generate_restricted_tests",
+    "from conformance import load_mealy, load_nfa",
+    "from conformance.cli import main",
+)
+HEAVY_MODULES = ("graphviz", "matplotlib", "concurrent.futures", "tracemalloc", "xml.etree.ElementTree")
+
+def import_time(statement, repeat=5):
+    """
+    Mesure le temps d'une instruction d'import dans des interpréteurs neufs.
+    :param statement: Instruction à mesurer (par exemple "import conformance").
+    :param repeat: Nombre d'interpréteurs lancés.
+    :return: Dictionnaire {"statement", "median_ms", "heavy_modules"}.
+    """
+    import subprocess
+    probe = (f"import sys, time\nstart = time.perf_counter()\n{statement}\n"
+             f"elapsed = time.perf_counter() - start\n"
+             f"print(elapsed, *[m for m in {HEAVY_MODULES!r} if m in sys.modules])")
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = []
+    heavy = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", probe], cwd=package_dir, check=True,
+                                capture_output=True, text=True).stdout.split()
+        samples.append(float(output[0]) * 1e3)
+        heavy = output[1:]
+    samples.sort()
+    return {"statement": statement, "median_ms": percentile(samples, 0.5), "heavy_modules": heavy}
+
+def check_import_time(max_ms, repeat=5, statements=IMPORT_STATEMENTS):
+    """
+    Vérifie que les imports du moteur restent rapides et ne chargent aucun module lourd.
+    :param max_ms: Temps médian maximal par instruction (ms).
+    :return: Dictionnaire {"statements": mesures, "failures": messages}.
+    """
+    measures = [import_time(statement, repeat) for statement in statements]
+    failures = []
+    for entry in measures:
+        if entry["median_ms"] > max_ms:
+            failures.append(f"{entry['statement']} : {entry['median_ms']:.2f} ms > {max_ms} ms")
+        if entry["heavy_modules"]:
+            failures.append(f"{entry['statement']} charge {', '.join(entry['heavy_modules'])}")
+    return {"statements": measures, "failures": failures}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de performances sur les modèles de data/.")
+    parser.add_argument("--output", default="benchmark_results.json", help="Fichier JSON des résultats.")
+    parser.add_argument("--lengths", type=int, nargs="+", default=list(DEFAULT_LENGTHS), help="Valeurs de max_length.")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--baseline", help="Rapport JSON précédent à comparer.")
+    parser.add_argument("--max-import-ms", type=float,
+                        help="Vérifie aussi le temps d'import du paquet (échec au-delà de ce seuil).")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.lengths, args.warmup, args.repeat)
+    parameters = {"lengths": args.lengths, "warmup": args.warmup, "repeat": args.repeat}
+    save_report(results, args.output, parameters)
+    for entry in results:
+        throughput = entry.get("steps_per_s")
+        suffix = f"  {throughput:,.0f} pas/s" if throughput else ""
+        print(f"{entry['benchmark']:<22} {entry['model']:<14} {str(entry['max_length']):>4}  "
+              f"médiane {entry['median'] * 1e3:9.3f} ms  p90 {entry['p90'] * 1e3:9.3f} ms{suffix}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.output) as f:
+            current = json.load(f)
+        print("\nComparaison avec", args.baseline)
+        for benchmark, model, max_length, ratio in compare_reports(baseline, current):
+            print(f"{benchmark:<22} {model:<14} {str(max_length):>4}  x{ratio:.2f}")
+    print(f"Résultats enregistrés dans {args.output}")
+    if args.max_import_ms is not None:
+        report = check_import_time(args.max_import_ms)
+        for entry in report["statements"]:
+            print(f"{entry['median_ms']:8.2f} ms  {entry['statement']}")
+        for failure in report["failures"]:
+            print(f"ÉCHEC : {failure}", file=sys.stderr)
+        if report["failures"]:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
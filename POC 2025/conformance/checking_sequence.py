@@ -0,0 +1,99 @@
+from .product import RestrictedProduct
+from .uio import find_uio
+
+def checking_sequence(mealy_machine, nfa=None, max_id_length=None, complete=True):
+    """
+    Construit une séquence de vérification sans réinitialisation respectant la restriction.
+    Chaque transition empruntable sous la restriction est vérifiée en enchaînant une
+    séquence de transfert (la plus courte depuis la position courante), la transition
+    elle-même et la UIO de l'état atteint (voir find_uio). Une réinitialisation
+    n'est utilisée que si les transitions restantes ne sont plus atteignables.
+    :param mealy_machine: Instance de MealyMachine ou de CompiledMealy.
+    :param nfa: Restriction (NFA ou CompiledNFA), facultative.
+    :param max_id_length: Longueur maximale des séquences d'identification.
+    :param complete: Prolonger chaque séquence jusqu'à un mot accepté par la restriction.
+    :return: Dictionnaire {"sequences", "length", "resets", "verified", "unidentified"}.
+    """
+    product = RestrictedProduct(mealy_machine, nfa)
+    machine = product.machine
+    k = machine.num_inputs
+    identifications = {}
+
+    def identify(node):
+        if node not in identifications:
+            identifications[node] = find_uio(product, node, max_id_length)
+        return identifications[node]
+
+    remaining = product.transitions()
+    unidentified = []
+    sequences = []
+    verified = 0
+
+    def pending(node):
+        return any(node[0] * k + input_id in remaining for input_id, _, _ in product.successors(node))
+
+    def finish(sequence, node):
+        if complete and not product.is_accepting(node):
+            found = product.shortest_path(node, product.is_accepting)
+            if found is not None:
+                sequence.extend(found[0])
+        sequences.append(sequence)
+
+    node = product.initial
+    sequence = list(identify(node) or [])
+    node = product.run(node, sequence)[1]
+    while remaining:
+        found = product.shortest_path(node, pending)
+        if found is None:
+            finish(sequence, node)
+            node, sequence = product.initial, []
+            found = product.shortest_path(node, pending)
+            if found is None:
+                break
+        path, node = found
+        sequence.extend(path)
+        # Préférer une transition dont l'état atteint est identifiable
+        choices = [(input_id, next_node) for input_id, _, next_node in product.successors(node)
+                   if node[0] * k + input_id in remaining]
+        input_id, next_node = next(((i, n) for i, n in choices if identify(n) is not None), choices[0])
+        remaining.discard(node[0] * k + input_id)
+        verified += 1
+        sequence.append(input_id)
+        source, node = node[0], next_node
+        identification = identify(node)
+        if identification is None:
+            unidentified.append((machine.states[source], machine.inputs[input_id]))
+        else:
+            sequence.extend(identification)
+            node = product.run(node, identification)[1]
+    finish(sequence, node)
+
+    inputs = machine.inputs
+    symbol_sequences = [[inputs[input_id] for input_id in sequence] for sequence in sequences]
+    return {
+        "sequences": symbol_sequences,
+        "length": sum(len(sequence) for sequence in symbol_sequences),
+        "resets": len(symbol_sequences),
+        "verified": verified,
+        "unidentified": unidentified,
+    }
+
+def cost_report(result, suites=None, reset_cost=1.0, input_cost=1e-6):
+    """
+    Compare le coût d'exécution d'une séquence de vérification à celui de suites avec
+    réinitialisations (une réinitialisation avant chaque séquence, comme execute_tests).
+    :param result: Résultat de checking_sequence.
+    :param suites: Dictionnaire {nom: liste des séquences} (par exemple simple_method).
+    :param reset_cost: Coût d'une réinitialisation (secondes).
+    :param input_cost: Coût d'une entrée (secondes).
+    :return: Dictionnaire {nom: {"resets", "inputs", "cost"}}.
+    """
+    def cost(sequences):
+        resets = len(sequences)
+        inputs = sum(len(sequence) for sequence in sequences)
+        return {"resets": resets, "inputs": inputs, "cost": resets * reset_cost + inputs * input_cost}
+
+    report = {"checking_sequence": cost(result["sequences"])}
+    for name, tests in (suites or {}).items():
+        report[name] = cost(tests)
+    return report
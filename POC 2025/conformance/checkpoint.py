@@ -0,0 +1,184 @@
+import json
+import os
+from itertools import islice
+
+from .compiled import CompiledNFA
+
+# Version du format des fichiers de reprise
+CHECKPOINT_VERSION = 1
+# Délai par défaut entre deux points de reprise (secondes)
+DEFAULT_CHECKPOINT_INTERVAL = 60.0
+
+# Énumération reprenable des suites de tests
+class TestEnumerator:
+    def __init__(self, method, mealy_machine, nfa=None, max_length=3, k=1, prefix=()):
+        """
+        Énumère les séquences d'une méthode de génération en exposant sa frontière.
+        Les méthodes complex et restricted parcourent en profondeur, longueur par longueur,
+        l'arbre des préfixes (avec l'ensemble d'états du NFA pour restricted, ce qui
+        élague les préfixes sans suffixe accepté) : la pile des préfixes en attente suffit
+        à reprendre l'énumération. L'ordre est celui de product(alphabet, repeat=longueur).
+        Les méthodes simple et k-complete, linéaires, sont reprises en sautant les
+        séquences déjà émises.
+        :param method: "simple", "complex", "restricted" ou "k-complete".
+        :param mealy_machine: Instance de MealyMachine.
+        :param nfa: Restriction (obligatoire pour "restricted").
+        :param max_length: Longueur maximale (complex, restricted).
+        :param k: Longueur des prolongements (k-complete).
+        :param prefix: Indices dans l'alphabet d'un préfixe (complex, restricted) : seules les
+                       séquences qui le prolongent strictement sont énumérées.
+        """
+        self.method = method
+        self.max_length = max_length
+        self.emitted = 0
+        self.nfa = None
+        self._tests = None
+        if method == "simple":
+            from .core import simple_method
+            self._source = lambda: simple_method(mealy_machine)
+        elif method == "k-complete":
+            from .transfer import k_complete_tests
+            self._source = lambda: k_complete_tests(mealy_machine, nfa, k)
+        elif method == "complex":
+            self.letters = list(dict.fromkeys(input_symbol for _, input_symbol in mealy_machine.transitions))
+        elif method == "restricted":
+            if nfa is None:
+                raise ValueError("La méthode restricted nécessite un fichier de restriction")
+            if not isinstance(nfa, CompiledNFA):
+                self.letters = list(nfa.alphabet)
+                nfa = CompiledNFA.from_nfa(nfa)
+            else:
+                self.letters = list(nfa.inputs)
+            input_ids = {input_symbol: index for index, input_symbol in enumerate(nfa.inputs)}
+            self.input_ids = [input_ids[input_symbol] for input_symbol in self.letters]
+            live = nfa.live_states()
+            self.initial = frozenset(q for q in nfa.initial_subset if live[q])
+            self.nfa = nfa
+        else:
+            from .batch import METHODS
+            raise ValueError(f"Méthode inconnue : {method} (attendu : {', '.join(METHODS)})")
+        self.tree = method in ("complex", "restricted")
+        if prefix and not self.tree:
+            raise ValueError(f"La méthode {method} n'énumère pas d'arbre de préfixes")
+        self.root = (tuple(prefix), self._walk(prefix) if self.nfa is not None else None)
+        # Frontière : longueur en cours, préfixes internes à développer, feuilles à émettre
+        self.length = len(prefix)
+        self.stack = []
+        self.pending = []
+
+    def _walk(self, prefix):
+        subset = self.initial
+        for index in prefix:
+            if not subset:
+                break
+            subset = self.nfa.allowed_step(subset, self.input_ids[index])
+        return subset
+
+    def _children(self, prefix, subset):
+        """Fils admis d'un préfixe, dans l'ordre de l'alphabet : liste de (préfixe, ensemble d'états)."""
+        if self.nfa is None:
+            return [(prefix + (index,), None) for index in range(len(self.letters))]
+        children = []
+        for index, input_id in enumerate(self.input_ids):
+            next_subset = self.nfa.allowed_step(subset, input_id) if subset else subset
+            if next_subset:
+                children.append((prefix + (index,), next_subset))
+        return children
+
+    def prefixes(self, depth):
+        """
+        Retourne les préfixes admis de longueur `depth` sous la racine, dans l'ordre de
+        l'énumération (complex, restricted), par exemple pour découper une suite en tranches.
+        :return: Liste de tuples d'indices dans l'alphabet.
+        """
+        level = [self.root]
+        for _ in range(depth - len(self.root[0])):
+            level = [child for node in level for child in self._children(*node)]
+        return [prefix for prefix, _ in level]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.tree:
+            if self._tests is None:
+                self._tests = islice(iter(self._source()), self.emitted, None)
+            test = next(self._tests)
+            self.emitted += 1
+            return test
+        while not self.pending:
+            if not self.stack:
+                if self.length >= self.max_length:
+                    raise StopIteration
+                self.length += 1
+                self.stack.append(self.root)
+            self._expand(*self.stack.pop())
+        self.emitted += 1
+        return [self.letters[index] for index in self.pending.pop()]
+
+    def _expand(self, prefix, subset):
+        """Développe un préfixe : ses fils internes sont empilés, ses feuilles mises en attente."""
+        children = self._children(prefix, subset)
+        if len(prefix) + 1 < self.length:
+            self.stack.extend(reversed(children))
+        elif self.nfa is None:
+            self.pending.extend(prefix for prefix, _ in reversed(children))
+        else:
+            self.pending.extend(prefix for prefix, subset in reversed(children) if self.nfa.is_accepting(subset))
+
+    def state(self):
+        """
+        Retourne la frontière de l'énumération, sérialisable en JSON : les préfixes sont
+        des listes d'indices dans l'alphabet, les ensembles d'états des listes triées.
+        """
+        return {
+            "method": self.method,
+            "emitted": self.emitted,
+            "length": self.length,
+            "stack": [[list(prefix), None if subset is None else sorted(subset)] for prefix, subset in self.stack],
+            "pending": [list(prefix) for prefix in self.pending],
+        }
+
+    def restore(self, state):
+        """
+        Reprend l'énumération à une frontière retournée par state().
+        :raises ValueError: si la frontière provient d'une autre méthode.
+        """
+        if state["method"] != self.method:
+            raise ValueError(f"Frontière de la méthode {state['method']}, attendu : {self.method}")
+        self.emitted = state["emitted"]
+        self.length = state["length"]
+        self.stack = [(tuple(prefix), None if subset is None else frozenset(subset))
+                      for prefix, subset in state["stack"]]
+        self.pending = [tuple(prefix) for prefix in state["pending"]]
+        self._tests = None
+
+def write_checkpoint(file_path, state):
+    """
+    Écrit un état de reprise de façon atomique : le fichier temporaire est synchronisé
+    sur disque puis renommé, si bien qu'un arrêt brutal laisse l'ancien ou le nouvel état.
+    :param file_path: Chemin du fichier de reprise.
+    :param state: Dictionnaire sérialisable en JSON.
+    """
+    temporary = file_path + ".tmp"
+    with open(temporary, "w") as f:
+        json.dump({"version": CHECKPOINT_VERSION, **state}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, file_path)
+
+def read_checkpoint(file_path):
+    """
+    Lit un état de reprise.
+    :param file_path: Chemin du fichier de reprise.
+    :return: Dictionnaire, ou None si le fichier n'existe pas.
+    :raises ValueError: si la version du fichier n'est pas prise en charge.
+    """
+    try:
+        with open(file_path) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Version de fichier de reprise non prise en charge : {state.get('version')}")
+    return state
@@ -0,0 +1,250 @@
+import argparse
+import sys
+
+# Les modules du moteur sont importés dans chaque commande : le démarrage ne charge
+# que argparse, et Graphviz ou matplotlib seulement si la commande les utilise.
+
+def _compare(args):
+    import json
+
+    from .core import compare_methods
+    from .loaders import load_mealy, load_nfa
+
+    mealy_machine = load_mealy(args.model)
+    nfa = load_nfa(args.restriction)
+    results = compare_methods(mealy_machine, nfa, args.max_length, metrics_json=args.metrics_json,
+                              metrics_prometheus=args.metrics_prometheus, memory=args.memory,
+                              memory_budget=args.memory_budget)
+    summary = {}
+    for name, result in results.items():
+        if "exceeded" in result:
+            print(f"ÉCHEC : {name} : {result['exceeded']}", file=sys.stderr)
+            summary[name] = {"exceeded": result["exceeded"], "time": result["time"]}
+        else:
+            summary[name] = {"tests": len(result["tests"]), "time": result["time"]}
+        if "memory" in result:
+            summary[name]["memory"] = result["memory"]
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    if args.plot:
+        from .plotting import visualize_performance
+        visualize_performance(results, args.plot, show=False)
+    return 1 if any("exceeded" in result for result in results.values()) else 0
+
+def _render(args):
+    from .loaders import load_mealy, load_nfa
+    from .rendering import render_mealy, render_nfa
+
+    if args.kind == "nfa":
+        future = render_nfa(load_nfa(args.model), args.output)
+    else:
+        future = render_mealy(load_mealy(args.model), args.output)
+    print(future.result())
+    return 0
+
+def _size(text):
+    """Convertit une taille ("512M", "2G", "1000000") en octets."""
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper()
+    if text[-1:] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def _job(args):
+    job = {"method": args.method, "max_length": args.max_length, "k": args.k}
+    # Format et compression absents : déduits de l'extension du fichier de résultats
+    job.update({key: value for key, value in (("format", args.format), ("compress", args.compress)) if value})
+    if args.fail_fast:
+        job["stop_on_failure"] = True
+    return job
+
+def _run(args):
+    from .batch import run_job
+
+    def progress(job, done):
+        print(f"\r{done} tests exécutés", end="", file=sys.stderr, flush=True)
+
+    job = {**_job(args), "model": args.model, "restriction": args.restriction,
+           "implementation": args.implementation}
+    summary = run_job(job, args.output, args.chunk_size, args.memory_limit, args.jobs,
+                      progress if args.progress else None, args.checkpoint_interval, args.resume)
+    if args.progress:
+        print(file=sys.stderr)
+    print(f"{summary['status']} : {summary['tests']} tests, {summary['errors']} erreurs, "
+          f"{summary['time']:.2f} s -> {summary['output']}")
+    if "verdict" in summary:
+        print(f"verdict : {summary['verdict']} ({summary['failures']} échecs, "
+              f"{summary['inconclusive']} non concluants)")
+    if "message" in summary:
+        print(summary["message"], file=sys.stderr)
+    return 0 if summary["status"] == "ok" and summary.get("verdict", "pass") == "pass" else 1
+
+def _batch(args):
+    from .batch import print_progress, read_manifest, run_batch
+
+    jobs = read_manifest(args.manifest, _job(args))
+    summaries = run_batch(jobs, args.output_dir, args.jobs, args.chunk_size, args.memory_limit,
+                          print_progress if args.progress else None, args.checkpoint_interval, args.resume)
+    failed = [summary for summary in summaries if summary["status"] != "ok" or summary.get("verdict") == "fail"]
+    print(f"{len(summaries) - len(failed)}/{len(summaries)} travaux réussis, "
+          f"résumé dans {args.output_dir}/summary.jsonl")
+    return 1 if failed else 0
+
+def _coordinator(args):
+    import json
+    import os
+
+    from .distributed import Coordinator, run_worker
+
+    # Chemins absolus : les travailleurs ne partagent pas le répertoire courant du coordinateur
+    paths = {key: os.path.abspath(path) if path else None for key, path in
+             (("model", args.model), ("restriction", args.restriction), ("implementation", args.implementation))}
+    job = {"method": args.method, "max_length": args.max_length, "k": args.k, **paths}
+    job.update({key: value for key, value in (("format", args.format), ("compress", args.compress)) if value})
+    coordinator = Coordinator(job, args.output, args.shards, args.lease_timeout, args.host, args.port)
+    host, port = coordinator.address
+    print(f"coordinateur : {host}:{port}, {len(coordinator.shards)} tranches", file=sys.stderr, flush=True)
+    if args.local_workers:
+        from multiprocessing import Process
+        for index in range(args.local_workers):
+            Process(target=run_worker, args=(coordinator.address, f"local-{index}", args.chunk_size),
+                    daemon=True).start()
+    summary = coordinator.run()
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    return 0 if summary["status"] == "ok" and summary.get("verdict", "pass") == "pass" else 1
+
+def _worker(args):
+    from .distributed import run_worker
+
+    completed = run_worker(args.address, args.name, args.chunk_size)
+    print(f"{completed} tranches terminées", file=sys.stderr)
+    return 0
+
+def _shrink(args):
+    import json
+
+    from .loaders import load_mealy, load_nfa
+    from .shrink import shrink_counterexample
+
+    nfa = load_nfa(args.restriction) if args.restriction else None
+    result = shrink_counterexample(load_mealy(args.model), load_mealy(args.implementation),
+                                   args.test.split(), nfa, accepted=args.accepted)
+    json.dump(result, sys.stdout, indent=2)
+    print()
+    return 0
+
+def _import_time(args):
+    from .benchmark import check_import_time
+
+    report = check_import_time(args.max_ms, repeat=args.repeat)
+    for entry in report["statements"]:
+        print(f"{entry['median_ms']:8.2f} ms  {entry['statement']}"
+              + (f"  (modules lourds : {', '.join(entry['heavy_modules'])})" if entry["heavy_modules"] else ""))
+    for failure in report["failures"]:
+        print(f"ÉCHEC : {failure}", file=sys.stderr)
+    return 1 if report["failures"] else 0
+
+def build_parser():
+    """Construit l'analyseur de la ligne de commande."""
+    parser = argparse.ArgumentParser(prog="conformance",
+                                     description="Test de conformité des machines de Mealy sous restrictions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compare = commands.add_parser("compare", help="Compare les méthodes Simple et Complexe.")
+    compare.add_argument("model", help="Machine de Mealy (.xml, .json ou .fsm).")
+    compare.add_argument("restriction", help="NFA de restriction (.xml ou .json).")
+    compare.add_argument("--max-length", type=int, default=3)
+    compare.add_argument("--metrics-json", help="Fichier du rapport de métriques.")
+    compare.add_argument("--metrics-prometheus", help="Fichier des métriques au format Prometheus.")
+    compare.add_argument("--memory", action="store_true", help="Mesurer la mémoire par méthode.")
+    compare.add_argument("--memory-budget", type=_size,
+                         help="Budget mémoire par méthode (ex. 512M, 2G) ; implique --memory.")
+    compare.add_argument("--plot", help="Image du graphique des temps (importe matplotlib).")
+    compare.set_defaults(handler=_compare)
+
+    def pipeline_options(command):
+        command.add_argument("--method", choices=("simple", "complex", "restricted", "k-complete"),
+                             default="restricted")
+        command.add_argument("--max-length", type=int, default=3, help="Longueur maximale (complex, restricted).")
+        command.add_argument("-k", type=int, default=1, help="Longueur des prolongements (k-complete).")
+        command.add_argument("--jobs", type=int, default=1, help="Nombre de processus.")
+        command.add_argument("--chunk-size", type=int, default=1000, help="Tests par lot d'exécution.")
+        command.add_argument("--memory-limit", type=_size, help="Budget mémoire par travail (ex. 512M, 2G).")
+        command.add_argument("--progress", action="store_true", help="Afficher l'avancement sur stderr.")
+        command.add_argument("--fail-fast", action="store_true",
+                             help="Mode verdict : arrêter un travail au premier test en échec.")
+        command.add_argument("--checkpoint-interval", type=float,
+                             help="Secondes entre deux points de reprise (fichier <résultats>.checkpoint).")
+        command.add_argument("--resume", action="store_true",
+                             help="Reprendre depuis le dernier point de reprise (60 s entre deux par défaut).")
+        command.add_argument("--format", choices=("jsonl", "csv", "columnar"),
+                             help="Format des résultats (par défaut : selon l'extension, sinon jsonl).")
+        command.add_argument("--compress", choices=("gzip", "bz2", "lzma"),
+                             help="Compression des résultats (par défaut : selon l'extension).")
+
+    run = commands.add_parser("run", help="Génère et exécute une suite, résultats en JSONL, CSV ou colonnes.")
+    run.add_argument("model", help="Machine de Mealy (.xml, .json ou .fsm).")
+    run.add_argument("restriction", nargs="?", help="NFA de restriction (.xml ou .json).")
+    run.add_argument("--output", default="results.jsonl", help="Fichier des résultats.")
+    run.add_argument("--implementation",
+                     help="Machine testée : seuls les verdicts contre le modèle sont écrits.")
+    pipeline_options(run)
+    run.set_defaults(handler=_run)
+
+    batch = commands.add_parser("batch", help="Exécute un lot de paires (machine, restriction).")
+    batch.add_argument("manifest", help="Une ligne JSON ou \"modèle restriction\" par travail.")
+    batch.add_argument("--output-dir", default="results", help="Répertoire des résultats.")
+    pipeline_options(batch)
+    batch.set_defaults(handler=_batch)
+
+    coordinator = commands.add_parser("coordinator", help="Distribue une suite à des travailleurs (TCP).")
+    coordinator.add_argument("model", help="Machine de Mealy (.xml, .json ou .fsm), lue aussi par les travailleurs.")
+    coordinator.add_argument("restriction", nargs="?", help="NFA de restriction (.xml ou .json).")
+    coordinator.add_argument("--output", default="results.jsonl", help="Fichier des résultats fusionnés.")
+    coordinator.add_argument("--implementation", help="Machine testée (mode verdict).")
+    coordinator.add_argument("--method", choices=("simple", "complex", "restricted", "k-complete"),
+                             default="restricted")
+    coordinator.add_argument("--max-length", type=int, default=3)
+    coordinator.add_argument("-k", type=int, default=1)
+    coordinator.add_argument("--format", choices=("jsonl", "csv", "columnar"))
+    coordinator.add_argument("--compress", choices=("gzip", "bz2", "lzma"))
+    coordinator.add_argument("--shards", type=int, default=64, help="Nombre de tranches visé.")
+    coordinator.add_argument("--lease-timeout", type=float, default=60.0,
+                             help="Secondes sans renouvellement avant réattribution d'une tranche.")
+    coordinator.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute (0.0.0.0 : toutes).")
+    coordinator.add_argument("--port", type=int, default=0, help="Port d'écoute (0 : port libre).")
+    coordinator.add_argument("--local-workers", type=int, default=0, help="Travailleurs locaux à lancer.")
+    coordinator.add_argument("--chunk-size", type=int, default=1000, help="Tests par lot (travailleurs locaux).")
+    coordinator.set_defaults(handler=_coordinator)
+
+    worker = commands.add_parser("worker", help="Exécute les tranches d'un coordinateur.")
+    worker.add_argument("address", help="Adresse du coordinateur (hôte:port).")
+    worker.add_argument("--name", help="Nom du travailleur.")
+    worker.add_argument("--chunk-size", type=int, default=1000, help="Tests entre deux renouvellements de bail.")
+    worker.set_defaults(handler=_worker)
+
+    shrink = commands.add_parser("shrink", help="Réduit une séquence en échec à un contre-exemple minimal.")
+    shrink.add_argument("model", help="Spécification (.xml, .json ou .fsm).")
+    shrink.add_argument("implementation", help="Machine testée.")
+    shrink.add_argument("test", help="Séquence en échec, symboles séparés par des espaces.")
+    shrink.add_argument("--restriction", help="NFA de restriction à respecter.")
+    shrink.add_argument("--accepted", action="store_true",
+                        help="Exiger des séquences acceptées (et non de simples préfixes autorisés).")
+    shrink.set_defaults(handler=_shrink)
+
+    render = commands.add_parser("render", help="Rend un modèle avec Graphviz.")
+    render.add_argument("model")
+    render.add_argument("--kind", choices=("mealy", "nfa"), default="mealy")
+    render.add_argument("--output", default="model", help="Fichier rendu (sans extension).")
+    render.set_defaults(handler=_render)
+
+    import_time = commands.add_parser("import-time", help="Vérifie le temps d'import du paquet.")
+    import_time.add_argument("--max-ms", type=float, default=50.0, help="Temps d'import maximal (ms).")
+    import_time.add_argument("--repeat", type=int, default=5)
+    import_time.set_defaults(handler=_import_time)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
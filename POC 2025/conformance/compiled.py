@@ -0,0 +1,359 @@
+from array import array
+
+from .core import MealyMachine, NFA
+from .metrics import METRICS
+
+# Valeur utilisée pour une transition absente (NULL_STATE de FSMlib)
+NULL_STATE = -1
+# Sortie par défaut d'une transition absente (DEFAULT_OUTPUT de FSMlib)
+DEFAULT_OUTPUT = -1
+
+# Machine de Mealy compilée en tables d'entiers
+class CompiledMealy:
+    def __init__(self, num_states, num_inputs, num_outputs, next_state, output,
+                 initial_state=0, states=None, inputs=None, outputs=None):
+        """
+        Initialise une machine de Mealy sous forme de tables d'entiers.
+        La transition (s, i) est stockée à l'indice s * num_inputs + i.
+        :param num_states: Nombre de lignes des tables (identifiant d'état maximal + 1).
+        :param num_inputs: Nombre d'entrées.
+        :param num_outputs: Nombre de sorties.
+        :param next_state: Table des états suivants (NULL_STATE si absente).
+        :param output: Table des sorties (DEFAULT_OUTPUT si absente).
+        :param initial_state: Indice de l'état initial.
+        :param states: Noms des états (par défaut, leurs indices).
+        :param inputs: Noms des entrées (par défaut, leurs indices).
+        :param outputs: Noms des sorties (par défaut, leurs indices).
+        """
+        self.num_states = num_states
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+        self.next_state = next_state if isinstance(next_state, array) else array("l", next_state)
+        self.output = output if isinstance(output, array) else array("l", output)
+        if len(self.next_state) != num_states * num_inputs or len(self.output) != num_states * num_inputs:
+            raise ValueError("Tables de transitions de taille incohérente")
+        self.initial_state = initial_state
+        self.states = list(states) if states is not None else list(range(num_states))
+        self.inputs = list(inputs) if inputs is not None else list(range(num_inputs))
+        self.outputs = list(outputs) if outputs is not None else list(range(num_outputs))
+        self.current_state = initial_state
+        # Indique si la machine est connue comme minimale (isReduced de FSMlib)
+        self.is_reduced = False
+
+    @classmethod
+    def from_mealy(cls, mealy_machine, inputs=None):
+        """
+        Compile une MealyMachine à dictionnaire en tables d'entiers.
+        :param mealy_machine: Instance de MealyMachine.
+        :param inputs: Ordre des entrées à utiliser (par défaut, ordre d'apparition).
+        :return: Instance de CompiledMealy.
+        """
+        states = [mealy_machine.initial_state]
+        state_ids = {mealy_machine.initial_state: 0}
+        input_ids = {}
+        output_ids = {}
+        if inputs is not None:
+            for input_symbol in inputs:
+                input_ids.setdefault(input_symbol, len(input_ids))
+        for (state, input_symbol), (next_state, output) in mealy_machine.transitions.items():
+            for s in (state, next_state):
+                if s not in state_ids:
+                    state_ids[s] = len(states)
+                    states.append(s)
+            input_ids.setdefault(input_symbol, len(input_ids))
+            output_ids.setdefault(output, len(output_ids))
+        num_inputs = len(input_ids)
+        size = len(states) * num_inputs
+        next_table = array("l", [NULL_STATE]) * size
+        output_table = array("l", [DEFAULT_OUTPUT]) * size
+        for (state, input_symbol), (next_state, output) in mealy_machine.transitions.items():
+            index = state_ids[state] * num_inputs + input_ids[input_symbol]
+            next_table[index] = state_ids[next_state]
+            output_table[index] = output_ids[output]
+        return cls(len(states), num_inputs, len(output_ids), next_table, output_table,
+                   0, states, list(input_ids), list(output_ids))
+
+    def to_mealy(self):
+        """
+        Reconstruit une MealyMachine à dictionnaire à partir des tables.
+        :return: Instance de MealyMachine.
+        """
+        transitions = {}
+        k = self.num_inputs
+        for index, next_state in enumerate(self.next_state):
+            if next_state == NULL_STATE:
+                continue
+            state, input_id = divmod(index, k)
+            output = self.output[index]
+            transitions[(self.states[state], self.inputs[input_id])] = (
+                self.states[next_state], self.outputs[output] if output != DEFAULT_OUTPUT else None
+            )
+        return MealyMachine(transitions, self.states[self.initial_state])
+
+    def reset(self):
+        """Réinitialise l'état courant à l'état initial."""
+        if METRICS.enabled:
+            METRICS.add("resets")
+        self.current_state = self.initial_state
+
+    def process_input(self, input_sequence):
+        """
+        Traite une séquence d'indices d'entrées sur les tables.
+        :param input_sequence: Liste des indices d'entrées.
+        :return: Tuple (liste des indices de sorties, liste des indices d'états visités).
+        """
+        next_table = self.next_state
+        output_table = self.output
+        k = self.num_inputs
+        state = self.current_state
+        outputs = []
+        states = [state]
+        for input_id in input_sequence:
+            index = state * k + input_id
+            next_state = next_table[index]
+            if next_state == NULL_STATE:
+                self.current_state = state
+                if METRICS.enabled:
+                    METRICS.add("transitions_simulated", len(outputs))
+                raise ValueError(f"Transition inconnue pour ({self.states[state]}, {self.inputs[input_id]})")
+            outputs.append(output_table[index])
+            state = next_state
+            states.append(state)
+        self.current_state = state
+        if METRICS.enabled:
+            METRICS.add("transitions_simulated", len(outputs))
+        return outputs, states
+
+    def iter_transitions(self):
+        """
+        Parcourt les transitions définies avec leurs noms.
+        :return: Itérateur de tuples (état, entrée, état_suivant, sortie).
+        """
+        k = self.num_inputs
+        states, inputs, outputs = self.states, self.inputs, self.outputs
+        output_table = self.output
+        for index, next_state in enumerate(self.next_state):
+            if next_state == NULL_STATE:
+                continue
+            state, input_id = divmod(index, k)
+            output = output_table[index]
+            yield (states[state], inputs[input_id], states[next_state],
+                   outputs[output] if output != DEFAULT_OUTPUT else None)
+
+# NFA compilé : successeurs stockés en lignes compressées (CSR)
+class CompiledNFA:
+    def __init__(self, num_states, num_inputs, offsets, targets, initial_state, accepting,
+                 states=None, inputs=None):
+        """
+        Initialise un NFA sous forme de tableaux d'entiers.
+        Les successeurs de (q, a) sont targets[offsets[q * num_inputs + a]:offsets[q * num_inputs + a + 1]].
+        :param num_states: Nombre d'états.
+        :param num_inputs: Nombre d'entrées.
+        :param offsets: Tableau des débuts de ligne (taille num_states * num_inputs + 1).
+        :param targets: Tableau des états successeurs.
+        :param initial_state: Indice de l'état initial.
+        :param accepting: Indicateurs d'acceptation (un octet par état).
+        :param states: Noms des états (par défaut, leurs indices).
+        :param inputs: Noms des entrées (par défaut, leurs indices).
+        """
+        self.num_states = num_states
+        self.num_inputs = num_inputs
+        self.offsets = offsets if isinstance(offsets, array) else array("l", offsets)
+        self.targets = targets if isinstance(targets, array) else array("l", targets)
+        if len(self.offsets) != num_states * num_inputs + 1:
+            raise ValueError("Tableau des débuts de ligne de taille incohérente")
+        self.initial_state = initial_state
+        self.accepting = bytearray(accepting)
+        self.states = list(states) if states is not None else list(range(num_states))
+        self.inputs = list(inputs) if inputs is not None else list(range(num_inputs))
+        self.initial_subset = frozenset((initial_state,))
+        self._step_cache = {}
+        self._live = None
+
+    @classmethod
+    def from_nfa(cls, nfa, inputs=None):
+        """
+        Compile un NFA à dictionnaire.
+        :param nfa: Instance de NFA.
+        :param inputs: Ordre des entrées à utiliser (par défaut, nfa.alphabet), par exemple
+                       celui d'une CompiledMealy pour partager les indices d'entrées.
+        :return: Instance de CompiledNFA.
+        """
+        states = list(nfa.states)
+        state_ids = {state: index for index, state in enumerate(states)}
+        for (state, _), next_states in nfa.transitions.items():
+            for s in (state, *next_states):
+                if s not in state_ids:
+                    state_ids[s] = len(states)
+                    states.append(s)
+        input_ids = {}
+        for input_symbol in (nfa.alphabet if inputs is None else inputs):
+            input_ids.setdefault(input_symbol, len(input_ids))
+        k = len(input_ids)
+        rows = [()] * (len(states) * k)
+        for (state, input_symbol), next_states in nfa.transitions.items():
+            if input_symbol in input_ids:
+                rows[state_ids[state] * k + input_ids[input_symbol]] = sorted({state_ids[s] for s in next_states})
+        offsets = array("l", [0])
+        targets = array("l")
+        for row in rows:
+            targets.extend(row)
+            offsets.append(len(targets))
+        accepting = bytearray(len(states))
+        for state in nfa.accepting_states:
+            accepting[state_ids[state]] = 1
+        return cls(len(states), k, offsets, targets, state_ids[nfa.initial_state], accepting,
+                   states, list(input_ids))
+
+    def to_nfa(self):
+        """
+        Reconstruit un NFA à dictionnaire.
+        :return: Instance de NFA.
+        """
+        transitions = {}
+        for state, input_symbol, next_states in self.iter_transitions():
+            transitions[(state, input_symbol)] = next_states
+        accepting_states = [self.states[q] for q in range(self.num_states) if self.accepting[q]]
+        return NFA(list(self.states), list(self.inputs), transitions,
+                   self.states[self.initial_state], accepting_states)
+
+    def with_inputs(self, inputs):
+        """
+        Réindexe les colonnes du NFA selon un autre ordre des entrées, par exemple celui
+        d'une CompiledMealy. Une entrée absente du NFA n'a aucun successeur ; une entrée
+        absente de `inputs` est ignorée.
+        :param inputs: Noms des entrées, dans le nouvel ordre.
+        :return: Instance de CompiledNFA.
+        """
+        input_ids = {input_symbol: index for index, input_symbol in enumerate(self.inputs)}
+        columns = [input_ids.get(input_symbol) for input_symbol in inputs]
+        offsets = array("l", [0])
+        targets = array("l")
+        for state in range(self.num_states):
+            for input_id in columns:
+                if input_id is not None:
+                    targets.extend(self.successors(state, input_id))
+                offsets.append(len(targets))
+        return CompiledNFA(self.num_states, len(columns), offsets, targets, self.initial_state,
+                           self.accepting, self.states, inputs)
+
+    def iter_transitions(self):
+        """
+        Parcourt les transitions définies avec leurs noms.
+        :return: Itérateur de tuples (état, entrée, liste des états suivants).
+        """
+        k = self.num_inputs
+        offsets, targets, states = self.offsets, self.targets, self.states
+        for index in range(self.num_states * k):
+            start, end = offsets[index], offsets[index + 1]
+            if start != end:
+                state, input_id = divmod(index, k)
+                yield states[state], self.inputs[input_id], [states[q] for q in targets[start:end]]
+
+    def successors(self, state, input_id):
+        """Retourne les successeurs de l'état `state` par l'entrée `input_id`."""
+        index = state * self.num_inputs + input_id
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+    def step(self, subset, input_id):
+        """
+        Calcule l'ensemble d'états atteint depuis `subset` par l'entrée `input_id` (mémoïsé).
+        :param subset: frozenset d'indices d'états.
+        :param input_id: Indice de l'entrée.
+        :return: frozenset d'indices d'états (éventuellement vide).
+        """
+        key = (subset, input_id)
+        result = self._step_cache.get(key)
+        if METRICS.enabled:
+            METRICS.add("nfa_subset_steps")
+        if result is None:
+            k = self.num_inputs
+            offsets, targets = self.offsets, self.targets
+            next_states = set()
+            for state in subset:
+                index = state * k + input_id
+                next_states.update(targets[offsets[index]:offsets[index + 1]])
+            result = self._step_cache[key] = frozenset(next_states)
+        return result
+
+    def run(self, input_sequence, subset=None):
+        """
+        Calcule l'ensemble d'états atteint après une séquence d'indices d'entrées.
+        :param input_sequence: Séquence d'indices d'entrées.
+        :param subset: Ensemble de départ (par défaut, l'état initial).
+        :return: frozenset d'indices d'états.
+        """
+        subset = self.initial_subset if subset is None else subset
+        for input_id in input_sequence:
+            subset = self.step(subset, input_id)
+            if not subset:
+                break
+        return subset
+
+    def is_accepting(self, subset):
+        """Indique si un ensemble d'états contient un état acceptant."""
+        accepting = self.accepting
+        return any(accepting[state] for state in subset)
+
+    def is_accepted(self, input_sequence):
+        """
+        Vérifie si une séquence d'indices d'entrées est acceptée.
+        :param input_sequence: Séquence d'indices d'entrées.
+        :return: True si acceptée, False sinon.
+        """
+        return self.is_accepting(self.run(input_sequence))
+
+    def live_states(self):
+        """
+        Calcule les états depuis lesquels un état acceptant est atteignable.
+        :return: bytearray (1 pour un état vivant).
+        """
+        if self._live is None:
+            predecessors = [[] for _ in range(self.num_states)]
+            k = self.num_inputs
+            offsets, targets = self.offsets, self.targets
+            for index in range(self.num_states * k):
+                source = index // k
+                for target in targets[offsets[index]:offsets[index + 1]]:
+                    predecessors[target].append(source)
+            live = bytearray(self.accepting)
+            stack = [q for q in range(self.num_states) if live[q]]
+            while stack:
+                for source in predecessors[stack.pop()]:
+                    if not live[source]:
+                        live[source] = 1
+                        stack.append(source)
+            self._live = live
+        return self._live
+
+    def allowed_step(self, subset, input_id):
+        """
+        Calcule le successeur restreint aux états vivants : une entrée est autorisée
+        si la séquence prolongée reste un préfixe d'un mot accepté.
+        :return: frozenset des états vivants atteints (vide si l'entrée est interdite).
+        """
+        key = (subset, input_id, True)
+        result = self._step_cache.get(key)
+        if result is None:
+            live = self.live_states()
+            result = self._step_cache[key] = frozenset(q for q in self.step(subset, input_id) if live[q])
+        return result
+
+def compile_pair(mealy_machine, nfa=None):
+    """
+    Compile une machine de Mealy et sa restriction avec des indices d'entrées communs.
+    Les entrées sont alignées par leur nom, y compris si les deux machines sont déjà compilées.
+    :param mealy_machine: Instance de MealyMachine ou de CompiledMealy.
+    :param nfa: Instance de NFA ou de CompiledNFA (facultatif).
+    :return: Tuple (CompiledMealy, CompiledNFA ou None).
+    """
+    if not isinstance(mealy_machine, CompiledMealy):
+        inputs = None
+        if nfa is not None:
+            inputs = nfa.inputs if isinstance(nfa, CompiledNFA) else nfa.alphabet
+        mealy_machine = CompiledMealy.from_mealy(mealy_machine, inputs=inputs)
+    if nfa is not None and not isinstance(nfa, CompiledNFA):
+        nfa = CompiledNFA.from_nfa(nfa, inputs=mealy_machine.inputs)
+    elif nfa is not None and nfa.inputs != mealy_machine.inputs:
+        nfa = nfa.with_inputs(mealy_machine.inputs)
+    return mealy_machine, nfa
@@ -0,0 +1,283 @@
+import time
+from itertools import product
+
+from .metrics import METRICS
+
+# Classe pour la machine de Mealy
+class MealyMachine:
+    def __init__(self, transitions, initial_state):
+        """
+        Initialise une machine de Mealy.
+        :param transitions: Dictionnaire des transitions { (state, input): (next_state, output) }.
+        :param initial_state: État initial.
+        """
+        self.transitions = transitions
+        self.initial_state = initial_state
+        self.current_state = initial_state
+
+    def reset(self):
+        """Réinitialise l'état courant à l'état initial."""
+        if METRICS.enabled:
+            METRICS.add("resets")
+        self.current_state = self.initial_state
+
+    def process_input(self, input_sequence):
+        """
+        Traite une séquence d'entrées et retourne les sorties correspondantes,
+        ainsi que l'évolution des états.
+        :param input_sequence: Liste des entrées.
+        :return: Tuple (liste des sorties, liste des états visités).
+        """
+        outputs = []
+        states = [self.current_state]
+        for input_symbol in input_sequence:
+            if (self.current_state, input_symbol) in self.transitions:
+                next_state, output = self.transitions[(self.current_state, input_symbol)]
+                outputs.append(output)
+                self.current_state = next_state
+                states.append(next_state)
+            else:
+                if METRICS.enabled:
+                    METRICS.add("transitions_simulated", len(outputs))
+                raise ValueError(f"Transition inconnue pour ({self.current_state}, {input_symbol})")
+        if METRICS.enabled:
+            METRICS.add("transitions_simulated", len(outputs))
+        return outputs, states
+
+    def display_graph(self, output_file="mealy_machine", view=True, **options):
+        """
+        Affiche un graphe de la machine de Mealy, rendu en arrière-plan.
+        :return: Future donnant le chemin du fichier rendu.
+        """
+        from .rendering import render_mealy
+        return render_mealy(self, output_file, view=view, **options)
+
+# Classe pour le NFA
+class NFA:
+    def __init__(self, states, alphabet, transitions, initial_state, accepting_states):
+        """
+        Initialise un NFA.
+        :param states: Liste des états.
+        :param alphabet: Alphabet des entrées.
+        :param transitions: Fonction de transition {(state, input): [next_states]}.
+        :param initial_state: État initial.
+        :param accepting_states: Ensemble des états acceptants.
+        """
+        self.states = states
+        self.alphabet = alphabet
+        self.transitions = transitions
+        self.initial_state = initial_state
+        self.accepting_states = accepting_states
+
+    def is_accepted(self, input_sequence):
+        """
+        Vérifie si une séquence est acceptée par le NFA.
+        :param input_sequence: Séquence d'entrée.
+        :return: True si acceptée, False sinon.
+        """
+        current_states = {self.initial_state}
+        for input_symbol in input_sequence:
+            next_states = set()
+            for state in current_states:
+                if (state, input_symbol) in self.transitions:
+                    next_states.update(self.transitions[(state, input_symbol)])
+            current_states = next_states
+        if METRICS.enabled:
+            METRICS.add("nfa_subset_steps", len(input_sequence))
+        return len(current_states & set(self.accepting_states)) > 0
+
+    def display_graph(self, output_file="nfa_graph", view=True, **options):
+        """
+        Affiche un graphe du NFA, rendu en arrière-plan.
+        :return: Future donnant le chemin du fichier rendu.
+        """
+        from .rendering import render_nfa
+        return render_nfa(self, output_file, view=view, **options)
+
+# Génération de tests avec et sans restrictions
+def generate_tests(transitions, max_length):
+    """Génère toutes les combinaisons possibles d'entrées jusqu'à une longueur donnée."""
+    inputs = {key[1] for key in transitions.keys()}
+    tests = []
+    for length in range(1, max_length + 1):
+        tests.extend(product(inputs, repeat=length))
+    if METRICS.enabled:
+        METRICS.add("sequences_generated", len(tests))
+    return [list(test) for test in tests]
+
+def generate_restricted_tests(nfa, max_length):
+    """Génère toutes les séquences acceptées par le NFA jusqu'à une longueur donnée."""
+    tests = []
+    candidates = 0
+    for length in range(1, max_length + 1):
+        for test in product(nfa.alphabet, repeat=length):
+            candidates += 1
+            if nfa.is_accepted(test):
+                tests.append(list(test))
+    if METRICS.enabled:
+        METRICS.add("sequences_generated", candidates)
+        METRICS.add("sequences_pruned", candidates - len(tests))
+    return tests
+
+def deduplicate_tests(test_sequences):
+    """
+    Élimine les séquences en double en conservant l'ordre de première apparition.
+    :param test_sequences: Liste des séquences.
+    :return: Liste des séquences uniques.
+    """
+    seen = set()
+    unique_tests = []
+    for test in test_sequences:
+        key = tuple(test)
+        if key not in seen:
+            seen.add(key)
+            unique_tests.append(test)
+    if METRICS.enabled:
+        METRICS.add("sequences_deduplicated", len(test_sequences) - len(unique_tests))
+    return unique_tests
+
+# Fonction pour exécuter les tests sur une machine de Mealy
+def execute_tests(mealy_machine, test_sequences):
+    """
+    Exécute les tests sur la machine de Mealy et retourne les résultats.
+    :param mealy_machine: Instance de MealyMachine, de CompiledMealy ou de Mealy (exécutée
+                          par son MealyRunner).
+    :param test_sequences: Liste des séquences à tester.
+    :return: Liste des résultats (entrée -> sortie, états visités).
+    """
+    if hasattr(mealy_machine, "runner"):
+        mealy_machine = mealy_machine.runner()
+    results = []
+    for sequence in test_sequences:
+        mealy_machine.reset()
+        try:
+            outputs, states = mealy_machine.process_input(sequence)
+            results.append((sequence, outputs, states))
+        except ValueError as e:
+            results.append((sequence, str(e), []))
+    return results
+
+# Méthodes Simple et Complexe pour k-completes
+def simple_method(mealy_machine):
+    """Génère des séquences couvrant toutes les transitions."""
+    tests = []
+    for (state, input_symbol), (next_state, output) in mealy_machine.transitions.items():
+        tests.append([input_symbol])
+    if METRICS.enabled:
+        METRICS.add("sequences_generated", len(tests))
+    return tests
+
+def complex_method(mealy_machine, max_length):
+    """Génère des séquences k-complètes jusqu'à une longueur donnée."""
+    inputs = {key[1] for key in mealy_machine.transitions.keys()}
+    tests = []
+    for length in range(1, max_length + 1):
+        tests.extend(product(inputs, repeat=length))
+    if METRICS.enabled:
+        METRICS.add("sequences_generated", len(tests))
+    return [list(test) for test in tests]
+
+def _run_methods(mealy_machine, methods, memory, memory_budget):
+    """
+    Génère puis exécute les tests de chaque méthode, étape par étape.
+    Une méthode qui dépasse le budget mémoire est interrompue et les suivantes sont exécutées.
+    :param methods: Dictionnaire {nom: fonction sans argument générant les tests}.
+    :return: Dictionnaire {nom: {"tests", "results", "time"}} (avec "memory" si la mémoire est
+             mesurée) ; une méthode interrompue donne {"exceeded", "time", "memory"}.
+    """
+    from .memory import MemoryBudgetExceeded, MemoryMonitor
+    results = {}
+    track_memory = memory or memory_budget is not None
+    for name, generate in methods.items():
+        monitor = MemoryMonitor(budget=memory_budget, enabled=track_memory)
+        start_time = time.time()
+        try:
+            with monitor:
+                start_time = time.time()
+                with METRICS.stage(f"{name}.generation"), monitor.stage("generation"):
+                    tests = generate()
+                with METRICS.stage(f"{name}.execution"), monitor.stage("execution"):
+                    method_results = execute_tests(mealy_machine, tests)
+                elapsed = time.time() - start_time
+        except MemoryBudgetExceeded as e:
+            results[name] = {"exceeded": str(e), "time": time.time() - start_time, "memory": monitor.report()}
+            continue
+        results[name] = {
+            "tests": tests,
+            "results": method_results,
+            "time": elapsed,
+        }
+        if track_memory:
+            report = monitor.report(tests)
+            # Les résultats conservés après l'exécution constituent le stockage des résultats
+            report["result_storage"] = report["stages"]["execution"]["retained"]
+            results[name]["memory"] = report
+    return results
+
+def _collect_metrics(run, metrics_json, metrics_prometheus):
+    """Exécute `run` en collectant les métriques si un fichier d'export est demandé, puis les exporte."""
+    collect = bool(metrics_json or metrics_prometheus) and not METRICS.enabled
+    if collect:
+        METRICS.reset()
+        METRICS.enable()
+    try:
+        return run()
+    finally:
+        # Désactivée et exportée même si une méthode échoue
+        if collect:
+            METRICS.disable()
+        if metrics_json:
+            METRICS.to_json(metrics_json)
+        if metrics_prometheus:
+            METRICS.write_prometheus(metrics_prometheus)
+
+# Comparaison des performances
+def compare_methods(mealy_machine, nfa, max_length, metrics_json=None, metrics_prometheus=None,
+                    memory=False, memory_budget=None):
+    """
+    Compare les méthodes Simple et Complexe.
+    :param metrics_json: Fichier du rapport de métriques JSON (active la collecte).
+    :param metrics_prometheus: Fichier des métriques au format Prometheus (active la collecte).
+    :param memory: Mesurer la mémoire de chaque méthode (tracemalloc ralentit l'exécution).
+    :param memory_budget: Budget mémoire par méthode en octets ; une méthode qui le dépasse
+                          est interrompue et son résultat devient {"exceeded", "time", "memory"}
+                          (implique memory=True).
+    """
+    methods = {
+        "simple": lambda: simple_method(mealy_machine),
+        "complex": lambda: generate_restricted_tests(nfa, max_length),
+    }
+    return _collect_metrics(lambda: _run_methods(mealy_machine, methods, memory, memory_budget),
+                            metrics_json, metrics_prometheus)
+
+# Validation des méthodes Simple et Complexe (sans restriction)
+def validate_methods(mealy_machine, max_complex_length, metrics_json=None, metrics_prometheus=None,
+                     memory=False, memory_budget=None):
+    """
+    Compare les performances des méthodes Simple et Complexe sur la machine de Mealy,
+    sans restriction (voir compare_methods pour les paramètres de mesure).
+    :param mealy_machine: Instance de MealyMachine.
+    :param max_complex_length: Longueur maximale pour les tests complexes.
+    :return: Dictionnaire {méthode: {"tests_generated", "execution_time", "transitions_covered"}},
+             avec "memory" si la mémoire est mesurée, ou {"exceeded", "execution_time", "memory"}.
+    """
+    methods = {
+        "simple": lambda: simple_method(mealy_machine),
+        "complex": lambda: complex_method(mealy_machine, max_complex_length),
+    }
+    runs = _collect_metrics(lambda: _run_methods(mealy_machine, methods, memory, memory_budget),
+                            metrics_json, metrics_prometheus)
+    results = {}
+    for name, run in runs.items():
+        if "exceeded" in run:
+            results[name] = {"exceeded": run["exceeded"], "execution_time": run["time"], "memory": run["memory"]}
+            continue
+        results[name] = {
+            "tests_generated": len(run["tests"]),
+            "execution_time": run["time"],
+            # La méthode simple couvre chaque transition une fois
+            "transitions_covered": len(run["tests"]) if name == "simple" else len(run["results"]),
+        }
+        if "memory" in run:
+            results[name]["memory"] = run["memory"]
+    return results
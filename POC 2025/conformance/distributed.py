@@ -0,0 +1,381 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+from .batch import execute_chunks
+from .checkpoint import TestEnumerator
+from .loaders import load_mealy, load_nfa
+from .sinks import open_sink, verdict_format
+
+# Le coordinateur et les travailleurs échangent un objet JSON par ligne sur une connexion TCP.
+# Requêtes : {"op": "lease", "worker"}, {"op": "renew", "lease", "worker"},
+# {"op": "complete", "lease", "results"}.
+# Les modèles sont relus par chaque travailleur depuis les chemins du travail (stockage partagé).
+
+# Nombre de tranches visé par défaut
+DEFAULT_SHARDS = 64
+# Durée par défaut d'un bail (secondes) : au-delà, la tranche est réattribuée
+DEFAULT_LEASE_TIMEOUT = 60.0
+
+def _load(job):
+    mealy_machine = load_mealy(job["model"])
+    nfa = load_nfa(job["restriction"]) if job.get("restriction") else None
+    implementation = load_mealy(job["implementation"]) if job.get("implementation") else None
+    return mealy_machine, nfa, implementation
+
+def plan_shards(job, mealy_machine, nfa=None, target=DEFAULT_SHARDS):
+    """
+    Découpe la suite d'un travail en tranches indépendantes.
+    Pour complex et restricted, la profondeur d est la plus petite qui donne au moins
+    `target` préfixes admis : une tranche {"max_length": d} regroupe les séquences de
+    longueur <= d, puis une tranche {"prefix"} par préfixe de longueur d regroupe ses
+    prolongements. Les suites linéaires (simple, k-complete) sont découpées en intervalles
+    d'indices {"start", "end"}.
+    :param job: Dictionnaire du travail (voir batch.run_job).
+    :param mealy_machine: Instance de MealyMachine.
+    :param nfa: Restriction (obligatoire pour "restricted").
+    :param target: Nombre de tranches visé.
+    :return: Liste des tranches, dans l'ordre de la fusion des résultats.
+    """
+    method = job.get("method", "restricted")
+    max_length = job.get("max_length", 3)
+    enumerator = TestEnumerator(method, mealy_machine, nfa, max_length, job.get("k", 1))
+    if not enumerator.tree:
+        total = sum(1 for _ in enumerator)
+        size = max(1, -(-total // target))
+        return [{"start": start, "end": min(start + size, total)} for start in range(0, total, size)]
+    depth = 0
+    prefixes = [()]
+    while depth < max_length - 1 and len(prefixes) < target:
+        depth += 1
+        prefixes = enumerator.prefixes(depth)
+    shards = [{"max_length": depth}] if depth else []
+    return shards + [{"prefix": list(prefix)} for prefix in prefixes]
+
+def shard_tests(job, shard, mealy_machine, nfa=None):
+    """
+    Énumère les séquences d'une tranche de plan_shards.
+    :return: Itérateur de listes de symboles.
+    """
+    method = job.get("method", "restricted")
+    max_length = job.get("max_length", 3)
+    if "start" in shard:
+        tests = TestEnumerator(method, mealy_machine, nfa, max_length, job.get("k", 1))
+        return islice(tests, shard["start"], shard["end"])
+    if "max_length" in shard:
+        return TestEnumerator(method, mealy_machine, nfa, shard["max_length"])
+    return TestEnumerator(method, mealy_machine, nfa, max_length, prefix=shard["prefix"])
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                message = None
+            if isinstance(message, dict):
+                response = self.server.coordinator.handle(message)
+            else:
+                response = {"ok": False, "error": "Requête JSON invalide"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+# Coordinateur : distribue les tranches d'un travail et fusionne leurs résultats
+class Coordinator:
+    def __init__(self, job, output_file, shards=DEFAULT_SHARDS, lease_timeout=DEFAULT_LEASE_TIMEOUT,
+                 host="127.0.0.1", port=0):
+        """
+        Prépare la distribution d'un travail et ouvre le port d'écoute.
+        Les résultats de chaque tranche terminée sont écrits dans output_file + ".shards/" ;
+        un coordinateur relancé sur le même travail ne redistribue que les tranches manquantes.
+        :param job: Dictionnaire du travail (voir batch.run_job ; stop_on_failure est ignoré).
+        :param output_file: Fichier des résultats fusionnés (format et compression du travail).
+        :param shards: Nombre de tranches visé (voir plan_shards).
+        :param lease_timeout: Durée d'un bail en secondes ; une tranche dont le bail expire
+                              sans être renouvelé est réattribuée.
+        :param host: Adresse d'écoute ("0.0.0.0" pour accepter des travailleurs distants).
+        :param port: Port d'écoute (0 : port libre choisi par le système).
+        """
+        if job.get("implementation"):
+            verdict_format(output_file, job.get("format"))
+        self.job = job
+        self.output_file = output_file
+        self.lease_timeout = lease_timeout
+        self.shard_dir = output_file + ".shards"
+        os.makedirs(self.shard_dir, exist_ok=True)
+        mealy_machine, nfa, _ = _load(job)
+        self.shards = self._plan(mealy_machine, nfa, shards)
+        self.completed = {shard for shard in range(len(self.shards)) if os.path.exists(self._shard_path(shard))}
+        self.queue = deque(shard for shard in range(len(self.shards)) if shard not in self.completed)
+        self.leases = {}
+        self.reassigned = 0
+        self.workers = set()
+        self.condition = threading.Condition()
+        self._next_lease = 0
+        self.server = _Server((host, port), _Handler)
+        self.server.coordinator = self
+
+    def _plan(self, mealy_machine, nfa, target):
+        # Le plan est conservé avec les tranches : une reprise réutilise exactement le même découpage
+        plan_file = os.path.join(self.shard_dir, "plan.json")
+        if os.path.exists(plan_file):
+            with open(plan_file) as f:
+                plan = json.load(f)
+            if plan["job"] == json.loads(json.dumps(self.job)):
+                return plan["shards"]
+            raise ValueError(f"{self.shard_dir} contient les tranches d'un autre travail")
+        shards = plan_shards(self.job, mealy_machine, nfa, target)
+        with open(plan_file + ".tmp", "w") as f:
+            json.dump({"job": self.job, "shards": shards}, f)
+        os.replace(plan_file + ".tmp", plan_file)
+        return shards
+
+    def _shard_path(self, shard):
+        return os.path.join(self.shard_dir, f"shard-{shard:05d}.jsonl")
+
+    @property
+    def address(self):
+        """Adresse (hôte, port) à donner aux travailleurs."""
+        return self.server.server_address
+
+    def _expire(self, now):
+        for lease, (shard, _, deadline) in list(self.leases.items()):
+            if deadline < now:
+                del self.leases[lease]
+        leased = {shard for shard, _, _ in self.leases.values()}
+        for shard in range(len(self.shards)):
+            if shard not in self.completed and shard not in leased and shard not in self.queue:
+                self.queue.appendleft(shard)
+                self.reassigned += 1
+
+    def handle(self, message):
+        """
+        Traite une requête d'un travailleur.
+        :param message: Dictionnaire {"op": "lease" | "renew" | "complete", ...}.
+        :return: Dictionnaire réponse.
+        """
+        op = message.get("op")
+        if op == "complete":
+            return self._complete(message)
+        with self.condition:
+            now = time.monotonic()
+            if op == "lease":
+                self._expire(now)
+                if len(self.completed) == len(self.shards):
+                    return {"done": True}
+                if not self.queue:
+                    deadline = min((deadline for _, _, deadline in self.leases.values()), default=now + 1.0)
+                    return {"wait": max(0.05, min(1.0, deadline - now))}
+                shard = self.queue.popleft()
+                self._next_lease += 1
+                lease = f"{shard}-{self._next_lease}"
+                self.leases[lease] = (shard, message.get("worker"), now + self.lease_timeout)
+                self.workers.add(message.get("worker"))
+                return {"lease": lease, "job": self.job, "shard": self.shards[shard],
+                        "timeout": self.lease_timeout}
+            if op == "renew":
+                # Un bail expiré est réaccordé tant que sa tranche n'est pas terminée ailleurs
+                lease = message.get("lease")
+                shard = self._lease_shard(lease)
+                if shard is None:
+                    return {"ok": False, "error": f"Bail inconnu : {lease}"}
+                if shard in self.completed:
+                    return {"ok": False, "completed": True}
+                entry = self.leases.get(lease)
+                worker = entry[1] if entry is not None else message.get("worker")
+                self.leases[lease] = (shard, worker, now + self.lease_timeout)
+                if shard in self.queue:
+                    self.queue.remove(shard)
+                return {"ok": True}
+        return {"ok": False, "error": f"Opération inconnue : {op}"}
+
+    def _complete(self, message):
+        lease = message.get("lease")
+        shard = self._lease_shard(lease)
+        if shard is None or not isinstance(message.get("results"), list):
+            return {"ok": False, "error": f"Bail inconnu ou résultats absents : {lease}"}
+        # Écriture hors du verrou, puis renommage : la première tranche terminée l'emporte
+        temporary = f"{self._shard_path(shard)}.{lease}.tmp"
+        with open(temporary, "w") as f:
+            f.write("".join(json.dumps(result) + "\n" for result in message["results"]))
+        with self.condition:
+            self.leases.pop(lease, None)
+            if shard in self.completed:
+                os.remove(temporary)
+                return {"ok": False, "duplicate": True}
+            os.replace(temporary, self._shard_path(shard))
+            self.completed.add(shard)
+            if shard in self.queue:
+                self.queue.remove(shard)
+            self.condition.notify_all()
+        return {"ok": True}
+
+    def _lease_shard(self, lease):
+        """
+        Tranche d'un bail délivré par ce coordinateur ("tranche-numéro"), ou None.
+        Un bail expiré reste valide : la première tranche terminée l'emporte.
+        """
+        if not isinstance(lease, str):
+            return None
+        shard, _, number = lease.partition("-")
+        if not (shard.isdigit() and number.isdigit()):
+            return None
+        shard = int(shard)
+        if shard >= len(self.shards) or not 0 < int(number) <= self._next_lease:
+            return None
+        return shard
+
+    def wait(self, timeout=None):
+        """
+        Attend que toutes les tranches soient terminées.
+        :return: True si elles le sont, False si le délai a expiré.
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: len(self.completed) == len(self.shards), timeout)
+
+    def merge(self):
+        """
+        Fusionne les résultats des tranches, dans l'ordre du plan, dans output_file ;
+        en mode verdict, les tests sont renumérotés dans l'ordre de la fusion.
+        :return: Dictionnaire des compteurs {"tests", "errors"} (et "failures", "inconclusive").
+        """
+        verdicts = bool(self.job.get("implementation"))
+        counts = {"tests": 0, "errors": 0}
+        if verdicts:
+            from .verdict import FAIL, INCONCLUSIVE
+            counts.update({"failures": 0, "inconclusive": 0})
+        format = verdict_format(self.output_file, self.job.get("format")) if verdicts else self.job.get("format")
+        with open_sink(self.output_file, format, compress=self.job.get("compress")) as sink:
+            for shard in range(len(self.shards)):
+                with open(self._shard_path(shard)) as f:
+                    for line in f:
+                        result = json.loads(line)
+                        if verdicts:
+                            result[0] = counts["tests"]
+                            counts["failures"] += result[1] == FAIL
+                            counts["inconclusive"] += result[1] == INCONCLUSIVE
+                        else:
+                            counts["errors"] += isinstance(result[1], str)
+                        sink.write(tuple(result))
+                        counts["tests"] += 1
+        return counts
+
+    def run(self, timeout=None):
+        """
+        Sert les travailleurs jusqu'à la fin de toutes les tranches, puis fusionne.
+        :param timeout: Délai maximal d'attente en secondes (None : illimité).
+        :return: Dictionnaire résumé, au format de batch.run_job, avec "shards", "reassigned" et "workers".
+        """
+        start_time = time.time()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            finished = self.wait(timeout)
+        finally:
+            self.server.shutdown()
+            self.server.server_close()
+        summary = {"model": self.job["model"], "restriction": self.job.get("restriction"),
+                   "method": self.job.get("method", "restricted"), "shards": len(self.shards),
+                   "reassigned": self.reassigned, "workers": sorted(map(str, self.workers)),
+                   "output": self.output_file}
+        if not finished:
+            summary.update({"status": "timeout", "completed": len(self.completed), "time": time.time() - start_time})
+            return summary
+        summary.update(self.merge())
+        summary["status"] = "ok"
+        if self.job.get("implementation"):
+            summary["verdict"] = "fail" if summary["failures"] else "pass"
+        summary["time"] = time.time() - start_time
+        return summary
+
+def run_worker(address, name=None, chunk_size=1000):
+    """
+    Travailleur : demande des tranches au coordinateur, génère et exécute leurs tests,
+    et renvoie les résultats, jusqu'à ce que toutes les tranches soient terminées.
+    Le bail est renouvelé entre deux lots, et réaccordé s'il a expiré entre-temps : la
+    tranche n'est abandonnée que si un autre travailleur l'a déjà terminée.
+    :param address: Tuple (hôte, port) ou chaîne "hôte:port" du coordinateur.
+    :param name: Nom du travailleur (par défaut, hôte et numéro de processus).
+    :param chunk_size: Nombre de tests exécutés entre deux renouvellements.
+    :return: Nombre de tranches terminées par ce travailleur.
+    """
+    if isinstance(address, str):
+        host, port = address.rsplit(":", 1)
+        address = (host, int(port))
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    machines = {}
+    completed = 0
+    with socket.create_connection(address) as connection, connection.makefile("rwb") as stream:
+
+        def call(message):
+            stream.write(json.dumps(message).encode() + b"\n")
+            stream.flush()
+            line = stream.readline()
+            # Connexion fermée : le coordinateur a terminé
+            return json.loads(line) if line else {"done": True}
+
+        while True:
+            try:
+                reply = call({"op": "lease", "worker": name})
+            except ConnectionError:
+                return completed
+            if reply.get("done"):
+                return completed
+            if "wait" in reply:
+                time.sleep(reply["wait"])
+                continue
+            job = reply["job"]
+            key = json.dumps(job, sort_keys=True)
+            if key not in machines:
+                machines = {key: _load(job)}
+            mealy_machine, nfa, implementation = machines[key]
+            tests = shard_tests(job, reply["shard"], mealy_machine, nfa)
+            chunks = iter(lambda: list(islice(tests, chunk_size)), [])
+            results = []
+            renewed = time.monotonic()
+            for chunk_results in execute_chunks(mealy_machine, chunks, 1, implementation):
+                results.extend(chunk_results)
+                if time.monotonic() - renewed > reply["timeout"] / 3:
+                    if not call({"op": "renew", "lease": reply["lease"], "worker": name}).get("ok"):
+                        break
+                    renewed = time.monotonic()
+            else:
+                if call({"op": "complete", "lease": reply["lease"], "results": results}).get("ok"):
+                    completed += 1
+
+def run_distributed(job, output_file, workers=2, shards=DEFAULT_SHARDS, lease_timeout=DEFAULT_LEASE_TIMEOUT,
+                    chunk_size=1000, timeout=None):
+    """
+    Exécute un travail avec un coordinateur et des processus travailleurs locaux.
+    :param job: Dictionnaire du travail (voir batch.run_job).
+    :param output_file: Fichier des résultats fusionnés.
+    :param workers: Nombre de processus travailleurs.
+    :param shards: Nombre de tranches visé.
+    :param lease_timeout: Durée d'un bail en secondes.
+    :param chunk_size: Nombre de tests exécutés entre deux renouvellements de bail.
+    :param timeout: Délai maximal en secondes (None : illimité).
+    :return: Résumé de Coordinator.run.
+    """
+    from multiprocessing import Process
+
+    coordinator = Coordinator(job, output_file, shards, lease_timeout)
+    processes = [Process(target=run_worker, args=(coordinator.address, f"local-{index}", chunk_size), daemon=True)
+                 for index in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        return coordinator.run(timeout)
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
@@ -0,0 +1,166 @@
+from collections import deque
+
+from .compiled import CompiledMealy, CompiledNFA, NULL_STATE, DEFAULT_OUTPUT
+
+class _Side:
+    """Machine compilée et correspondance des entrées communes vers ses propres indices."""
+
+    def __init__(self, machine, inputs):
+        if not isinstance(machine, CompiledMealy):
+            machine = CompiledMealy.from_mealy(machine)
+        self.machine = machine
+        own = {input_symbol: index for index, input_symbol in enumerate(machine.inputs)}
+        self.columns = [own.get(input_symbol, -1) for input_symbol in inputs]
+
+    def step(self, state, input_id):
+        """Retourne (état suivant, sortie) ou None si la transition n'est pas définie."""
+        column = self.columns[input_id]
+        if column < 0:
+            return None
+        machine = self.machine
+        index = state * machine.num_inputs + column
+        next_state = machine.next_state[index]
+        if next_state == NULL_STATE:
+            return None
+        output = machine.output[index]
+        return next_state, None if output == DEFAULT_OUTPUT else machine.outputs[output]
+
+def _inputs(*machines):
+    inputs = {}
+    for machine in machines:
+        symbols = machine.inputs if isinstance(machine, CompiledMealy) else \
+            (input_symbol for _, input_symbol in machine.transitions)
+        for input_symbol in symbols:
+            inputs.setdefault(input_symbol, len(inputs))
+    return list(inputs)
+
+class _Restriction:
+    """Restriction compilée sur les entrées communes (None : aucune restriction)."""
+
+    def __init__(self, nfa, inputs):
+        if nfa is not None and not isinstance(nfa, CompiledNFA):
+            nfa = CompiledNFA.from_nfa(nfa, inputs=inputs)
+        self.nfa = nfa
+        if nfa is None:
+            self.initial = None
+            return
+        own = {input_symbol: index for index, input_symbol in enumerate(nfa.inputs)}
+        self.columns = [own.get(input_symbol, -1) for input_symbol in inputs]
+        live = nfa.live_states()
+        self.initial = frozenset(q for q in nfa.initial_subset if live[q])
+
+    def step(self, subset, input_id):
+        """Ensemble suivant, ou None si l'entrée n'est pas autorisée."""
+        if self.nfa is None:
+            return None, True
+        column = self.columns[input_id]
+        if column < 0 or not subset:
+            return None, False
+        next_subset = self.nfa.allowed_step(subset, column)
+        return next_subset, bool(next_subset)
+
+def _differs(left, right):
+    """Deux pas (ou absences de transition) donnent-ils des observations différentes ?"""
+    if left is None or right is None:
+        return (left is None) != (right is None)
+    return left[1] != right[1]
+
+def _outputs(side, word):
+    """Sorties d'une machine sur un mot (interrompues à la première transition absente)."""
+    outputs = []
+    state = side.machine.initial_state
+    for input_id in word:
+        step = side.step(state, input_id)
+        if step is None:
+            break
+        state, output = step
+        outputs.append(output)
+    return outputs
+
+def check_equivalence(specification, implementation, nfa=None):
+    """
+    Vérifie que deux machines de Mealy produisent les mêmes sorties sur tous les mots
+    autorisés par la restriction (préfixes de mots acceptés par le NFA). Une transition
+    définie dans une seule des machines constitue une différence.
+    L'exploration du produit (état, état, ensemble du NFA) suit Hopcroft–Karp : une
+    union-find fusionne les états jugés équivalents pour un même ensemble du NFA, et
+    une paire déjà dans la même classe n'est plus explorée. En cas de différence, un
+    parcours en largeur du produit fournit un contre-exemple de longueur minimale.
+    :param specification: MealyMachine ou CompiledMealy de référence.
+    :param implementation: MealyMachine ou CompiledMealy à vérifier.
+    :param nfa: Restriction (NFA ou CompiledNFA), facultative.
+    :return: Dictionnaire {"equivalent", "counterexample", "expected", "observed", "pairs"}.
+    """
+    inputs = _inputs(specification, implementation)
+    left, right = _Side(specification, inputs), _Side(implementation, inputs)
+    restriction = _Restriction(nfa, inputs)
+    start = (left.machine.initial_state, right.machine.initial_state, restriction.initial)
+    if restriction.nfa is not None and not start[2]:
+        return {"equivalent": True, "counterexample": None, "expected": None, "observed": None, "pairs": 0}
+
+    # Union-find sur les éléments (côté, état, ensemble du NFA)
+    parent = {}
+
+    def find(element):
+        root = element
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while element != root:
+            parent[element], element = root, parent[element]
+        return root
+
+    parent[(0, start[0], start[2])] = (1, start[1], start[2])
+    queue = deque([start])
+    pairs = 1
+    equivalent = True
+    while queue and equivalent:
+        state, other, subset = queue.popleft()
+        for input_id in range(len(inputs)):
+            next_subset, allowed = restriction.step(subset, input_id)
+            if not allowed:
+                continue
+            expected, observed = left.step(state, input_id), right.step(other, input_id)
+            if _differs(expected, observed):
+                equivalent = False
+                break
+            if expected is None:
+                continue
+            a, b = find((0, expected[0], next_subset)), find((1, observed[0], next_subset))
+            if a != b:
+                parent[a] = b
+                pairs += 1
+                queue.append((expected[0], observed[0], next_subset))
+    if equivalent:
+        return {"equivalent": True, "counterexample": None, "expected": None, "observed": None, "pairs": pairs}
+
+    # Plus court contre-exemple : parcours en largeur du produit
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        state, other, subset = node
+        for input_id in range(len(inputs)):
+            next_subset, allowed = restriction.step(subset, input_id)
+            if not allowed:
+                continue
+            expected, observed = left.step(state, input_id), right.step(other, input_id)
+            if _differs(expected, observed):
+                word = [input_id]
+                while parents[node] is not None:
+                    node, step = parents[node]
+                    word.append(step)
+                word.reverse()
+                return {
+                    "equivalent": False,
+                    "counterexample": [inputs[step] for step in word],
+                    "expected": _outputs(left, word),
+                    "observed": _outputs(right, word),
+                    "pairs": pairs,
+                }
+            if expected is None:
+                continue
+            next_node = (expected[0], observed[0], next_subset)
+            if next_node not in parents:
+                parents[next_node] = (node, input_id)
+                queue.append(next_node)
+    raise RuntimeError("Différence détectée sans contre-exemple atteignable")
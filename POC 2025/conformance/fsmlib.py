@@ -0,0 +1,108 @@
+from array import array
+
+from .compiled import CompiledMealy, NULL_STATE
+
+# Types de machines de FSMlib (machineTypeNames)
+TYPE_DFSM = 0
+TYPE_MOORE = 1
+TYPE_MEALY = 2
+TYPE_DFA = 3
+
+# Les identifiants non signés de FSMlib (state_t(-1), output_t(-2), ...) sont ramenés en négatif
+_UNSIGNED_LIMIT = 2 ** 31
+_UNSIGNED_RANGE = 2 ** 32
+
+def loads_fsm(text):
+    """
+    Lit une machine de Mealy au format texte .fsm de FSMlib.
+    Le format est : "type isReduced", "nbÉtats nbEntrées nbSorties", "étatMax",
+    puis une ligne "état sortie_0 ... sortie_k" par état et une ligne
+    "état suivant_0 ... suivant_k" par état.
+    :param text: Contenu du fichier .fsm.
+    :return: Instance de CompiledMealy.
+    """
+    values = array("l", map(int, text.split()))
+    if len(values) < 6:
+        raise ValueError("Fichier .fsm incomplet : en-tête manquant")
+    machine_type, is_reduced, num_states, num_inputs, num_outputs, max_state = values[:6]
+    if machine_type != TYPE_MEALY:
+        raise ValueError(f"Type de machine FSMlib non pris en charge : {machine_type} (seul Mealy = {TYPE_MEALY} l'est)")
+    width = num_inputs + 1
+    block_size = num_states * width
+    if len(values) != 6 + 2 * block_size:
+        raise ValueError(
+            f"Fichier .fsm incohérent : {len(values) - 6} valeurs pour {num_states} états et {num_inputs} entrées"
+        )
+    if max(values, default=0) >= _UNSIGNED_LIMIT:
+        values = array("l", [v - _UNSIGNED_RANGE if v >= _UNSIGNED_LIMIT else v for v in values])
+
+    output_block = values[6:6 + block_size]
+    next_block = values[6 + block_size:]
+    output_ids = output_block[::width]
+    next_ids = next_block[::width]
+    if output_ids != next_ids:
+        raise ValueError("Fichier .fsm incohérent : les états des sorties et des transitions diffèrent")
+    del output_block[::width]
+    del next_block[::width]
+
+    if list(next_ids) == list(range(max_state)):
+        # Cas courant : états compacts 0..n-1, les blocs sont directement les tables
+        output_table = output_block
+        next_table = next_block
+        states = list(range(max_state))
+    else:
+        size = max_state * num_inputs
+        output_table = array("l", [NULL_STATE]) * size
+        next_table = array("l", [NULL_STATE]) * size
+        states = [None] * max_state
+        for row, state in enumerate(next_ids):
+            if not 0 <= state < max_state:
+                raise ValueError(f"État {state} hors de l'intervalle [0, {max_state})")
+            start = row * num_inputs
+            target = state * num_inputs
+            output_table[target:target + num_inputs] = output_block[start:start + num_inputs]
+            next_table[target:target + num_inputs] = next_block[start:start + num_inputs]
+            states[state] = state
+
+    machine = CompiledMealy(max_state, num_inputs, num_outputs, next_table, output_table,
+                            initial_state=0, states=states)
+    machine.is_reduced = bool(is_reduced)
+    return machine
+
+def load_fsm(file_path):
+    """
+    Charge un fichier .fsm de FSMlib.
+    :param file_path: Chemin du fichier.
+    :return: Instance de CompiledMealy.
+    """
+    with open(file_path) as f:
+        return loads_fsm(f.read())
+
+def dumps_fsm(machine):
+    """
+    Écrit une machine compilée au format texte .fsm de FSMlib.
+    Les états dont le nom vaut None sont considérés comme supprimés et ne sont pas écrits.
+    :param machine: Instance de CompiledMealy.
+    :return: Contenu du fichier .fsm.
+    """
+    k = machine.num_inputs
+    used = [state for state in range(machine.num_states) if machine.states[state] is not None]
+    lines = [
+        f"{TYPE_MEALY} {int(machine.is_reduced)}",
+        f"{len(used)} {k} {machine.num_outputs}",
+        str(machine.num_states),
+    ]
+    for table in (machine.output, machine.next_state):
+        for state in used:
+            start = state * k
+            lines.append("\t".join(map(str, (state, *table[start:start + k]))))
+    return "\n".join(lines) + "\n"
+
+def save_fsm(machine, file_path):
+    """
+    Enregistre une machine compilée dans un fichier .fsm de FSMlib.
+    :param machine: Instance de CompiledMealy.
+    :param file_path: Chemin du fichier.
+    """
+    with open(file_path, "w") as f:
+        f.write(dumps_fsm(machine))
@@ -0,0 +1,125 @@
+import random
+from array import array
+
+from .compiled import CompiledMealy, CompiledNFA, NULL_STATE, DEFAULT_OUTPUT
+
+def _spanning_tree(rng, num_states, num_inputs):
+    """
+    Relie chaque état à un état précédent par une transition libre tirée au hasard,
+    de sorte que tous les états soient atteignables depuis l'état 0.
+    :return: Liste des couples (indice de transition, état atteint).
+    """
+    tree = []
+    open_slots = list(range(num_inputs))
+    for state in range(1, num_states):
+        if not open_slots:
+            raise ValueError("Impossible de relier tous les états : aucune entrée libre")
+        position = rng.randrange(len(open_slots))
+        open_slots[position], open_slots[-1] = open_slots[-1], open_slots[position]
+        tree.append((open_slots.pop(), state))
+        base = state * num_inputs
+        open_slots.extend(range(base, base + num_inputs))
+    return tree
+
+def state_classes(machine):
+    """
+    Calcule les classes d'états équivalents d'une machine compilée (raffinement de Moore).
+    Une transition absente est distinguée de toute transition définie.
+    :param machine: Instance de CompiledMealy.
+    :return: Tuple (nombre de classes, tableau état -> classe).
+    """
+    n, k = machine.num_states, machine.num_inputs
+    next_columns = [machine.next_state[j::k] for j in range(k)]
+    output_columns = [machine.output[j::k] for j in range(k)]
+    # Les transitions absentes (NULL_STATE = -1) pointent vers la dernière case, qui vaut -1
+    signatures = {}
+    block = [signatures.setdefault(row, len(signatures))
+             for row in zip(*output_columns, *([t == NULL_STATE for t in column] for column in next_columns))]
+    count = len(signatures)
+    while True:
+        block.append(-1)
+        signatures = {}
+        refined = [signatures.setdefault(row, len(signatures))
+                   for row in zip(block, *([block[t] for t in column] for column in next_columns))]
+        block = refined
+        if len(signatures) == count:
+            return count, array("l", block)
+        count = len(signatures)
+
+def random_mealy(num_states, num_inputs, num_outputs, seed=None, complete=True, density=1.0,
+                 connected=True, minimal=False, max_attempts=20):
+    """
+    Génère une machine de Mealy aléatoire, déterministe pour une graine donnée
+    (équivalent de generate de FSMlib).
+    :param num_states: Nombre d'états.
+    :param num_inputs: Nombre d'entrées.
+    :param num_outputs: Nombre de sorties.
+    :param seed: Graine du générateur pseudo-aléatoire.
+    :param complete: Définir toutes les transitions.
+    :param density: Probabilité qu'une transition soit définie (machine partielle).
+    :param connected: Garantir que tous les états sont atteignables depuis l'état initial.
+    :param minimal: Garantir que la machine est minimale (nouveaux tirages si nécessaire).
+    :param max_attempts: Nombre maximal de tirages pour obtenir une machine minimale.
+    :return: Instance de CompiledMealy.
+    """
+    if num_states < 1 or num_inputs < 1 or num_outputs < 1:
+        raise ValueError("Le nombre d'états, d'entrées et de sorties doit être strictement positif")
+    rng = random.Random(seed)
+    size = num_states * num_inputs
+    for _ in range(max_attempts):
+        tree = _spanning_tree(rng, num_states, num_inputs) if connected else []
+        targets = rng.choices(range(num_states), k=size)
+        output_table = array("l", rng.choices(range(num_outputs), k=size))
+        if complete:
+            next_table = array("l", targets)
+        else:
+            next_table = array("l", [t if rng.random() < density else NULL_STATE for t in targets])
+        for index, state in tree:
+            next_table[index] = state
+        if not complete:
+            for index in range(size):
+                if next_table[index] == NULL_STATE:
+                    output_table[index] = DEFAULT_OUTPUT
+        machine = CompiledMealy(num_states, num_inputs, num_outputs, next_table, output_table)
+        if not minimal:
+            return machine
+        if state_classes(machine)[0] == num_states:
+            machine.is_reduced = True
+            return machine
+    raise ValueError(f"Aucune machine minimale obtenue en {max_attempts} tirages")
+
+def random_nfa(num_states, num_inputs, seed=None, density=0.5, branching=2, accepting_ratio=0.1,
+               connected=True):
+    """
+    Génère un NFA de restriction aléatoire, déterministe pour une graine donnée.
+    :param num_states: Nombre d'états.
+    :param num_inputs: Nombre d'entrées.
+    :param seed: Graine du générateur pseudo-aléatoire.
+    :param density: Probabilité qu'un couple (état, entrée) ait au moins un successeur.
+    :param branching: Nombre maximal de successeurs d'un couple (état, entrée).
+    :param accepting_ratio: Proportion d'états acceptants (au moins un).
+    :param connected: Garantir que tous les états sont atteignables depuis l'état initial.
+    :return: Instance de CompiledNFA.
+    """
+    if num_states < 1 or num_inputs < 1:
+        raise ValueError("Le nombre d'états et d'entrées doit être strictement positif")
+    rng = random.Random(seed)
+    size = num_states * num_inputs
+    tree = array("l", [NULL_STATE]) * size
+    if connected:
+        for index, state in _spanning_tree(rng, num_states, num_inputs):
+            tree[index] = state
+    offsets = array("l", [0]) * (size + 1)
+    targets = array("l")
+    for index in range(size):
+        row = set()
+        if tree[index] != NULL_STATE:
+            row.add(tree[index])
+        if rng.random() < density:
+            row.update(rng.choices(range(num_states), k=rng.randint(1, branching)))
+        targets.extend(sorted(row))
+        offsets[index + 1] = len(targets)
+    accepting = bytearray(num_states)
+    for state in rng.sample(range(num_states), max(1, round(num_states * accepting_ratio))):
+        accepting[state] = 1
+    return CompiledNFA(num_states, num_inputs, offsets, targets, 0, accepting)
@@ -0,0 +1,162 @@
+from .core import MealyMachine, execute_tests
+
+# Différence entre deux versions d'une machine de Mealy
+class MachineDiff:
+    def __init__(self, added=None, removed=None, modified=None):
+        """
+        Initialise une différence de transitions.
+        :param added: Transitions ajoutées {(état, entrée): (état_suivant, sortie)}.
+        :param removed: Transitions supprimées (itérable de couples (état, entrée)).
+        :param modified: Transitions modifiées {(état, entrée): (état_suivant, sortie)}.
+        """
+        self.added = dict(added or {})
+        self.removed = set(removed or ())
+        self.modified = dict(modified or {})
+
+    @classmethod
+    def from_machines(cls, old_machine, new_machine):
+        """
+        Calcule la différence entre deux machines de Mealy.
+        :param old_machine: Ancienne version (MealyMachine).
+        :param new_machine: Nouvelle version (MealyMachine).
+        :return: Instance de MachineDiff.
+        """
+        old, new = old_machine.transitions, new_machine.transitions
+        added = {key: value for key, value in new.items() if key not in old}
+        removed = [key for key in old if key not in new]
+        modified = {key: value for key, value in new.items() if key in old and old[key] != value}
+        return cls(added, removed, modified)
+
+    def changed_transitions(self):
+        """Retourne l'ensemble des couples (état, entrée) touchés par la différence."""
+        return set(self.added) | self.removed | set(self.modified)
+
+    def apply(self, mealy_machine):
+        """
+        Applique la différence à une machine de Mealy.
+        :param mealy_machine: Instance de MealyMachine (non modifiée).
+        :return: Nouvelle instance de MealyMachine.
+        """
+        transitions = dict(mealy_machine.transitions)
+        for key in self.removed:
+            transitions.pop(key, None)
+        transitions.update(self.added)
+        transitions.update(self.modified)
+        return MealyMachine(transitions, mealy_machine.initial_state)
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.modified)
+
+# Suite de tests maintenue incrémentalement
+class IncrementalSuite:
+    def __init__(self, mealy_machine, tests, results=None):
+        """
+        Initialise une suite de tests avec son index transitions -> tests.
+        :param mealy_machine: Instance de MealyMachine.
+        :param tests: Liste des séquences de test.
+        :param results: Résultats déjà calculés par execute_tests (sinon, la suite est exécutée).
+        """
+        self.machine = mealy_machine
+        self.tests = {}
+        self.results = {}
+        self.index = {}
+        self.next_id = 0
+        if results is None:
+            results = execute_tests(mealy_machine, tests)
+        for test, result in zip(tests, results):
+            self._add(test, result)
+
+    def _touched(self, sequence):
+        """
+        Retourne les transitions (état, entrée) parcourues par une séquence, y compris
+        la première transition manquante (qui devient pertinente si elle est ajoutée).
+        """
+        transitions = self.machine.transitions
+        state = self.machine.initial_state
+        touched = []
+        for input_symbol in sequence:
+            key = (state, input_symbol)
+            touched.append(key)
+            if key not in transitions:
+                break
+            state = transitions[key][0]
+        return touched
+
+    def _add(self, test, result):
+        test_id = self.next_id
+        self.next_id += 1
+        self.tests[test_id] = test
+        self.results[test_id] = result
+        for key in self._touched(test):
+            self.index.setdefault(key, set()).add(test_id)
+        return test_id
+
+    def _unindex(self, test_id):
+        for key in self._touched(self.tests[test_id]):
+            ids = self.index.get(key)
+            if ids is not None:
+                ids.discard(test_id)
+                if not ids:
+                    del self.index[key]
+
+    def affected_tests(self, diff):
+        """
+        Retourne les identifiants des tests dont l'exécution passe par une transition modifiée.
+        :param diff: Instance de MachineDiff.
+        :return: Liste triée des identifiants.
+        """
+        affected = set()
+        for key in diff.changed_transitions():
+            affected.update(self.index.get(key, ()))
+        return sorted(affected)
+
+    def update(self, diff, generator=None):
+        """
+        Applique une évolution de la machine en ne réexécutant que les tests concernés.
+        :param diff: Instance de MachineDiff.
+        :param generator: Fonction machine -> séquences (par exemple simple_method) ; si elle est
+                          fournie, la suite est régénérée : les nouveaux tests sont exécutés et
+                          les tests disparus sont retirés, les autres résultats sont conservés.
+        :return: Dictionnaire résumant la mise à jour (tests réexécutés, ajoutés, retirés, conservés).
+        """
+        affected = self.affected_tests(diff)
+        # L'index est calculé sur l'ancienne machine : on retire les tests touchés avant de changer de machine
+        for test_id in affected:
+            self._unindex(test_id)
+        self.machine = diff.apply(self.machine)
+        sequences = [self.tests[test_id] for test_id in affected]
+        for test_id, result in zip(affected, execute_tests(self.machine, sequences)):
+            self.results[test_id] = result
+            for key in self._touched(self.tests[test_id]):
+                self.index.setdefault(key, set()).add(test_id)
+
+        added = removed = 0
+        if generator is not None:
+            wanted = {}
+            for test in generator(self.machine):
+                wanted.setdefault(tuple(test), test)
+            existing = {tuple(test): test_id for test_id, test in self.tests.items()}
+            for key, test_id in existing.items():
+                if key not in wanted:
+                    self._unindex(test_id)
+                    del self.tests[test_id]
+                    del self.results[test_id]
+                    removed += 1
+            new_tests = [test for key, test in wanted.items() if key not in existing]
+            for test, result in zip(new_tests, execute_tests(self.machine, new_tests)):
+                self._add(test, result)
+            added = len(new_tests)
+        return {
+            "reexecuted": len(affected),
+            "added": added,
+            "removed": removed,
+            "kept": len(self.tests) - added - sum(1 for test_id in affected if test_id in self.tests),
+        }
+
+    def suite(self):
+        """Retourne les séquences de la suite dans l'ordre d'ajout."""
+        return [self.tests[test_id] for test_id in sorted(self.tests)]
+
+    def all_results(self):
+        """Retourne les résultats au format d'execute_tests, dans l'ordre d'ajout."""
+        return [self.results[test_id] for test_id in sorted(self.results)]
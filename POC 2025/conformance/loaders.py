@@ -0,0 +1,234 @@
+import json
+
+from .compiled import CompiledMealy, CompiledNFA
+from .core import MealyMachine, NFA
+from .fsmlib import load_fsm
+
+def load_mealy_xml(file_path):
+    """
+    Charge une machine de Mealy depuis un fichier XML.
+    Formats reconnus : <Automaton>/<MealyMachine> avec des éléments
+    <Transition source destination label="entrée/sortie">, et <mealyMachine>
+    avec des éléments <state id><transition to input output/></state>.
+    L'état initial est celui marqué initial="true", sinon le premier état.
+    :param file_path: Chemin du fichier.
+    :return: Instance de MealyMachine.
+    """
+    import xml.etree.ElementTree as ET
+    root = ET.parse(file_path).getroot()
+    transitions = {}
+    states = [state for state in root.iter() if state.tag in ("State", "state")]
+    if not states:
+        raise ValueError(f"Aucun état dans {file_path}")
+    initial_state = states[0].get("id")
+    for state in states:
+        if state.get("initial", "false") == "true":
+            initial_state = state.get("id")
+            break
+    for transition in root.iter("Transition"):
+        input_symbol, output = transition.get("label").split("/")
+        transitions[(transition.get("source"), input_symbol)] = (transition.get("destination"), output)
+    for state in root.iter("state"):
+        for transition in state.iter("transition"):
+            for input_symbol in transition.get("input").split(","):
+                transitions[(state.get("id"), input_symbol.strip())] = (transition.get("to"), transition.get("output"))
+    return MealyMachine(transitions, initial_state)
+
+def load_nfa_xml(file_path):
+    """
+    Charge un NFA depuis un fichier XML (<NFA><States/><Transitions/></NFA>).
+    Un symbole "0,1" désigne une transition par symbole.
+    :param file_path: Chemin du fichier.
+    :return: Instance de NFA.
+    """
+    import xml.etree.ElementTree as ET
+    root = ET.parse(file_path).getroot()
+    states = []
+    start_states = []
+    accepting_states = []
+    for state in root.find("States").findall("State"):
+        state_id = state.get("id")
+        states.append(state_id)
+        if state.get("isStart", "false") == "true":
+            start_states.append(state_id)
+        if state.get("isAccept", "false") == "true":
+            accepting_states.append(state_id)
+    alphabet = []
+    transitions = {}
+    for transition in root.find("Transitions").findall("Transition"):
+        for symbol in transition.get("symbol").split(","):
+            if symbol not in alphabet:
+                alphabet.append(symbol)
+            transitions.setdefault((transition.get("src"), symbol), []).append(transition.get("dest"))
+    initial_state = start_states[0] if start_states else states[0]
+    return NFA(states, alphabet, transitions, initial_state, accepting_states)
+
+def load_mealy_json(file_path):
+    """
+    Charge une machine de Mealy depuis la structure JSON produite par generate_mealy_structure.
+    :param file_path: Chemin du fichier.
+    :return: Instance de MealyMachine.
+    """
+    with open(file_path) as f:
+        structure = json.load(f)
+    transitions = {}
+    for state, row in structure["transition-function"].items():
+        outputs = structure["output-function"][state]
+        for input_symbol, next_state in row.items():
+            transitions[(state, input_symbol)] = (next_state, outputs[input_symbol])
+    return MealyMachine(transitions, structure["states"][0])
+
+def load_nfa_json(file_path):
+    """
+    Charge un NFA depuis la structure JSON produite par generate_nfa_structure.
+    :param file_path: Chemin du fichier.
+    :return: Instance de NFA.
+    """
+    with open(file_path) as f:
+        structure = json.load(f)
+    transitions = {}
+    for state, row in structure["transition-function"].items():
+        for symbol, next_states in row.items():
+            if next_states:
+                transitions[(state, symbol)] = list(next_states)
+    start_states = structure["start-states"] or structure["states"][:1]
+    return NFA(structure["states"], structure["alphabet"], transitions,
+               start_states[0], structure["accept-states"])
+
+def load_mealy(file_path):
+    """
+    Charge une machine de Mealy selon l'extension du fichier (.xml, .json ou .fsm).
+    :param file_path: Chemin du fichier.
+    :return: Instance de MealyMachine.
+    """
+    path = str(file_path)
+    if path.endswith(".fsm"):
+        return load_fsm(path).to_mealy()
+    if path.endswith(".json"):
+        return load_mealy_json(path)
+    return load_mealy_xml(path)
+
+def load_nfa(file_path):
+    """
+    Charge un NFA selon l'extension du fichier (.xml ou .json).
+    :param file_path: Chemin du fichier.
+    :return: Instance de NFA.
+    """
+    path = str(file_path)
+    if path.endswith(".json"):
+        return load_nfa_json(path)
+    return load_nfa_xml(path)
+
+def _mealy_parts(machine):
+    """Retourne (états, état initial, transitions (état, entrée, suivant, sortie)) d'une machine."""
+    if isinstance(machine, CompiledMealy):
+        initial_state = machine.states[machine.initial_state]
+        states = [initial_state] + [state for state in machine.states
+                                    if state is not None and state != initial_state]
+        return states, initial_state, machine.iter_transitions()
+    states = [machine.initial_state]
+    seen = {machine.initial_state}
+    for (state, _), (next_state, _) in machine.transitions.items():
+        for s in (state, next_state):
+            if s not in seen:
+                seen.add(s)
+                states.append(s)
+    transitions = ((state, input_symbol, next_state, output)
+                   for (state, input_symbol), (next_state, output) in machine.transitions.items())
+    return states, machine.initial_state, transitions
+
+def _nfa_parts(nfa):
+    """Retourne (états, état initial, états acceptants, alphabet, transitions (état, entrée, suivants)) d'un NFA."""
+    if isinstance(nfa, CompiledNFA):
+        accepting_states = [nfa.states[q] for q in range(nfa.num_states) if nfa.accepting[q]]
+        return (nfa.states, nfa.states[nfa.initial_state], accepting_states, nfa.inputs,
+                nfa.iter_transitions())
+    transitions = ((state, symbol, next_states) for (state, symbol), next_states in nfa.transitions.items())
+    return nfa.states, nfa.initial_state, list(nfa.accepting_states), nfa.alphabet, transitions
+
+def save_mealy_xml(machine, file_path):
+    """
+    Enregistre une machine de Mealy au format XML <Automaton> (lisible par load_mealy_xml).
+    :param machine: Instance de MealyMachine ou de CompiledMealy.
+    :param file_path: Chemin du fichier.
+    """
+    from xml.sax.saxutils import quoteattr
+    states, initial_state, transitions = _mealy_parts(machine)
+    with open(file_path, "w") as f:
+        f.write("<Automaton>\n")
+        for state in states:
+            initial = ' initial="true"' if state == initial_state else ""
+            f.write(f"  <State id={quoteattr(str(state))} name={quoteattr(str(state))}{initial} />\n")
+        for state, input_symbol, next_state, output in transitions:
+            f.write(f"  <Transition source={quoteattr(str(state))} destination={quoteattr(str(next_state))} "
+                    f"label={quoteattr(f'{input_symbol}/{output}')} />\n")
+        f.write("</Automaton>\n")
+
+def save_mealy_json(machine, file_path):
+    """
+    Enregistre une machine de Mealy dans la structure JSON de generate_mealy_structure.
+    :param machine: Instance de MealyMachine ou de CompiledMealy.
+    :param file_path: Chemin du fichier.
+    """
+    states, _, transitions = _mealy_parts(machine)
+    transition_function = {str(state): {} for state in states}
+    output_function = {str(state): {} for state in states}
+    inputs = {}
+    outputs = {}
+    for state, input_symbol, next_state, output in transitions:
+        transition_function[str(state)][str(input_symbol)] = str(next_state)
+        output_function[str(state)][str(input_symbol)] = str(output)
+        inputs[str(input_symbol)] = None
+        outputs[str(output)] = None
+    structure = {
+        "states": [str(state) for state in states],
+        "input-alphabet": list(inputs),
+        "output-alphabet": list(outputs),
+        "transition-function": transition_function,
+        "output-function": output_function,
+    }
+    with open(file_path, "w") as f:
+        json.dump(structure, f, indent=2)
+
+def save_nfa_xml(nfa, file_path):
+    """
+    Enregistre un NFA au format XML <NFA> (lisible par load_nfa_xml).
+    :param nfa: Instance de NFA ou de CompiledNFA.
+    :param file_path: Chemin du fichier.
+    """
+    from xml.sax.saxutils import quoteattr
+    states, initial_state, accepting_states, _, transitions = _nfa_parts(nfa)
+    accepting_states = set(accepting_states)
+    with open(file_path, "w") as f:
+        f.write('<?xml version="1.0" ?>\n<NFA>\n  <States>\n')
+        for state in states:
+            is_start = "true" if state == initial_state else "false"
+            is_accept = "true" if state in accepting_states else "false"
+            f.write(f'    <State id={quoteattr(str(state))} isStart="{is_start}" isAccept="{is_accept}"/>\n')
+        f.write("  </States>\n  <Transitions>\n")
+        for state, symbol, next_states in transitions:
+            for next_state in next_states:
+                f.write(f"    <Transition src={quoteattr(str(state))} dest={quoteattr(str(next_state))} "
+                        f"symbol={quoteattr(str(symbol))}/>\n")
+        f.write("  </Transitions>\n</NFA>\n")
+
+def save_nfa_json(nfa, file_path):
+    """
+    Enregistre un NFA dans la structure JSON de generate_nfa_structure.
+    :param nfa: Instance de NFA ou de CompiledNFA.
+    :param file_path: Chemin du fichier.
+    """
+    states, initial_state, accepting_states, alphabet, transitions = _nfa_parts(nfa)
+    alphabet = [str(symbol) for symbol in alphabet]
+    transition_function = {str(state): {symbol: [] for symbol in alphabet} for state in states}
+    for state, symbol, next_states in transitions:
+        transition_function[str(state)][str(symbol)] = [str(next_state) for next_state in next_states]
+    structure = {
+        "states": [str(state) for state in states],
+        "start-states": [str(initial_state)],
+        "accept-states": [str(state) for state in accepting_states],
+        "alphabet": alphabet,
+        "transition-function": transition_function,
+    }
+    with open(file_path, "w") as f:
+        json.dump(structure, f, indent=4)
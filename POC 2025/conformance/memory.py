@@ -0,0 +1,182 @@
+import _thread
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+class MemoryBudgetExceeded(MemoryError):
+    """Levée lorsqu'une méthode dépasse son budget mémoire."""
+
+def current_rss():
+    """
+    Retourne la mémoire résidente (RSS) du processus en octets.
+    Utilise /proc/self/statm sous Linux, sinon le maximum de getrusage.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == "darwin" else rss * 1024
+
+class MemoryMonitor:
+    def __init__(self, budget=None, interval=0.01, enabled=True, trace=True):
+        """
+        Initialise un moniteur mémoire : allocations Python (tracemalloc) par étape
+        et échantillonnage du RSS dans un fil d'exécution séparé.
+        :param budget: Budget en octets au-delà duquel la méthode est interrompue
+                       (mesuré sur les allocations suivies et sur la croissance du RSS).
+        :param interval: Période d'échantillonnage du RSS (secondes).
+        :param enabled: Si False, le moniteur ne mesure rien.
+        :param trace: Si False, seul le RSS est surveillé (pas de tracemalloc, qui ralentit
+                      fortement l'exécution) ; les étapes ne sont alors pas mesurées.
+        """
+        self.budget = budget
+        self.interval = interval
+        self.enabled = enabled
+        self.trace = trace
+        self.stages = {}
+        self.baseline_rss = 0
+        self.peak_rss = 0
+        self.peak_traced = 0
+        self.retained = 0
+        self.exceeded = None
+        self._baseline_traced = 0
+        self._started_tracing = False
+        self._stop = threading.Event()
+        self._sampler = None
+        # Le fil d'échantillonnage n'interrompt le fil principal que tant que le bloc s'exécute
+        self._lock = threading.Lock()
+        self._running = False
+        self._delivered = False
+        self._previous_handler = None
+        self._interrupts = False
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        if self.trace:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            self._baseline_traced = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.baseline_rss = self.peak_rss = current_rss()
+        self._stop.clear()
+        self.exceeded = None
+        self._delivered = False
+        # L'interruption n'est possible que dans le fil principal, qui reçoit SIGINT
+        self._interrupts = threading.current_thread() is threading.main_thread()
+        if self._interrupts:
+            self._previous_handler = signal.signal(signal.SIGINT, self._interrupt)
+        self._running = True
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if not self.enabled:
+            return False
+        with self._lock:
+            self._running = False
+        self._stop.set()
+        self._sampler.join()
+        if self._interrupts:
+            # Une interruption demandée avant la fin du bloc est traitée avant de restaurer le gestionnaire
+            for _ in range(100):
+                if self.exceeded is None or self._delivered:
+                    break
+                time.sleep(0.001)
+            signal.signal(signal.SIGINT, self._previous_handler)
+        if self.trace:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            self.peak_traced = max(self.peak_traced, peak - self._baseline_traced)
+            self.retained = current - self._baseline_traced
+            if self._started_tracing:
+                tracemalloc.stop()
+        if exc_type is None and self.exceeded is not None:
+            raise MemoryBudgetExceeded(self.exceeded)
+        return False
+
+    def _interrupt(self, signum, frame):
+        """
+        Gestionnaire de SIGINT pendant le bloc surveillé : lève MemoryBudgetExceeded si
+        le budget est dépassé. Reçue pendant __exit__, l'interruption est différée à la
+        fin du nettoyage ; un SIGINT de l'utilisateur est transmis au gestionnaire précédent.
+        """
+        if self.exceeded is None or self._delivered:
+            if callable(self._previous_handler):
+                return self._previous_handler(signum, frame)
+            if self._previous_handler != signal.SIG_IGN:
+                raise KeyboardInterrupt
+            return None
+        self._delivered = True
+        while frame is not None:
+            if frame.f_code is MemoryMonitor.__exit__.__code__:
+                return None
+            frame = frame.f_back
+        raise MemoryBudgetExceeded(self.exceeded)
+
+    def _sample(self):
+        """Échantillonne le RSS et interrompt le fil principal si le budget est dépassé."""
+        if self.trace:
+            import tracemalloc
+        while not self._stop.wait(self.interval):
+            rss = current_rss()
+            if rss > self.peak_rss:
+                self.peak_rss = rss
+            if self.budget is None or self.exceeded is not None:
+                continue
+            traced = tracemalloc.get_traced_memory()[0] - self._baseline_traced if self.trace else 0
+            if traced > self.budget or rss - self.baseline_rss > self.budget:
+                with self._lock:
+                    if self._running:
+                        self.exceeded = (f"Budget mémoire dépassé : {max(traced, rss - self.baseline_rss)} "
+                                         f"octets pour un budget de {self.budget} octets")
+                        if self._interrupts:
+                            _thread.interrupt_main()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Attribue à une étape la mémoire allouée pendant son exécution.
+        Pour chaque étape : pic transitoire et mémoire conservée à la fin (octets).
+        :param name: Nom de l'étape (génération, exécution, ...).
+        """
+        if not self.enabled or not self.trace:
+            yield
+            return
+        import tracemalloc
+        before = tracemalloc.get_traced_memory()[0]
+        self.peak_traced = max(self.peak_traced, tracemalloc.get_traced_memory()[1] - self._baseline_traced)
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.peak_traced = max(self.peak_traced, peak - self._baseline_traced)
+            self.stages[name] = {"peak": peak - before, "retained": current - before}
+
+    def report(self, tests=None):
+        """
+        Retourne le rapport mémoire.
+        :param tests: Séquences de test, pour les ratios par test et par pas.
+        :return: Dictionnaire (octets).
+        """
+        report = {
+            "peak_traced": self.peak_traced,
+            "retained": self.retained,
+            "peak_rss": self.peak_rss,
+            "rss_growth": self.peak_rss - self.baseline_rss,
+            "stages": dict(self.stages),
+        }
+        if tests is not None:
+            steps = sum(len(test) for test in tests)
+            report["bytes_per_test"] = self.retained / len(tests) if tests else None
+            report["bytes_per_step"] = self.retained / steps if steps else None
+        return report
@@ -0,0 +1,115 @@
+import time
+from contextlib import contextmanager
+
+# Compteurs connus, avec leur description (exportée dans le format Prometheus)
+COUNTERS = {
+    "transitions_simulated": "Transitions de machine de Mealy simulées",
+    "nfa_subset_steps": "Pas d'ensembles d'états du NFA calculés",
+    "sequences_generated": "Séquences candidates générées",
+    "sequences_pruned": "Séquences rejetées par la restriction",
+    "sequences_deduplicated": "Séquences en double éliminées",
+    "resets": "Réinitialisations de la machine",
+}
+
+class Metrics:
+    def __init__(self):
+        """
+        Initialise un registre de compteurs et de durées par étape.
+        Le registre est désactivé par défaut : les points d'instrumentation
+        testent `enabled` avant tout calcul, pour un coût quasi nul.
+        """
+        self.enabled = False
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.stage_seconds = {}
+        self.stage_calls = {}
+
+    def enable(self):
+        """Active la collecte."""
+        self.enabled = True
+
+    def disable(self):
+        """Désactive la collecte (les valeurs déjà collectées sont conservées)."""
+        self.enabled = False
+
+    def reset(self):
+        """Remet tous les compteurs et durées à zéro."""
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.stage_seconds = {}
+        self.stage_calls = {}
+
+    def add(self, name, value=1):
+        """Incrémente un compteur (à appeler sous `if METRICS.enabled:`)."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Mesure la durée d'une étape du pipeline (génération, exécution, ...).
+        :param name: Nom de l'étape.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + time.perf_counter() - start
+            self.stage_calls[name] = self.stage_calls.get(name, 0) + 1
+
+    def report(self):
+        """
+        Retourne un rapport des compteurs et durées.
+        :return: Dictionnaire sérialisable en JSON.
+        """
+        return {
+            "counters": dict(self.counters),
+            "stages": {
+                name: {"seconds": seconds, "calls": self.stage_calls[name]}
+                for name, seconds in self.stage_seconds.items()
+            },
+        }
+
+    def to_json(self, file_path):
+        """
+        Enregistre le rapport au format JSON.
+        :param file_path: Chemin du fichier.
+        """
+        import json
+        with open(file_path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def to_prometheus(self, prefix="conformance"):
+        """
+        Formate les métriques au format texte d'exposition Prometheus.
+        :param prefix: Préfixe des noms de métriques.
+        :return: Texte au format Prometheus.
+        """
+        lines = []
+        for name, value in self.counters.items():
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# HELP {metric} {COUNTERS.get(name, name)}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        if self.stage_seconds:
+            for suffix, values, kind in (("stage_seconds_total", self.stage_seconds, "durée cumulée"),
+                                         ("stage_calls_total", self.stage_calls, "nombre d'appels")):
+                metric = f"{prefix}_{suffix}"
+                lines.append(f"# HELP {metric} Étapes du pipeline : {kind}")
+                lines.append(f"# TYPE {metric} counter")
+                for stage, value in values.items():
+                    lines.append(f'{metric}{{stage="{stage}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, file_path, prefix="conformance"):
+        """
+        Enregistre les métriques dans un fichier au format texte Prometheus
+        (utilisable par le textfile collector de node_exporter).
+        :param file_path: Chemin du fichier.
+        :param prefix: Préfixe des noms de métriques.
+        """
+        with open(file_path, "w") as f:
+            f.write(self.to_prometheus(prefix))
+
+# Registre global utilisé par le moteur
+METRICS = Metrics()
@@ -0,0 +1,63 @@
+import heapq
+
+from .mutation import MutantSet
+
+def greedy_cover(kill_sets, costs=None):
+    """
+    Couverture d'ensembles gloutonne paresseuse : choisit à chaque étape le test qui tue
+    le plus de mutants encore non couverts. Les gains ne pouvant que diminuer, un gain
+    recalculé égal à sa valeur dans le tas est nécessairement maximal.
+    :param kill_sets: Liste des bits compactés (entiers) des mutants tués par chaque test.
+    :param costs: Coût de chaque test (par exemple sa longueur), utilisé pour départager les égalités.
+    :return: Tuple (indices des tests retenus dans l'ordre de sélection, bits couverts).
+    """
+    target = 0
+    for bits in kill_sets:
+        target |= bits
+    costs = costs if costs is not None else [0] * len(kill_sets)
+    heap = [(-bits.bit_count(), costs[index], index) for index, bits in enumerate(kill_sets) if bits]
+    heapq.heapify(heap)
+    uncovered = target
+    selected = []
+    while uncovered and heap:
+        negative_gain, cost, index = heapq.heappop(heap)
+        gain = (kill_sets[index] & uncovered).bit_count()
+        if gain == 0:
+            continue
+        if gain == -negative_gain:
+            selected.append(index)
+            uncovered &= ~kill_sets[index]
+        else:
+            heapq.heappush(heap, (-gain, cost, index))
+    return selected, target & ~uncovered
+
+def minimize_suite(mealy_machine, tests, nfa=None, mutants=None, kill_sets=None):
+    """
+    Réduit une suite de tests en conservant exactement les mêmes mutants tués.
+    :param mealy_machine: Spécification (MealyMachine ou CompiledMealy).
+    :param tests: Liste des séquences.
+    :param nfa: Restriction facultative limitant les mutants.
+    :param mutants: Instance de MutantSet déjà construite (facultatif).
+    :param kill_sets: Bits des mutants tués par chaque test, si déjà calculés.
+    :return: Dictionnaire {"tests", "indices", "original_tests", "mutants", "killed", "coverage_preserved"}.
+    """
+    if kill_sets is None:
+        mutants = mutants if mutants is not None else MutantSet(mealy_machine, nfa)
+        kill_sets = mutants.kill_sets(tests)
+    selected, covered = greedy_cover(kill_sets, [len(test) for test in tests])
+    selected.sort()
+    original = 0
+    for bits in kill_sets:
+        original |= bits
+    reduced = 0
+    for index in selected:
+        reduced |= kill_sets[index]
+    return {
+        "tests": [tests[index] for index in selected],
+        "indices": selected,
+        "original_tests": len(tests),
+        "mutants": len(mutants) if mutants is not None else None,
+        "killed": covered.bit_count(),
+        # Garantie : l'union des mutants tués par la suite réduite est celle de la suite complète
+        "coverage_preserved": reduced == original,
+    }
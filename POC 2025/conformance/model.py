@@ -0,0 +1,557 @@
+import sys
+from array import array
+from collections.abc import Mapping
+
+from .compiled import CompiledMealy, CompiledNFA, NULL_STATE, DEFAULT_OUTPUT
+
+def _typecode(maximum):
+    """Plus petit type signé d'array pouvant contenir les valeurs de -1 à `maximum`."""
+    for typecode in ("b", "h", "i", "q"):
+        if maximum < 1 << (8 * array(typecode).itemsize - 1):
+            return typecode
+    raise ValueError(f"Valeur trop grande pour une table d'entiers : {maximum}")
+
+class _Identity:
+    """Identifiants des noms 0..n-1 égaux aux noms (aucun dictionnaire stocké)."""
+    __slots__ = ("size",)
+
+    def __init__(self, size):
+        self.size = size
+
+    def get(self, name, default=None):
+        if type(name) is int and 0 <= name < self.size:
+            return name
+        return default
+
+    def __getitem__(self, name):
+        identifier = self.get(name)
+        if identifier is None:
+            raise KeyError(name)
+        return identifier
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+def _names(names):
+    """Noms internés ; les noms 0..n-1 sont représentés par un range."""
+    names = tuple(names)
+    if all(type(name) is int for name in names) and names == tuple(range(len(names))):
+        return range(len(names)), _Identity(len(names))
+    names = tuple(_intern(name) for name in names)
+    return names, {name: index for index, name in enumerate(names)}
+
+def _intern(name):
+    return sys.intern(name) if isinstance(name, str) else name
+
+class _Symbols:
+    """Table de symboles : noms internés et identifiants entiers denses."""
+    __slots__ = ("names", "ids")
+
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        identifier = self.ids.get(name)
+        if identifier is None:
+            identifier = self.ids[name] = len(self.names)
+            self.names.append(_intern(name))
+        return identifier
+
+# Objets légers créés à la demande par les vues
+class State:
+    __slots__ = ("id", "name")
+
+    def __init__(self, id, name):
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "name", name)
+
+    def __setattr__(self, attribute, value):
+        raise AttributeError("State est immuable")
+
+    def __eq__(self, other):
+        return isinstance(other, State) and (self.id, self.name) == (other.id, other.name)
+
+    def __hash__(self):
+        return hash((self.id, self.name))
+
+    def __repr__(self):
+        return f"State({self.id}, {self.name!r})"
+
+class Transition:
+    __slots__ = ("source", "input", "target", "output")
+
+    def __init__(self, source, input, target, output):
+        object.__setattr__(self, "source", source)
+        object.__setattr__(self, "input", input)
+        object.__setattr__(self, "target", target)
+        object.__setattr__(self, "output", output)
+
+    def __setattr__(self, attribute, value):
+        raise AttributeError("Transition est immuable")
+
+    def __iter__(self):
+        return iter((self.source, self.input, self.target, self.output))
+
+    def __eq__(self, other):
+        return isinstance(other, Transition) and tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"Transition({self.source!r}, {self.input!r}, {self.target!r}, {self.output!r})"
+
+# Vues en lecture seule reproduisant les dictionnaires des anciennes structures
+class _MealyTransitions(Mapping):
+    """Vue {(état, entrée): (état_suivant, sortie)} d'une machine Mealy."""
+    __slots__ = ("machine",)
+
+    def __init__(self, machine):
+        self.machine = machine
+
+    def __getitem__(self, key):
+        machine = self.machine
+        index = machine._index(*key)
+        if index is None or machine.next_state[index] == NULL_STATE:
+            raise KeyError(key)
+        output = machine.output[index]
+        return (machine.states[machine.next_state[index]],
+                machine.outputs[output] if output != DEFAULT_OUTPUT else None)
+
+    def __iter__(self):
+        machine = self.machine
+        k = len(machine.inputs)
+        states, inputs = machine.states, machine.inputs
+        for index, next_state in enumerate(machine.next_state):
+            if next_state != NULL_STATE:
+                yield states[index // k], inputs[index % k]
+
+    def __len__(self):
+        return self.machine.size
+
+class _MealyRow(Mapping):
+    """Vue {entrée: valeur} d'une ligne de la fonction de transition ou de sortie."""
+    __slots__ = ("machine", "state", "table", "names")
+
+    def __init__(self, machine, state, table, names):
+        self.machine, self.state, self.table, self.names = machine, state, table, names
+
+    def __getitem__(self, input_symbol):
+        machine = self.machine
+        input_id = machine.input_ids.get(input_symbol)
+        if input_id is None:
+            raise KeyError(input_symbol)
+        index = self.state * len(machine.inputs) + input_id
+        if machine.next_state[index] == NULL_STATE:
+            raise KeyError(input_symbol)
+        return self.names[self.table[index]]
+
+    def __iter__(self):
+        machine = self.machine
+        k = len(machine.inputs)
+        base = self.state * k
+        for input_id in range(k):
+            if machine.next_state[base + input_id] != NULL_STATE:
+                yield machine.inputs[input_id]
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+class _Rows(Mapping):
+    """Vue {état: ligne} construisant les lignes à la demande."""
+    __slots__ = ("ids", "names", "row")
+
+    def __init__(self, ids, names, row):
+        self.ids, self.names, self.row = ids, names, row
+
+    def __getitem__(self, state):
+        return self.row(self.ids[state])
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+def _readonly(typecode, values):
+    """Table d'entiers en lecture seule (memoryview sur un array)."""
+    return memoryview(array(typecode, values)).toreadonly()
+
+# Machine de Mealy compacte et immuable
+class Mealy:
+    __slots__ = ("states", "inputs", "outputs", "state_ids", "input_ids", "output_ids",
+                 "next_state", "output", "initial", "size")
+
+    def __init__(self, states, inputs, outputs, next_state, output, initial=0):
+        """
+        Initialise une machine de Mealy à partir de tables d'identifiants.
+        La transition (s, i) est stockée à l'indice s * len(inputs) + i ; les tables
+        utilisent le plus petit type entier suffisant (quelques octets par transition)
+        et sont exposées en lecture seule. L'exécution se fait par un MealyRunner (runner()).
+        :param states: Noms des états (l'identifiant est la position).
+        :param inputs: Noms des entrées.
+        :param outputs: Noms des sorties.
+        :param next_state: Table des états suivants (NULL_STATE si absente).
+        :param output: Table des sorties (DEFAULT_OUTPUT si absente).
+        :param initial: Identifiant de l'état initial.
+        """
+        states, state_ids = _names(states)
+        inputs, input_ids = _names(inputs)
+        outputs, output_ids = _names(outputs)
+        if len(next_state) != len(states) * len(inputs) or len(output) != len(next_state):
+            raise ValueError("Tables de transitions de taille incohérente")
+        next_state = _readonly(_typecode(len(states)), next_state)
+        setattr = object.__setattr__
+        setattr(self, "states", states)
+        setattr(self, "inputs", inputs)
+        setattr(self, "outputs", outputs)
+        setattr(self, "state_ids", state_ids)
+        setattr(self, "input_ids", input_ids)
+        setattr(self, "output_ids", output_ids)
+        setattr(self, "next_state", next_state)
+        setattr(self, "output", _readonly(_typecode(len(outputs)), output))
+        setattr(self, "initial", initial)
+        setattr(self, "size", len(next_state) - next_state.tolist().count(NULL_STATE))
+
+    def __setattr__(self, attribute, value):
+        raise AttributeError("Mealy est immuable")
+
+    def __reduce__(self):
+        return Mealy, (tuple(self.states), tuple(self.inputs), tuple(self.outputs),
+                       self.next_state.tolist(), self.output.tolist(), self.initial)
+
+    @classmethod
+    def from_transitions(cls, transitions, initial_state):
+        """
+        Construit la machine depuis un dictionnaire {(état, entrée): (état_suivant, sortie)}.
+        :return: Instance de Mealy.
+        """
+        states, inputs, outputs = _Symbols([initial_state]), _Symbols(), _Symbols()
+        state_ids, input_ids, output_ids = states.ids, inputs.ids, outputs.ids
+        add_state, add_input, add_output = states.add, inputs.add, outputs.add
+        sources, columns, targets, values = array("q"), array("q"), array("q"), array("q")
+        for (state, input_symbol), (next_state, output) in transitions.items():
+            # Recherche directe dans les tables, ajout seulement pour un nouveau symbole
+            state_id = state_ids.get(state)
+            sources.append(add_state(state) if state_id is None else state_id)
+            input_id = input_ids.get(input_symbol)
+            columns.append(add_input(input_symbol) if input_id is None else input_id)
+            next_id = state_ids.get(next_state)
+            targets.append(add_state(next_state) if next_id is None else next_id)
+            output_id = output_ids.get(output)
+            values.append(add_output(output) if output_id is None else output_id)
+        return cls._build(states, inputs, outputs, zip(sources, columns, targets, values))
+
+    @classmethod
+    def from_structure(cls, structure):
+        """
+        Construit la machine depuis la structure de generate_mealy_structure
+        ("states", "transition-function", "output-function").
+        :return: Instance de Mealy.
+        """
+        transition_function = structure["transition-function"]
+        output_function = structure["output-function"]
+        states = _Symbols(structure["states"])
+        inputs = _Symbols(structure.get("input-alphabet", ()))
+        outputs = _Symbols(structure.get("output-alphabet", ()))
+        try:
+            next_table, output_table = cls._fill(states, inputs, outputs, transition_function, output_function)
+        except KeyError:
+            # Alphabets absents ou incomplets : collecte des symboles puis remplissage
+            for state, row in transition_function.items():
+                states.add(state)
+                for input_symbol, next_state in row.items():
+                    inputs.add(input_symbol)
+                    states.add(next_state)
+            for row in output_function.values():
+                for output in row.values():
+                    outputs.add(output)
+            next_table, output_table = cls._fill(states, inputs, outputs, transition_function, output_function)
+        return cls(states.names, inputs.names, outputs.names, next_table, output_table)
+
+    @staticmethod
+    def _fill(states, inputs, outputs, transition_function, output_function):
+        k = len(inputs.names)
+        state_ids, input_ids, output_ids = states.ids, inputs.ids, outputs.ids
+        next_table = array(_typecode(len(states.names)), [NULL_STATE]) * (len(states.names) * k)
+        output_table = array(_typecode(len(outputs.names)), [DEFAULT_OUTPUT]) * (len(states.names) * k)
+        for state, row in transition_function.items():
+            base = state_ids[state] * k
+            state_outputs = output_function[state]
+            for input_symbol, next_state in row.items():
+                index = base + input_ids[input_symbol]
+                next_table[index] = state_ids[next_state]
+                output_table[index] = output_ids[state_outputs[input_symbol]]
+        return next_table, output_table
+
+    @classmethod
+    def from_machine(cls, machine):
+        """Convertit une MealyMachine ou une CompiledMealy."""
+        if isinstance(machine, CompiledMealy):
+            return cls.from_compiled(machine)
+        return cls.from_transitions(machine.transitions, machine.initial_state)
+
+    @classmethod
+    def from_compiled(cls, machine):
+        """Convertit une CompiledMealy sans passer par un dictionnaire."""
+        if None in machine.states:
+            # Identifiants inutilisés d'un fichier FSMlib : passage par les transitions
+            return cls.from_transitions(dict(
+                ((state, input_symbol), (next_state, output))
+                for state, input_symbol, next_state, output in machine.iter_transitions()),
+                machine.states[machine.initial_state])
+        return cls(machine.states, machine.inputs, machine.outputs,
+                   machine.next_state, machine.output, machine.initial_state)
+
+    @classmethod
+    def _build(cls, states, inputs, outputs, rows):
+        k = len(inputs.names)
+        next_state = array(_typecode(len(states.names)), [NULL_STATE]) * (len(states.names) * k)
+        output = array(_typecode(len(outputs.names)), [DEFAULT_OUTPUT]) * (len(states.names) * k)
+        for state, input_id, target, output_id in rows:
+            next_state[state * k + input_id] = target
+            output[state * k + input_id] = output_id
+        return cls(states.names, inputs.names, outputs.names, next_state, output)
+
+    def _index(self, state, input_symbol):
+        state_id = self.state_ids.get(state)
+        input_id = self.input_ids.get(input_symbol)
+        if state_id is None or input_id is None:
+            return None
+        return state_id * len(self.inputs) + input_id
+
+    @property
+    def initial_state(self):
+        return self.states[self.initial]
+
+    @property
+    def transitions(self):
+        """Vue en lecture seule {(état, entrée): (état_suivant, sortie)}."""
+        return _MealyTransitions(self)
+
+    def structure(self):
+        """
+        Vue en lecture seule au format de generate_mealy_structure.
+        :return: Dictionnaire dont les fonctions de transition et de sortie sont des vues.
+        """
+        return {
+            "states": list(self.states),
+            "input-alphabet": list(self.inputs),
+            "output-alphabet": list(self.outputs),
+            "transition-function": _Rows(self.state_ids, self.states,
+                                         lambda state: _MealyRow(self, state, self.next_state, self.states)),
+            "output-function": _Rows(self.state_ids, self.states,
+                                     lambda state: _MealyRow(self, state, self.output, self.outputs)),
+        }
+
+    def state(self, name):
+        """Retourne l'objet State d'un état."""
+        return State(self.state_ids[name], name)
+
+    def iter_transitions(self):
+        """Itère sur les transitions sous forme d'objets Transition."""
+        transitions = self.transitions
+        for key in transitions:
+            next_state, output = transitions[key]
+            yield Transition(key[0], key[1], next_state, output)
+
+    def runner(self):
+        """Retourne un exécuteur de la machine, partant de l'état initial."""
+        return MealyRunner(self)
+
+    def to_compiled(self):
+        """Convertit en CompiledMealy (tables array('l'))."""
+        return CompiledMealy(len(self.states), len(self.inputs), len(self.outputs),
+                             array("l", self.next_state), array("l", self.output),
+                             self.initial, self.states, self.inputs, self.outputs)
+
+# Exécution d'une machine Mealy : seul objet mutable, l'état courant
+class MealyRunner:
+    __slots__ = ("machine", "current_state")
+
+    def __init__(self, machine):
+        """
+        Initialise un exécuteur d'une machine Mealy (même interface que MealyMachine
+        pour reset et process_input) ; plusieurs exécuteurs peuvent partager la machine.
+        :param machine: Instance de Mealy.
+        """
+        self.machine = machine
+        self.current_state = machine.initial_state
+
+    def reset(self):
+        """Réinitialise l'état courant à l'état initial."""
+        self.current_state = self.machine.initial_state
+
+    def process_input(self, input_sequence):
+        """
+        Traite une séquence d'entrées depuis l'état courant.
+        :return: Tuple (liste des sorties, liste des états visités).
+        """
+        machine = self.machine
+        k = len(machine.inputs)
+        state_id = machine.state_ids[self.current_state]
+        outputs = []
+        states = [self.current_state]
+        for input_symbol in input_sequence:
+            input_id = machine.input_ids.get(input_symbol)
+            next_state = NULL_STATE if input_id is None else machine.next_state[state_id * k + input_id]
+            if next_state == NULL_STATE:
+                raise ValueError(f"Transition inconnue pour ({self.current_state}, {input_symbol})")
+            output = machine.output[state_id * k + input_id]
+            outputs.append(machine.outputs[output] if output != DEFAULT_OUTPUT else None)
+            state_id = next_state
+            self.current_state = machine.states[state_id]
+            states.append(self.current_state)
+        return outputs, states
+
+class _NfaTransitions(Mapping):
+    """Vue {(état, entrée): [états suivants]} d'un NFA (entrées non vides seulement)."""
+    __slots__ = ("nfa",)
+
+    def __init__(self, nfa):
+        self.nfa = nfa
+
+    def __getitem__(self, key):
+        nfa = self.nfa
+        state_id, input_id = nfa.state_ids.get(key[0]), nfa.input_ids.get(key[1])
+        if state_id is None or input_id is None:
+            raise KeyError(key)
+        index = state_id * len(nfa.alphabet) + input_id
+        start, end = nfa.offsets[index], nfa.offsets[index + 1]
+        if start == end:
+            raise KeyError(key)
+        return [nfa.states[target] for target in nfa.targets[start:end]]
+
+    def __iter__(self):
+        nfa = self.nfa
+        k = len(nfa.alphabet)
+        offsets = nfa.offsets
+        for index in range(len(offsets) - 1):
+            if offsets[index] != offsets[index + 1]:
+                yield nfa.states[index // k], nfa.alphabet[index % k]
+
+    def __len__(self):
+        offsets = self.nfa.offsets
+        return sum(1 for index in range(len(offsets) - 1) if offsets[index] != offsets[index + 1])
+
+# NFA compact et immuable (successeurs en ligne compressée)
+class Nfa:
+    __slots__ = ("states", "alphabet", "state_ids", "input_ids", "offsets", "targets",
+                 "initial", "accepting")
+
+    def __init__(self, states, alphabet, rows, initial=0, accepting=()):
+        """
+        Initialise un NFA à partir de ses successeurs par (état, entrée).
+        :param states: Noms des états.
+        :param alphabet: Noms des entrées.
+        :param rows: Liste, indexée par état * len(alphabet) + entrée, des identifiants successeurs.
+        :param initial: Identifiant de l'état initial.
+        :param accepting: Identifiants des états acceptants.
+        """
+        states, state_ids = _names(states)
+        alphabet, input_ids = _names(alphabet)
+        if len(rows) != len(states) * len(alphabet):
+            raise ValueError("Table de transitions de taille incohérente")
+        targets = array(_typecode(len(states)))
+        offsets = [0]
+        for row in rows:
+            targets.extend(row)
+            offsets.append(len(targets))
+        setattr = object.__setattr__
+        setattr(self, "states", states)
+        setattr(self, "alphabet", alphabet)
+        setattr(self, "state_ids", state_ids)
+        setattr(self, "input_ids", input_ids)
+        setattr(self, "targets", memoryview(targets).toreadonly())
+        setattr(self, "offsets", _readonly(_typecode(len(targets)), offsets))
+        setattr(self, "initial", initial)
+        setattr(self, "accepting", frozenset(accepting))
+
+    def __setattr__(self, attribute, value):
+        raise AttributeError("Nfa est immuable")
+
+    def __reduce__(self):
+        offsets, targets = self.offsets, self.targets
+        rows = [targets[offsets[index]:offsets[index + 1]].tolist() for index in range(len(offsets) - 1)]
+        return Nfa, (tuple(self.states), tuple(self.alphabet), rows, self.initial, self.accepting)
+
+    @classmethod
+    def from_transitions(cls, states, alphabet, transitions, initial_state, accepting_states):
+        """Construit le NFA depuis les arguments du constructeur de NFA."""
+        state_table, inputs = _Symbols(states), _Symbols(alphabet)
+        state_table.add(initial_state)
+        entries = [(state_table.add(state), inputs.add(symbol), [state_table.add(s) for s in next_states])
+                   for (state, symbol), next_states in transitions.items()]
+        for state in accepting_states:
+            state_table.add(state)
+        return cls._build(state_table, inputs, entries, initial_state, accepting_states)
+
+    @classmethod
+    def from_structure(cls, structure):
+        """
+        Construit le NFA depuis la structure de generate_nfa_structure
+        ("states", "start-states", "accept-states", "alphabet", "transition-function").
+        """
+        state_table, inputs = _Symbols(structure["states"]), _Symbols(structure["alphabet"])
+        entries = [(state_table.add(state), inputs.add(symbol), [state_table.add(s) for s in next_states])
+                   for state, row in structure["transition-function"].items()
+                   for symbol, next_states in row.items()]
+        start_states = structure["start-states"] or structure["states"][:1]
+        return cls._build(state_table, inputs, entries, start_states[0], structure["accept-states"])
+
+    @classmethod
+    def from_nfa(cls, nfa):
+        """Convertit un NFA ou un CompiledNFA."""
+        if isinstance(nfa, CompiledNFA):
+            nfa = nfa.to_nfa()
+        return cls.from_transitions(nfa.states, nfa.alphabet, nfa.transitions,
+                                    nfa.initial_state, nfa.accepting_states)
+
+    @classmethod
+    def _build(cls, state_table, inputs, entries, initial_state, accepting_states):
+        k = len(inputs.names)
+        rows = [()] * (len(state_table.names) * k)
+        for state, input_id, next_states in entries:
+            index = state * k + input_id
+            rows[index] = sorted(set(rows[index]).union(next_states))
+        return cls(state_table.names, inputs.names, rows, state_table.ids[initial_state],
+                   [state_table.ids[state] for state in accepting_states])
+
+    @property
+    def initial_state(self):
+        return self.states[self.initial]
+
+    @property
+    def accepting_states(self):
+        return frozenset(self.states[state] for state in self.accepting)
+
+    @property
+    def transitions(self):
+        """Vue en lecture seule {(état, entrée): [états suivants]}."""
+        return _NfaTransitions(self)
+
+    def is_accepted(self, input_sequence):
+        """
+        Vérifie si une séquence est acceptée par le NFA (même interface que NFA).
+        :return: True si acceptée, False sinon.
+        """
+        k = len(self.alphabet)
+        offsets, targets = self.offsets, self.targets
+        current = {self.initial}
+        for input_symbol in input_sequence:
+            input_id = self.input_ids.get(input_symbol)
+            if input_id is None:
+                return False
+            following = set()
+            for state in current:
+                index = state * k + input_id
+                following.update(targets[offsets[index]:offsets[index + 1]])
+            current = following
+        return not self.accepting.isdisjoint(current)
+
+    def to_compiled(self):
+        """Convertit en CompiledNFA."""
+        return CompiledNFA.from_nfa(self)
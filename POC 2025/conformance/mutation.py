@@ -0,0 +1,175 @@
+from array import array
+
+from .compiled import NULL_STATE, compile_pair
+from .product import RestrictedProduct
+
+OUTPUT_FAULT = 0
+TRANSFER_FAULT = 1
+
+# Ensemble de mutants stockés en colonnes (une transition modifiée par mutant)
+class MutantSet:
+    def __init__(self, machine, nfa=None, output_faults=True, transfer_faults=True):
+        """
+        Dérive tous les mutants à une faute de sortie ou de transfert d'une machine.
+        Chaque mutant diffère de la spécification par une seule transition, stockée
+        dans les colonnes `index`, `next_state` et `output`.
+        :param machine: Instance de MealyMachine ou de CompiledMealy.
+        :param nfa: Restriction facultative (NFA ou CompiledNFA) : seules les transitions
+                    atteignables par des entrées autorisées sont mutées.
+        :param output_faults: Inclure les fautes de sortie.
+        :param transfer_faults: Inclure les fautes de transfert.
+        """
+        machine, nfa = compile_pair(machine, nfa)
+        self.machine = machine
+        self.input_ids = {input_symbol: index for index, input_symbol in enumerate(machine.inputs)}
+        self.index = array("l")
+        self.next_state = array("l")
+        self.output = array("l")
+        self.kind = array("b")
+
+        if nfa is not None:
+            candidates = sorted(RestrictedProduct(machine, nfa).transitions())
+        else:
+            candidates = [index for index, next_state in enumerate(machine.next_state) if next_state != NULL_STATE]
+        states = [state for state in range(machine.num_states) if machine.states[state] is not None]
+        for index in candidates:
+            next_state, output = machine.next_state[index], machine.output[index]
+            if output_faults:
+                for other in range(machine.num_outputs):
+                    if other != output:
+                        self._add(index, next_state, other, OUTPUT_FAULT)
+            if transfer_faults:
+                for other in states:
+                    if other != next_state:
+                        self._add(index, other, output, TRANSFER_FAULT)
+        # Mutants regroupés par transition modifiée
+        self.by_index = {}
+        for mutant, index in enumerate(self.index):
+            self.by_index.setdefault(index, []).append(mutant)
+
+    def _add(self, index, next_state, output, kind):
+        self.index.append(index)
+        self.next_state.append(next_state)
+        self.output.append(output)
+        self.kind.append(kind)
+
+    def __len__(self):
+        return len(self.index)
+
+    def describe(self, mutant):
+        """Décrit un mutant : (type, état, entrée, état suivant, sortie)."""
+        machine = self.machine
+        state, input_id = divmod(self.index[mutant], machine.num_inputs)
+        return ("sortie" if self.kind[mutant] == OUTPUT_FAULT else "transfert",
+                machine.states[state], machine.inputs[input_id],
+                machine.states[self.next_state[mutant]], machine.outputs[self.output[mutant]])
+
+    def encode(self, sequence):
+        """Convertit une séquence de symboles en indices d'entrées (-1 pour un symbole inconnu)."""
+        input_ids = self.input_ids
+        return [input_ids.get(input_symbol, -1) for input_symbol in sequence]
+
+    def run_test(self, sequence, dead=None):
+        """
+        Exécute une séquence en parallèle sur tous les mutants.
+        Les mutants suivent la spécification tant qu'ils n'ont pas emprunté leur
+        transition modifiée ; seuls les mutants ayant divergé sont simulés séparément.
+        :param sequence: Séquence de symboles d'entrée.
+        :param dead: bytearray des mutants à ignorer (déjà tués), facultatif.
+        :return: Liste des mutants tués par la séquence.
+        """
+        machine = self.machine
+        k = machine.num_inputs
+        next_table, output_table = machine.next_state, machine.output
+        mutant_index, mutant_next, mutant_output = self.index, self.next_state, self.output
+        by_index = self.by_index
+        killed = []
+        diverged = {}
+        visited = set()
+        state = machine.initial_state
+        for input_id in self.encode(sequence):
+            index = state * k + input_id if input_id >= 0 else -1
+            spec_next = next_table[index] if index >= 0 else NULL_STATE
+            spec_output = output_table[index] if spec_next != NULL_STATE else None
+            # Mutants ayant divergé : simulation individuelle
+            for mutant, mutant_state in list(diverged.items()):
+                if input_id < 0:
+                    continue
+                own = mutant_state * k + input_id
+                if own == mutant_index[mutant]:
+                    own_next, own_output = mutant_next[mutant], mutant_output[mutant]
+                else:
+                    own_next = next_table[own]
+                    own_output = output_table[own] if own_next != NULL_STATE else None
+                if own_output != spec_output or (own_next == NULL_STATE) != (spec_next == NULL_STATE):
+                    killed.append(mutant)
+                    del diverged[mutant]
+                else:
+                    diverged[mutant] = own_next
+            if spec_next == NULL_STATE:
+                break
+            # Mutants encore synchronisés dont la transition modifiée est empruntée
+            if index not in visited:
+                visited.add(index)
+                for mutant in by_index.get(index, ()):
+                    if dead is not None and dead[mutant]:
+                        continue
+                    if mutant_output[mutant] != spec_output:
+                        killed.append(mutant)
+                    else:
+                        diverged[mutant] = mutant_next[mutant]
+            state = spec_next
+        return killed
+
+    def kill_sets(self, tests):
+        """
+        Calcule, pour chaque test, l'ensemble des mutants tués sous forme de bits compactés.
+        :param tests: Liste des séquences.
+        :return: Liste d'entiers (le bit m vaut 1 si le test tue le mutant m).
+        """
+        size = (len(self) + 7) // 8
+        bitsets = []
+        for test in tests:
+            bits = bytearray(size)
+            for mutant in self.run_test(test):
+                bits[mutant >> 3] |= 1 << (mutant & 7)
+            bitsets.append(int.from_bytes(bits, "little"))
+        return bitsets
+
+    def score(self, tests):
+        """
+        Calcule le taux de mutants tués par une suite (les mutants tués ne sont plus simulés).
+        :param tests: Liste des séquences.
+        :return: Dictionnaire {"mutants", "killed", "kill_ratio", "survivors"}.
+        """
+        dead = bytearray(len(self))
+        killed = 0
+        for test in tests:
+            for mutant in self.run_test(test, dead):
+                if not dead[mutant]:
+                    dead[mutant] = 1
+                    killed += 1
+        return {
+            "mutants": len(self),
+            "killed": killed,
+            "kill_ratio": killed / len(self) if len(self) else 1.0,
+            "survivors": [mutant for mutant in range(len(self)) if not dead[mutant]],
+        }
+
+def compare_suites(mealy_machine, suites, nfa=None, **options):
+    """
+    Compare le taux de mutants tués de plusieurs suites (par exemple "simple" et "complex"
+    de compare_methods).
+    :param mealy_machine: Spécification (MealyMachine ou CompiledMealy).
+    :param suites: Dictionnaire {nom: liste des séquences}.
+    :param nfa: Restriction facultative limitant les mutants.
+    :param options: Options de MutantSet (output_faults, transfer_faults).
+    :return: Dictionnaire {nom: {"tests", "mutants", "killed", "kill_ratio"}}.
+    """
+    mutants = MutantSet(mealy_machine, nfa, **options)
+    report = {}
+    for name, tests in suites.items():
+        score = mutants.score(tests)
+        report[name] = {"tests": len(tests), "mutants": score["mutants"],
+                        "killed": score["killed"], "kill_ratio": score["kill_ratio"]}
+    return report
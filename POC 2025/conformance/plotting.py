@@ -0,0 +1,27 @@
+def visualize_performance(results, output_file=None, show=True):
+    """
+    Affiche les temps d'exécution des méthodes de compare_methods.
+    matplotlib n'est importé qu'à l'appel de cette fonction.
+    :param results: Résultats de compare_methods ({méthode: {"time", ...}}).
+    :param output_file: Fichier image où enregistrer le graphique (facultatif).
+    :param show: Afficher la fenêtre du graphique.
+    :return: Figure matplotlib.
+    """
+    import matplotlib
+    if not show:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    methods = list(results)
+    times = [results[method]["time"] for method in methods]
+
+    figure = plt.figure()
+    plt.bar(methods, times, color=["blue", "green", "orange", "red"][:len(methods)])
+    plt.title("Comparaison des performances des méthodes")
+    plt.xlabel("Méthode")
+    plt.ylabel("Temps d'exécution (s)")
+    if output_file is not None:
+        figure.savefig(output_file)
+    if show:
+        plt.show()
+    return figure
@@ -0,0 +1,133 @@
+from collections import deque
+
+from .compiled import NULL_STATE, compile_pair
+
+# Produit d'une machine de Mealy et de sa restriction
+class RestrictedProduct:
+    def __init__(self, mealy_machine, nfa=None):
+        """
+        Initialise le produit (état de la machine, ensemble d'états vivants du NFA).
+        Une entrée est autorisée depuis un nœud si la transition de la machine est définie
+        et si la séquence prolongée reste un préfixe d'un mot accepté par le NFA.
+        Sans NFA, l'ensemble vaut None et toutes les entrées définies sont autorisées.
+        :param mealy_machine: Instance de MealyMachine ou de CompiledMealy.
+        :param nfa: Instance de NFA ou de CompiledNFA (facultatif).
+        """
+        self.machine, self.nfa = compile_pair(mealy_machine, nfa)
+        if self.nfa is None:
+            self.initial = (self.machine.initial_state, None)
+        else:
+            live = self.nfa.live_states()
+            self.initial = (self.machine.initial_state,
+                            frozenset(q for q in self.nfa.initial_subset if live[q]))
+        self._successors = {}
+        self._nodes = None
+
+    def successors(self, node):
+        """
+        Retourne les transitions autorisées depuis un nœud (mémoïsé).
+        :param node: Nœud (état, ensemble).
+        :return: Liste de tuples (indice d'entrée, sortie, nœud suivant).
+        """
+        result = self._successors.get(node)
+        if result is None:
+            machine, nfa = self.machine, self.nfa
+            state, subset = node
+            k = machine.num_inputs
+            result = []
+            if nfa is not None and not subset:
+                self._successors[node] = result
+                return result
+            for input_id in range(k):
+                index = state * k + input_id
+                next_state = machine.next_state[index]
+                if next_state == NULL_STATE:
+                    continue
+                if nfa is None:
+                    next_subset = None
+                elif input_id < nfa.num_inputs:
+                    next_subset = nfa.allowed_step(subset, input_id)
+                    if not next_subset:
+                        continue
+                else:
+                    continue
+                result.append((input_id, machine.output[index], (next_state, next_subset)))
+            self._successors[node] = result
+        return result
+
+    def allows(self, node, input_id):
+        """Indique si l'entrée `input_id` est autorisée depuis `node`."""
+        return any(candidate == input_id for candidate, _, _ in self.successors(node))
+
+    def is_accepting(self, node):
+        """Indique si la séquence menant à `node` est acceptée par la restriction."""
+        return self.nfa is None or self.nfa.is_accepting(node[1])
+
+    def nodes(self):
+        """
+        Énumère les nœuds atteignables depuis le nœud initial (parcours en largeur, mémoïsé).
+        :return: Liste des nœuds, le nœud initial en premier.
+        """
+        if self._nodes is None:
+            seen = {self.initial}
+            order = [self.initial]
+            queue = deque(order)
+            while queue:
+                for _, _, next_node in self.successors(queue.popleft()):
+                    if next_node not in seen:
+                        seen.add(next_node)
+                        order.append(next_node)
+                        queue.append(next_node)
+            self._nodes = order
+        return self._nodes
+
+    def transitions(self):
+        """Retourne les indices des transitions de la machine empruntables sous la restriction."""
+        k = self.machine.num_inputs
+        return {node[0] * k + input_id for node in self.nodes() for input_id, _, _ in self.successors(node)}
+
+    def shortest_path(self, start, goal):
+        """
+        Cherche la plus courte séquence d'entrées menant de `start` à un nœud vérifiant `goal`.
+        :param start: Nœud de départ.
+        :param goal: Prédicat sur les nœuds.
+        :return: Tuple (liste des indices d'entrées, nœud atteint) ou None.
+        """
+        if goal(start):
+            return [], start
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for input_id, _, next_node in self.successors(node):
+                if next_node in parents:
+                    continue
+                parents[next_node] = (node, input_id)
+                if goal(next_node):
+                    path = []
+                    current = next_node
+                    while parents[current] is not None:
+                        current, step = parents[current]
+                        path.append(step)
+                    path.reverse()
+                    return path, next_node
+                queue.append(next_node)
+        return None
+
+    def run(self, node, input_ids):
+        """
+        Applique une séquence d'indices d'entrées depuis un nœud.
+        :return: Tuple (liste des sorties, nœud atteint).
+        :raises ValueError: si une entrée n'est pas autorisée.
+        """
+        outputs = []
+        for input_id in input_ids:
+            for candidate, output, next_node in self.successors(node):
+                if candidate == input_id:
+                    outputs.append(output)
+                    node = next_node
+                    break
+            else:
+                raise ValueError(f"Entrée {self.machine.inputs[input_id]} non autorisée depuis l'état "
+                                 f"{self.machine.states[node[0]]}")
+        return outputs, node
@@ -0,0 +1,277 @@
+import hashlib
+import os
+import shutil
+
+from .graphs import strongly_connected_components
+
+# Nombre maximal d'étiquettes affichées sur une arête fusionnée
+MAX_EDGE_LABELS = 6
+# Taille à partir de laquelle une composante est réduite à un seul nœud
+CLUSTER_THRESHOLD = 8
+# Nombre de nœuds à partir duquel les composantes sont réduites automatiquement
+MAX_DETAILED_NODES = 50
+
+# Extraction des graphes
+def mealy_graph(mealy_machine):
+    """
+    Extrait les sommets et arêtes étiquetées d'une machine de Mealy.
+    :param mealy_machine: Instance de MealyMachine.
+    :return: Tuple (liste des états, liste des arêtes (source, destination, étiquette)).
+    """
+    states = [mealy_machine.initial_state]
+    seen = {mealy_machine.initial_state}
+    edges = []
+    for (state, input_symbol), (next_state, output) in mealy_machine.transitions.items():
+        for s in (state, next_state):
+            if s not in seen:
+                seen.add(s)
+                states.append(s)
+        edges.append((state, next_state, f"{input_symbol}/{output}"))
+    return states, edges
+
+def nfa_graph(nfa):
+    """
+    Extrait les sommets et arêtes étiquetées d'un NFA.
+    :param nfa: Instance de NFA.
+    :return: Tuple (liste des états, liste des arêtes (source, destination, étiquette)).
+    """
+    edges = []
+    for (state, input_symbol), next_states in nfa.transitions.items():
+        for next_state in next_states:
+            edges.append((state, next_state, str(input_symbol)))
+    return list(nfa.states), edges
+
+def merge_parallel_edges(edges):
+    """
+    Fusionne les arêtes parallèles (même source et même destination) en une seule arête.
+    :param edges: Liste des arêtes (source, destination, étiquette).
+    :return: Dictionnaire {(source, destination): [étiquettes]}.
+    """
+    merged = {}
+    for source, destination, label in edges:
+        merged.setdefault((source, destination), []).append(label)
+    return merged
+
+def collapse_clusters(states, edges, threshold=CLUSTER_THRESHOLD, classes=None):
+    """
+    Réduit chaque composante de plus de `threshold` états à un seul nœud.
+    :param states: Liste des états.
+    :param edges: Liste des arêtes (source, destination, étiquette).
+    :param threshold: Taille minimale d'une composante réduite.
+    :param classes: Partition des états (par défaut, les composantes fortement connexes).
+    :return: Tuple (dictionnaire état -> nœud affiché, dictionnaire nœud réduit -> taille, arêtes internes par nœud).
+    """
+    if classes is None:
+        successors = {}
+        for source, destination, _ in edges:
+            successors.setdefault(source, []).append(destination)
+        classes = strongly_connected_components(states, successors)
+    representative = {state: state for state in states}
+    sizes = {}
+    for number, members in enumerate(classes):
+        if len(members) > threshold:
+            name = f"cluster_{number}"
+            sizes[name] = len(members)
+            for state in members:
+                representative[state] = name
+    internal = {}
+    for source, destination, _ in edges:
+        node = representative.get(source, source)
+        if node in sizes and representative.get(destination, destination) == node:
+            internal[node] = internal.get(node, 0) + 1
+    return representative, sizes, internal
+
+def depth_bands(states, edges, initial_states, max_nodes=MAX_DETAILED_NODES):
+    """
+    Regroupe les états par tranches de profondeur (distance depuis les états initiaux),
+    de façon à obtenir au plus `max_nodes` groupes.
+    :return: Liste des groupes d'états.
+    """
+    successors = {}
+    for source, destination, _ in edges:
+        successors.setdefault(source, []).append(destination)
+    depth = {state: 0 for state in initial_states}
+    frontier = list(initial_states)
+    while frontier:
+        next_frontier = []
+        for state in frontier:
+            for next_state in successors.get(state, ()):
+                if next_state not in depth:
+                    depth[next_state] = depth[state] + 1
+                    next_frontier.append(next_state)
+        frontier = next_frontier
+    unreachable = max(depth.values(), default=0) + 1
+    band_width = -(-(unreachable + 1) // max(max_nodes, 1))
+    bands = {}
+    for state in states:
+        bands.setdefault(depth.get(state, unreachable) // band_width, []).append(state)
+    return list(bands.values())
+
+def _quote(value):
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+def _edge_label(labels, max_labels):
+    if len(labels) > max_labels:
+        return ", ".join(labels[:max_labels]) + f", … (+{len(labels) - max_labels})"
+    return ", ".join(labels)
+
+def build_dot_source(states, edges, initial_states=(), accepting_states=(),
+                     threshold=CLUSTER_THRESHOLD, max_nodes=MAX_DETAILED_NODES,
+                     max_labels=MAX_EDGE_LABELS, classes=None):
+    """
+    Construit le source DOT d'un automate avec fusion des arêtes parallèles et niveau de détail.
+    Au-delà de `max_nodes` états, les composantes de plus de `threshold` états sont réduites ;
+    s'il reste trop de nœuds, les états sont regroupés par tranches de profondeur.
+    :param states: Liste des états.
+    :param edges: Liste des arêtes (source, destination, étiquette).
+    :param initial_states: États initiaux mis en évidence.
+    :param accepting_states: États acceptants (double cercle).
+    :param threshold: Taille minimale d'une composante réduite.
+    :param max_nodes: Nombre d'états au-delà duquel les composantes sont réduites.
+    :param max_labels: Nombre maximal d'étiquettes affichées par arête.
+    :param classes: Partition explicite des états (classes d'équivalence), sinon les composantes fortement connexes.
+    :return: Source DOT.
+    """
+    if len(states) > max_nodes or classes is not None:
+        representative, sizes, internal = collapse_clusters(states, edges, threshold, classes)
+        if classes is None and len(set(representative.values())) > max_nodes:
+            bands = depth_bands(states, edges, initial_states, max_nodes)
+            representative, sizes, internal = collapse_clusters(states, edges, 1, bands)
+    else:
+        representative, sizes, internal = {state: state for state in states}, {}, {}
+    initial_states = set(initial_states)
+    accepting_states = set(accepting_states)
+
+    lines = ["digraph {"]
+    for name, size in sizes.items():
+        lines.append(
+            f"\t{_quote(name)} [label={_quote(f'{size} états / {internal.get(name, 0)} transitions')} "
+            f"shape=box3d style=filled fillcolor=lightyellow]"
+        )
+    for state in states:
+        if representative[state] != state:
+            continue
+        attributes = []
+        if state in initial_states:
+            attributes.append('color=red style=filled fillcolor=lightgrey')
+        if state in accepting_states:
+            attributes.append('shape=doublecircle')
+        suffix = f" [{' '.join(attributes)}]" if attributes else ""
+        lines.append(f"\t{_quote(state)}{suffix}")
+
+    merged = {}
+    for source, destination, label in edges:
+        source, destination = representative.get(source, source), representative.get(destination, destination)
+        if source == destination and source in sizes:
+            continue
+        merged.setdefault((source, destination), []).append(label)
+    for (source, destination), labels in merged.items():
+        lines.append(f"\t{_quote(source)} -> {_quote(destination)} [label={_quote(_edge_label(labels, max_labels))}]")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def source_hash(source, fmt="png"):
+    """Retourne l'empreinte SHA-256 d'un source DOT et de son format de rendu."""
+    return hashlib.sha256(f"{fmt}\n{source}".encode()).hexdigest()
+
+# Rendu (exécuté hors du fil principal)
+def _render_source(source, output_file, fmt, view, cache_dir):
+    """
+    Rend un source DOT avec Graphviz en réutilisant le cache si possible.
+    :return: Chemin du fichier rendu.
+    """
+    rendered = f"{output_file}.{fmt}"
+    cached = os.path.join(cache_dir, f"{source_hash(source, fmt)}.{fmt}") if cache_dir is not None else None
+    if cached is not None and os.path.exists(cached):
+        with open(output_file, "w") as f:
+            f.write(source)
+        shutil.copyfile(cached, rendered)
+    else:
+        import graphviz
+        rendered = graphviz.Source(source, format=fmt).render(output_file)
+        if cached is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            shutil.copyfile(rendered, cached)
+    if view:
+        import graphviz
+        graphviz.view(rendered)
+    return rendered
+
+class Renderer:
+    def __init__(self, use_processes=False, max_workers=1, cache_dir=".render_cache"):
+        """
+        Initialise un moteur de rendu en arrière-plan.
+        :param use_processes: Utiliser des processus plutôt qu'un fil d'exécution.
+        :param max_workers: Nombre de rendus simultanés.
+        :param cache_dir: Répertoire du cache des rendus (None pour le désactiver).
+        """
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor = executor_class(max_workers=max_workers)
+        self.cache_dir = cache_dir
+
+    def submit(self, source, output_file, fmt="png", view=False):
+        """
+        Lance le rendu d'un source DOT sans bloquer l'appelant.
+        :return: Future donnant le chemin du fichier rendu.
+        """
+        return self.executor.submit(_render_source, source, output_file, fmt, view, self.cache_dir)
+
+    def shutdown(self, wait=True):
+        """Attend (ou non) la fin des rendus en cours et libère les ressources."""
+        self.executor.shutdown(wait=wait)
+
+_default_renderer = None
+
+def default_renderer():
+    """Retourne le moteur de rendu partagé (créé à la première utilisation)."""
+    global _default_renderer
+    if _default_renderer is None:
+        _default_renderer = Renderer()
+    return _default_renderer
+
+def render_graph(states, edges, output_file, initial_states=(), accepting_states=(),
+                 view=False, renderer=None, **options):
+    """
+    Rend en arrière-plan un graphe donné par ses états et ses arêtes étiquetées.
+    :param states: Liste des états.
+    :param edges: Liste des arêtes (source, destination, étiquette).
+    :param output_file: Nom du fichier de sortie (sans extension).
+    :param initial_states: États initiaux mis en évidence.
+    :param accepting_states: États acceptants.
+    :param view: Ouvrir l'image une fois rendue.
+    :param renderer: Moteur de rendu (par défaut, le moteur partagé).
+    :param options: Options de build_dot_source (threshold, max_nodes, max_labels, classes).
+    :return: Future donnant le chemin du fichier rendu.
+    """
+    source = build_dot_source(states, edges, initial_states, accepting_states, **options)
+    return (renderer or default_renderer()).submit(source, output_file, view=view)
+
+def render_mealy(mealy_machine, output_file="mealy_machine", view=False, renderer=None, **options):
+    """
+    Rend le graphe d'une machine de Mealy en arrière-plan.
+    :param mealy_machine: Instance de MealyMachine.
+    :param output_file: Nom du fichier de sortie (sans extension).
+    :param view: Ouvrir l'image une fois rendue.
+    :param renderer: Moteur de rendu (par défaut, le moteur partagé).
+    :param options: Options de build_dot_source (threshold, max_nodes, max_labels, classes).
+    :return: Future donnant le chemin du fichier rendu.
+    """
+    states, edges = mealy_graph(mealy_machine)
+    return render_graph(states, edges, output_file, [mealy_machine.initial_state],
+                        view=view, renderer=renderer, **options)
+
+def render_nfa(nfa, output_file="nfa_graph", view=False, renderer=None, **options):
+    """
+    Rend le graphe d'un NFA en arrière-plan.
+    :param nfa: Instance de NFA.
+    :param output_file: Nom du fichier de sortie (sans extension).
+    :param view: Ouvrir l'image une fois rendue.
+    :param renderer: Moteur de rendu (par défaut, le moteur partagé).
+    :param options: Options de build_dot_source (threshold, max_nodes, max_labels, classes).
+    :return: Future donnant le chemin du fichier rendu.
+    """
+    states, edges = nfa_graph(nfa)
+    return render_graph(states, edges, output_file, [nfa.initial_state], nfa.accepting_states,
+                        view=view, renderer=renderer, **options)
@@ -0,0 +1,166 @@
+from .core import execute_tests
+
+class _Node:
+    """Nœud du trie des préfixes : ensemble d'états du NFA atteint et sous-arbres."""
+    __slots__ = ("subset", "children", "reach", "accepted")
+
+    def __init__(self, subset):
+        self.subset = subset
+        self.children = {}
+        self.reach = subset
+        self.accepted = False
+
+def _step(nfa, subset, symbol):
+    """Calcule l'ensemble d'états atteint depuis `subset` par `symbol`."""
+    next_states = set()
+    for state in subset:
+        next_states.update(nfa.transitions.get((state, symbol), ()))
+    return frozenset(next_states)
+
+# Suite restreinte maintenue incrémentalement lorsque le NFA évolue
+class RestrictedSuite:
+    def __init__(self, nfa, max_length, mealy_machine=None):
+        """
+        Construit le trie des préfixes vivants (ensemble d'états non vide) jusqu'à `max_length`.
+        Les tests sont les nœuds dont l'ensemble contient un état acceptant, comme
+        dans generate_restricted_tests.
+        :param nfa: Instance de NFA (restriction).
+        :param max_length: Longueur maximale des séquences.
+        :param mealy_machine: Machine sur laquelle exécuter les tests (facultatif) ;
+                              les résultats sont mis en cache par séquence.
+        """
+        self.nfa = nfa
+        self.max_length = max_length
+        self.mealy_machine = mealy_machine
+        self.results = {}
+        self.root = _Node(frozenset((nfa.initial_state,)))
+        added = []
+        self._expand(self.root, (), added)
+        self._execute(added)
+
+    def _is_accepting(self, subset):
+        return not subset.isdisjoint(self.nfa.accepting_states)
+
+    def _expand(self, node, prefix, added):
+        """Développe entièrement le sous-arbre d'un nœud et collecte ses tests."""
+        node.accepted = bool(prefix) and self._is_accepting(node.subset)
+        if node.accepted:
+            added.append(prefix)
+        reach = set(node.subset)
+        if len(prefix) < self.max_length:
+            for symbol in self.nfa.alphabet:
+                subset = _step(self.nfa, node.subset, symbol)
+                if subset:
+                    child = node.children[symbol] = _Node(subset)
+                    self._expand(child, prefix + (symbol,), added)
+                    reach |= child.reach
+        node.reach = frozenset(reach)
+
+    def _collect(self, node, prefix, removed):
+        """Collecte les tests d'un sous-arbre supprimé."""
+        if node.accepted:
+            removed.append(prefix)
+        for symbol, child in node.children.items():
+            self._collect(child, prefix + (symbol,), removed)
+
+    def _execute(self, sequences):
+        if self.mealy_machine is None or not sequences:
+            return 0
+        tests = [list(sequence) for sequence in sequences]
+        for sequence, result in zip(sequences, execute_tests(self.mealy_machine, tests)):
+            self.results[sequence] = result
+        return len(tests)
+
+    def tests(self):
+        """
+        Retourne les tests dans l'ordre de generate_restricted_tests (par longueur,
+        puis dans l'ordre de l'alphabet).
+        :return: Liste des séquences.
+        """
+        rank = {symbol: index for index, symbol in enumerate(self.nfa.alphabet)}
+        found = []
+        stack = [(self.root, ())]
+        while stack:
+            node, prefix = stack.pop()
+            if node.accepted:
+                found.append(prefix)
+            for symbol, child in node.children.items():
+                stack.append((child, prefix + (symbol,)))
+        found.sort(key=lambda sequence: (len(sequence), [rank[symbol] for symbol in sequence]))
+        return [list(sequence) for sequence in found]
+
+    def update(self, new_nfa):
+        """
+        Remplace la restriction par `new_nfa` en ne revisitant que les sous-arbres dont
+        les ensembles d'états contiennent la source d'une transition modifiée (ou un état
+        dont l'acceptation a changé).
+        :param new_nfa: Nouvelle instance de NFA (même état initial).
+        :return: Dictionnaire {"added": [...], "removed": [...], "executed": n, "reused": n}.
+        """
+        if new_nfa.initial_state != self.nfa.initial_state:
+            raise ValueError("La mise à jour incrémentale suppose le même état initial")
+        old_transitions, new_transitions = self.nfa.transitions, new_nfa.transitions
+        changed = {}
+        for key in set(old_transitions) | set(new_transitions):
+            if set(old_transitions.get(key, ())) != set(new_transitions.get(key, ())):
+                state, symbol = key
+                changed.setdefault(symbol, set()).add(state)
+        toggled = set(self.nfa.accepting_states) ^ set(new_nfa.accepting_states)
+        touched = set(toggled)
+        for sources in changed.values():
+            touched |= sources
+
+        self.nfa = new_nfa
+        added, removed = [], []
+        self._refresh(self.root, (), False, changed, touched, toggled, added, removed)
+        for sequence in removed:
+            self.results.pop(sequence, None)
+        executed = self._execute(added)
+        return {
+            "added": [list(sequence) for sequence in added],
+            "removed": [list(sequence) for sequence in removed],
+            "executed": executed,
+            "reused": len(self.results) - executed,
+        }
+
+    def _refresh(self, node, prefix, forced, changed, touched, toggled, added, removed):
+        """
+        Met à jour un nœud dont l'ensemble d'états est déjà à jour.
+        :param forced: L'ensemble du nœud a changé : tous ses fils sont recalculés.
+        """
+        if prefix and (forced or not toggled.isdisjoint(node.subset)):
+            accepted = self._is_accepting(node.subset)
+            if accepted != node.accepted:
+                (added if accepted else removed).append(prefix)
+                node.accepted = accepted
+        if len(prefix) < self.max_length:
+            if forced:
+                symbols = list(self.nfa.alphabet)
+            else:
+                symbols = [symbol for symbol, sources in changed.items() if not sources.isdisjoint(node.subset)]
+            recomputed = set()
+            for symbol in symbols:
+                subset = _step(self.nfa, node.subset, symbol)
+                child = node.children.get(symbol)
+                child_prefix = prefix + (symbol,)
+                if not subset:
+                    if child is not None:
+                        self._collect(child, child_prefix, removed)
+                        del node.children[symbol]
+                elif child is None:
+                    child = node.children[symbol] = _Node(subset)
+                    self._expand(child, child_prefix, added)
+                elif child.subset != subset:
+                    child.subset = subset
+                    self._refresh(child, child_prefix, True, changed, touched, toggled, added, removed)
+                    recomputed.add(symbol)
+                else:
+                    continue
+                recomputed.add(symbol)
+            for symbol, child in node.children.items():
+                if symbol not in recomputed and not touched.isdisjoint(child.reach):
+                    self._refresh(child, prefix + (symbol,), False, changed, touched, toggled, added, removed)
+        reach = set(node.subset)
+        for child in node.children.values():
+            reach |= child.reach
+        node.reach = frozenset(reach)
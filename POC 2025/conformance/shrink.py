@@ -0,0 +1,173 @@
+from .compiled import CompiledNFA
+from .verdict import transition_table
+
+# Arbre d'observation : les sorties déjà observées sont rejouées sans réinitialiser la machine
+class ObservationTree:
+    def __init__(self, machine):
+        """
+        Initialise un cache des requêtes de sortie d'une machine, sous forme de trie :
+        chaque nœud associe une entrée à (sortie observée, nœud fils).
+        :param machine: Machine interrogée (MealyMachine, CompiledMealy ou Mealy).
+        """
+        self.table, self.initial_state = transition_table(machine)
+        self.root = {}
+        # Requêtes réellement exécutées (une réinitialisation chacune) et requêtes servies par le cache
+        self.resets = 0
+        self.hits = 0
+
+    def query(self, word):
+        """
+        Retourne les sorties de la machine sur un mot, depuis le cache si le mot
+        (ou un mot dont il est préfixe) a déjà été observé.
+        :param word: Séquence d'entrées.
+        :return: Liste des sorties ; None marque une transition absente et termine la liste.
+        """
+        node = self.root
+        outputs = []
+        for input_symbol in word:
+            entry = node.get(input_symbol)
+            if entry is None:
+                break
+            outputs.append(entry[0])
+            if entry[0] is None:
+                break
+            node = entry[1]
+        else:
+            self.hits += 1
+            return outputs
+        if outputs and outputs[-1] is None:
+            self.hits += 1
+            return outputs
+
+        self.resets += 1
+        table = self.table
+        state = self.initial_state
+        node = self.root
+        outputs = []
+        for input_symbol in word:
+            step = table.get((state, input_symbol))
+            entry = node.get(input_symbol)
+            if entry is None:
+                entry = node[input_symbol] = (None if step is None else step[1], {})
+            outputs.append(entry[0])
+            if step is None:
+                break
+            state = step[0]
+            node = entry[1]
+        return outputs
+
+# Contrainte de restriction sur les candidats
+class _Restriction:
+    def __init__(self, nfa, accepted):
+        if nfa is not None and not isinstance(nfa, CompiledNFA):
+            nfa = CompiledNFA.from_nfa(nfa)
+        self.nfa = nfa
+        self.accepted = accepted
+        if nfa is not None:
+            self.input_ids = {input_symbol: index for index, input_symbol in enumerate(nfa.inputs)}
+            live = nfa.live_states()
+            self.initial = frozenset(q for q in nfa.initial_subset if live[q])
+
+    def subsets(self, word):
+        """Ensembles d'états vivants après chaque préfixe, ou None si le mot est interdit."""
+        subset = self.initial
+        subsets = [subset]
+        for input_symbol in word:
+            input_id = self.input_ids.get(input_symbol)
+            if input_id is None:
+                return None
+            subset = self.nfa.allowed_step(subset, input_id)
+            if not subset:
+                return None
+            subsets.append(subset)
+        return subsets
+
+    def cut(self, word, length):
+        """
+        Tronque un mot à au moins `length` symboles en respectant la restriction.
+        :return: Plus court préfixe admis de longueur >= length, ou None si le mot est interdit.
+        """
+        if self.nfa is None:
+            return word[:length]
+        subsets = self.subsets(word)
+        if subsets is None:
+            return None
+        if not self.accepted:
+            return word[:length]
+        for end in range(length, len(word) + 1):
+            if self.nfa.is_accepting(subsets[end]):
+                return word[:end]
+        return None
+
+def _divergence(expected, observed):
+    """Indice de la première sortie différente, ou None (None aussi si la spécification n'est pas définie)."""
+    for index, (expected_output, observed_output) in enumerate(zip(expected, observed)):
+        if expected_output is None:
+            return None
+        if expected_output != observed_output:
+            return index
+    return None
+
+def shrink_counterexample(specification, implementation, sequence, nfa=None, accepted=False):
+    """
+    Réduit une séquence en échec à une séquence en échec minimale au sens du delta debugging :
+    chaque candidat est tronqué juste après sa première divergence, puis des blocs de taille
+    décroissante sont retirés tant que le résultat échoue encore et respecte la restriction.
+    Les sorties sont demandées à des arbres d'observation : un candidat déjà observé, ou
+    préfixe d'un mot observé, ne coûte aucune réinitialisation.
+    :param specification: Machine de référence.
+    :param implementation: Machine testée.
+    :param sequence: Séquence d'entrées en échec.
+    :param nfa: Restriction (NFA ou CompiledNFA), facultative.
+    :param accepted: Exiger que les candidats soient acceptés par le NFA ; par défaut, il suffit
+                     qu'ils soient des préfixes de mots acceptés.
+    :return: Dictionnaire {"sequence", "index", "expected", "observed", "candidates", "resets", "cache_hits"}.
+    :raises ValueError: si la séquence n'échoue pas ou n'est pas admise par la restriction.
+    """
+    expected_tree = ObservationTree(specification)
+    observed_tree = ObservationTree(implementation)
+    restriction = _Restriction(nfa, accepted)
+    candidates = 0
+
+    def failing(word):
+        """Candidat tronqué après sa divergence, ou None s'il n'échoue pas ou est interdit."""
+        nonlocal candidates
+        candidates += 1
+        index = _divergence(expected_tree.query(word), observed_tree.query(word))
+        if index is None:
+            return None
+        return restriction.cut(word, index + 1)
+
+    sequence = list(sequence)
+    if restriction.nfa is not None and restriction.cut(sequence, len(sequence)) != sequence:
+        raise ValueError("La séquence n'est pas admise par la restriction")
+    current = failing(sequence)
+    if current is None:
+        raise ValueError("La séquence n'est pas en échec sur l'implémentation")
+
+    granularity = 2
+    while len(current) >= 2:
+        size = -(-len(current) // granularity)
+        for start in range(0, len(current), size):
+            candidate = failing(current[:start] + current[start + size:])
+            if candidate is not None:
+                current = candidate
+                granularity = max(granularity - 1, 2)
+                break
+        else:
+            if granularity >= len(current):
+                break
+            granularity = min(2 * granularity, len(current))
+
+    expected = expected_tree.query(current)
+    observed = observed_tree.query(current)
+    index = _divergence(expected, observed)
+    return {
+        "sequence": current,
+        "index": index,
+        "expected": expected[index],
+        "observed": observed[index],
+        "candidates": candidates,
+        "resets": expected_tree.resets + observed_tree.resets,
+        "cache_hits": expected_tree.hits + observed_tree.hits,
+    }
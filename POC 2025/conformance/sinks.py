@@ -0,0 +1,454 @@
+import json
+import os
+import sys
+from array import array
+from itertools import chain
+
+# Les puits reçoivent les résultats de execute_tests, (séquence, sorties, états) ou
+# (séquence, message d'erreur, []), et les écrivent par blocs : le formatage et les
+# écritures sont regroupés au lieu d'un print par test.
+
+FORMATS = ("jsonl", "csv", "columnar", "verdicts")
+EXTENSIONS = {"jsonl": ".jsonl", "csv": ".csv", "columnar": ".col", "verdicts": ".jsonl"}
+# Extension -> module de compression de la bibliothèque standard (importé à l'ouverture)
+COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma"}
+
+# Niveaux rapides pour la compression à la volée : l'écriture ne doit pas coûter plus que l'exécution
+_WRITE_LEVELS = {"gzip": {"compresslevel": 1}, "bz2": {"compresslevel": 1}, "lzma": {"preset": 1}}
+
+# Séparateur des symboles dans les cellules CSV
+CSV_SEPARATOR = " "
+COLUMNAR_MAGIC = b"CONFORMANCE-COLUMNAR 1\n"
+
+def _compression(file_path, compress):
+    if compress is None:
+        return COMPRESSIONS.get(os.path.splitext(file_path)[1])
+    if compress not in COMPRESSIONS.values():
+        raise ValueError(f"Compression inconnue : {compress} (attendu : {', '.join(COMPRESSIONS.values())})")
+    return compress
+
+def open_file(file_path, mode, compress=None):
+    """
+    Ouvre un fichier, compressé à la volée si `compress` est donné ou si son
+    extension est .gz, .bz2 ou .xz.
+    :param file_path: Chemin du fichier.
+    :param mode: Mode d'ouverture ("rt", "wt", "at", "rb", "wb", "ab").
+    :param compress: "gzip", "bz2", "lzma" ou None (déduit de l'extension).
+    :return: Objet fichier.
+    """
+    compress = _compression(file_path, compress)
+    newline = "" if "t" in mode else None
+    if compress is None:
+        return open(file_path, mode.replace("t", ""), newline=newline)
+    import importlib
+    options = _WRITE_LEVELS[compress] if mode[0] in "wa" else {}
+    return importlib.import_module(compress).open(file_path, mode, newline=newline, **options)
+
+def detect_format(file_path):
+    """
+    Déduit le format d'un fichier de résultats de son extension (compression ignorée).
+    :return: "jsonl", "csv" ou "columnar" ("jsonl" par défaut).
+    """
+    root, extension = os.path.splitext(file_path)
+    if extension in COMPRESSIONS:
+        extension = os.path.splitext(root)[1]
+    for format, format_extension in EXTENSIONS.items():
+        if extension == format_extension:
+            return format
+    return "jsonl"
+
+def verdict_format(file_path, format=None):
+    """
+    Retourne le format des résultats en mode verdict, toujours écrits en JSON lignes.
+    :param file_path: Fichier de sortie.
+    :param format: Format demandé (None, "jsonl" ou "verdicts").
+    :return: "verdicts".
+    :raises ValueError: si le format demandé, ou celui déduit de l'extension, est CSV ou en colonnes.
+    """
+    format = format or detect_format(file_path)
+    if format not in ("jsonl", "verdicts"):
+        raise ValueError(f"Le mode verdict écrit du JSONL, format {format} non pris en charge ({file_path})")
+    return "verdicts"
+
+def _sniff_verdicts(file_path, compress=None):
+    """Indique si la première ligne d'un fichier est un verdict JSON (voir VerdictSink)."""
+    with open_file(file_path, "rb", compress) as f:
+        line = f.readline()
+    if not line.startswith(b"{"):
+        return False
+    try:
+        return "verdict" in json.loads(line)
+    except ValueError:
+        return False
+
+def result_path(stem, format="jsonl", compress=None):
+    """Construit le nom d'un fichier de résultats à partir de son format et de sa compression."""
+    suffix = {module: extension for extension, module in COMPRESSIONS.items()}.get(compress, "")
+    return stem + EXTENSIONS[format] + suffix
+
+def result_record(result):
+    """Convertit un résultat de execute_tests en dictionnaire {"test", "outputs", "states"} ou {"test", "error"}."""
+    sequence, outputs, states = result
+    if isinstance(outputs, str):
+        return {"test": list(sequence), "error": outputs}
+    return {"test": list(sequence), "outputs": outputs, "states": states}
+
+# Puits de résultats tamponné
+class ResultSink:
+    binary = False
+
+    def __init__(self, file_path, buffer_size=10000, compress=None, append=False):
+        """
+        Ouvre un puits de résultats.
+        :param file_path: Fichier de sortie.
+        :param buffer_size: Nombre de résultats accumulés avant chaque écriture.
+        :param compress: "gzip", "bz2", "lzma" ou None (déduit de l'extension).
+        :param append: Reprendre l'écriture à la fin d'un fichier existant (sans nouvel en-tête).
+        """
+        self.file_path = file_path
+        self.buffer_size = buffer_size
+        self.compress = compress
+        if append:
+            self._resume()
+        self.file = open_file(file_path, ("a" if append else "w") + ("b" if self.binary else "t"), compress)
+        self.buffer = []
+        self.count = 0
+        self.errors = 0
+        self._attach()
+        if not append:
+            self._start()
+
+    def _attach(self):
+        """Prépare l'écriture dans self.file (appelé à chaque ouverture)."""
+
+    def _start(self):
+        """Écrit l'en-tête d'un nouveau fichier."""
+
+    def _resume(self):
+        """Relit dans le fichier existant l'état nécessaire pour écrire à sa suite (avant son ouverture)."""
+
+    @staticmethod
+    def _is_error(result):
+        return isinstance(result[1], str)
+
+    def _write_block(self, results):
+        raise NotImplementedError
+
+    def write(self, result):
+        """Ajoute un résultat (séquence, sorties, états)."""
+        self.buffer.append(result)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_many(self, results):
+        """Ajoute une liste de résultats, par exemple un lot de execute_tests."""
+        self.buffer.extend(results)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Écrit les résultats en attente."""
+        if self.buffer:
+            self.count += len(self.buffer)
+            self.errors += sum(map(self._is_error, self.buffer))
+            self._write_block(self.buffer)
+            self.buffer = []
+        self.file.flush()
+
+    def checkpoint(self):
+        """
+        Écrit les résultats en attente, ferme le fichier et le rouvre en ajout : le fichier
+        (et son flux compressé) est alors complet, et peut être tronqué à la taille retournée
+        pour reprendre exactement à ce point.
+        :return: Taille du fichier en octets.
+        """
+        self.flush()
+        self.file.close()
+        self.file = open_file(self.file_path, "ab" if self.binary else "at", self.compress)
+        self._attach()
+        return os.path.getsize(self.file_path)
+
+    def close(self):
+        """Écrit les résultats en attente et ferme le fichier."""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# Une ligne JSON par test
+class JsonlSink(ResultSink):
+    _encode = staticmethod(json.JSONEncoder(separators=(",", ":")).encode)
+
+    def _write_block(self, results):
+        encode = self._encode
+        self.file.write("".join([encode(result_record(result)) + "\n" for result in results]))
+
+# Une ligne JSON par verdict (voir verdict.iter_verdicts) ; errors compte les échecs
+class VerdictSink(ResultSink):
+    _encode = staticmethod(json.JSONEncoder(separators=(",", ":")).encode)
+
+    def _attach(self):
+        from .verdict import FAIL, verdict_record
+        self._fail = FAIL
+        self._record = verdict_record
+
+    def _is_error(self, verdict):
+        return verdict[1] == self._fail
+
+    def _write_block(self, verdicts):
+        encode, record = self._encode, self._record
+        self.file.write("".join([encode(record(verdict)) + "\n" for verdict in verdicts]))
+
+# Une ligne CSV par test : test, sorties, états, erreur ; symboles séparés par des espaces
+class CsvSink(ResultSink):
+    def _attach(self):
+        import csv
+        self._writer = csv.writer(self.file)
+
+    def _start(self):
+        self._writer.writerow(("test", "outputs", "states", "error"))
+
+    def _write_block(self, results):
+        join = CSV_SEPARATOR.join
+        rows = []
+        for sequence, outputs, states in results:
+            if isinstance(outputs, str):
+                rows.append((join(map(str, sequence)), "", "", outputs))
+            else:
+                rows.append((join(map(str, sequence)), join(map(str, outputs)), join(map(str, states)), ""))
+        self._writer.writerows(rows)
+
+# Table d'internement : symbole -> identifiant entier, attribué à la première occurrence
+class _Interner(dict):
+    __slots__ = ("new",)
+
+    def __init__(self):
+        super().__init__()
+        self.new = []
+
+    def __missing__(self, symbol):
+        self[symbol] = identifier = len(self)
+        self.new.append(symbol)
+        return identifier
+
+# Colonnes d'entiers : symboles internés, longueurs par test
+class ColumnarSink(ResultSink):
+    binary = True
+    columns = ("test_lengths", "output_lengths", "state_lengths", "inputs", "outputs", "states")
+
+    def _start(self):
+        self.file.write(COLUMNAR_MAGIC)
+        self._tables = {"inputs": _Interner(), "outputs": _Interner(), "states": _Interner()}
+
+    def _resume(self):
+        # Les identifiants déjà attribués sont relus dans les en-têtes des blocs existants
+        self._tables = {"inputs": _Interner(), "outputs": _Interner(), "states": _Interner()}
+        for header in _columnar_headers(self.file_path, self.compress, skip=True):
+            for name, symbols in header["symbols"].items():
+                for symbol in symbols:
+                    self._tables[name][_hashable(symbol)]
+        for table in self._tables.values():
+            table.new = []
+
+    def _write_block(self, results):
+        sequences = [result[0] for result in results]
+        errors = {index: result[1] for index, result in enumerate(results) if isinstance(result[1], str)}
+        if errors:
+            results = [(sequence, [], []) if isinstance(outputs, str) else (sequence, outputs, states)
+                       for sequence, outputs, states in results]
+        values = {
+            "test_lengths": map(len, sequences),
+            "output_lengths": (len(result[1]) for result in results),
+            "state_lengths": (len(result[2]) for result in results),
+            "inputs": map(self._tables["inputs"].__getitem__, chain.from_iterable(sequences)),
+            "outputs": map(self._tables["outputs"].__getitem__, chain.from_iterable(result[1] for result in results)),
+            "states": map(self._tables["states"].__getitem__, chain.from_iterable(result[2] for result in results)),
+        }
+        # Chaque colonne est écrite avec le plus petit type entier qui contient ses valeurs
+        columns = {}
+        typecodes = {}
+        for name in self.columns:
+            column = list(values[name])
+            typecodes[name] = _typecode(max(column, default=0))
+            columns[name] = array(typecodes[name], column)
+        header = {
+            "tests": len(results),
+            "byteorder": sys.byteorder,
+            "typecodes": typecodes,
+            "symbols": {name: table.new for name, table in self._tables.items()},
+            "errors": errors,
+            "sizes": {name: len(column) for name, column in columns.items()},
+        }
+        self.file.write(json.dumps(header).encode() + b"\n")
+        for name in self.columns:
+            self.file.write(columns[name].tobytes())
+        for table in self._tables.values():
+            table.new = []
+
+# Types d'array signés, du plus étroit au plus large
+_TYPECODES = ("b", "h", "i", "q")
+
+def _typecode(largest):
+    for typecode in _TYPECODES[:-1]:
+        if largest < 1 << (8 * array(typecode).itemsize - 1):
+            return typecode
+    return "q"
+
+def _offsets(lengths):
+    offsets = array("q", [0]) * (len(lengths) + 1)
+    total = 0
+    for index, length in enumerate(lengths, 1):
+        total += length
+        offsets[index] = total
+    return offsets
+
+# Résultats rechargés au format colonnes
+class ColumnarResults:
+    def __init__(self, symbols, columns, errors):
+        """
+        Regroupe les colonnes d'un fichier de résultats.
+        Les symboles du test i sont inputs[test_ids[test_offsets[i]:test_offsets[i + 1]]],
+        de même pour les sorties (output_*) et les états (state_*).
+        :param symbols: Dictionnaire {"inputs", "outputs", "states": liste des symboles par identifiant}.
+        :param columns: Dictionnaire des colonnes (array d'entiers) de ColumnarSink.
+        :param errors: Dictionnaire {indice du test: message d'erreur}.
+        """
+        self.inputs = symbols["inputs"]
+        self.outputs = symbols["outputs"]
+        self.states = symbols["states"]
+        self.test_ids = columns["inputs"]
+        self.output_ids = columns["outputs"]
+        self.state_ids = columns["states"]
+        self.test_offsets = _offsets(columns["test_lengths"])
+        self.output_offsets = _offsets(columns["output_lengths"])
+        self.state_offsets = _offsets(columns["state_lengths"])
+        self.errors = errors
+
+    def __len__(self):
+        return len(self.test_offsets) - 1
+
+    def __getitem__(self, index):
+        """Retourne le résultat d'indice `index` sous la forme de result_record."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        test = [self.inputs[i] for i in self.test_ids[self.test_offsets[index]:self.test_offsets[index + 1]]]
+        if index in self.errors:
+            return {"test": test, "error": self.errors[index]}
+        outputs = self.output_ids[self.output_offsets[index]:self.output_offsets[index + 1]]
+        states = self.state_ids[self.state_offsets[index]:self.state_offsets[index + 1]]
+        return {"test": test, "outputs": [self.outputs[i] for i in outputs],
+                "states": [self.states[i] for i in states]}
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+def _hashable(symbol):
+    """Symbole relu en JSON : les listes (tuples à l'écriture) redeviennent des tuples."""
+    return tuple(map(_hashable, symbol)) if isinstance(symbol, list) else symbol
+
+def _columnar_headers(file_path, compress=None, skip=False):
+    """
+    Parcourt les blocs d'un fichier écrit par ColumnarSink.
+    :param skip: Sauter les colonnes ; sinon, chaque en-tête reçoit "data" : {colonne: array}.
+    :return: Itérateur des en-têtes de blocs.
+    """
+    with open_file(file_path, "rb", compress) as f:
+        if f.readline() != COLUMNAR_MAGIC:
+            raise ValueError(f"{file_path} n'est pas un fichier de résultats en colonnes")
+        for line in iter(f.readline, b""):
+            header = json.loads(line)
+            if skip:
+                f.seek(sum(header["sizes"][name] * array(header["typecodes"][name]).itemsize
+                           for name in ColumnarSink.columns), 1)
+            else:
+                header["data"] = {}
+                for name in ColumnarSink.columns:
+                    column = array(header["typecodes"][name])
+                    column.frombytes(f.read(header["sizes"][name] * column.itemsize))
+                    if header["byteorder"] != sys.byteorder:
+                        column.byteswap()
+                    header["data"][name] = column
+            yield header
+
+def load_columnar(file_path, compress=None):
+    """
+    Recharge un fichier écrit par ColumnarSink : les blocs sont concaténés par
+    array.frombytes, sans décoder les tests un à un. Chaque colonne prend le type le
+    plus large de ses blocs ; elle n'est convertie que lorsqu'un bloc l'élargit.
+    :param file_path: Chemin du fichier.
+    :param compress: Compression (déduite de l'extension si None).
+    :return: Instance de ColumnarResults.
+    """
+    columns = {name: array("b") for name in ColumnarSink.columns}
+    symbols = {"inputs": [], "outputs": [], "states": []}
+    errors = {}
+    count = 0
+    for header in _columnar_headers(file_path, compress):
+        for name, new_symbols in header["symbols"].items():
+            symbols[name].extend(new_symbols)
+        for index, message in header["errors"].items():
+            errors[count + int(index)] = message
+        for name, column in header["data"].items():
+            if _TYPECODES.index(column.typecode) > _TYPECODES.index(columns[name].typecode):
+                columns[name] = array(column.typecode, columns[name])
+            elif column.typecode != columns[name].typecode:
+                column = array(columns[name].typecode, column)
+            columns[name].frombytes(column.tobytes())
+        count += header["tests"]
+    return ColumnarResults(symbols, columns, errors)
+
+def load_results(file_path, format=None, compress=None):
+    """
+    Recharge un fichier de résultats.
+    :param file_path: Chemin du fichier.
+    :param format: "jsonl", "csv", "columnar" ou "verdicts" (déduit de l'extension si None).
+    :param compress: Compression (déduite de l'extension si None).
+    :return: Liste de dictionnaires (jsonl, csv ; les symboles CSV sont des chaînes)
+             ou instance de ColumnarResults.
+    """
+    if format is None:
+        # Un fichier de verdicts est du JSONL, quelle que soit son extension
+        format = "verdicts" if _sniff_verdicts(file_path, compress) else detect_format(file_path)
+    if format == "columnar":
+        return load_columnar(file_path, compress)
+    if format == "verdicts":
+        format = "jsonl"
+    with open_file(file_path, "rt", compress) as f:
+        if format == "jsonl":
+            return [json.loads(line) for line in f]
+        if format != "csv":
+            raise ValueError(f"Format inconnu : {format} (attendu : {', '.join(FORMATS)})")
+        import csv
+        records = []
+        for row in csv.DictReader(f):
+            test = row["test"].split(CSV_SEPARATOR) if row["test"] else []
+            if row["error"]:
+                records.append({"test": test, "error": row["error"]})
+            else:
+                records.append({"test": test, "outputs": row["outputs"].split(CSV_SEPARATOR) if row["outputs"] else [],
+                                "states": row["states"].split(CSV_SEPARATOR)})
+        return records
+
+SINKS = {"jsonl": JsonlSink, "csv": CsvSink, "columnar": ColumnarSink, "verdicts": VerdictSink}
+
+def open_sink(file_path, format=None, buffer_size=10000, compress=None, append=False):
+    """
+    Ouvre le puits correspondant au format demandé.
+    :param file_path: Fichier de sortie.
+    :param format: "jsonl", "csv", "columnar" ou "verdicts" (déduit de l'extension si None).
+    :param buffer_size: Nombre de résultats accumulés avant chaque écriture.
+    :param compress: "gzip", "bz2", "lzma" ou None (déduit de l'extension).
+    :param append: Écrire à la suite d'un fichier existant.
+    :return: Instance de ResultSink.
+    """
+    format = format or detect_format(file_path)
+    if format not in SINKS:
+        raise ValueError(f"Format inconnu : {format} (attendu : {', '.join(FORMATS)})")
+    return SINKS[format](file_path, buffer_size, compress, append)
@@ -0,0 +1,285 @@
+from bisect import bisect_right
+
+# Ensemble d'entiers représenté par des intervalles semi-ouverts disjoints et triés
+class IntervalSet:
+    __slots__ = ("intervals",)
+
+    def __init__(self, intervals=()):
+        """
+        Initialise un prédicat sur des entrées entières.
+        :param intervals: Itérable de couples (début, fin), fin exclue.
+        """
+        merged = []
+        for low, high in sorted(intervals):
+            if low >= high:
+                continue
+            if merged and low <= merged[-1][1]:
+                if high > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], high)
+            else:
+                merged.append((low, high))
+        self.intervals = tuple(merged)
+
+    @classmethod
+    def of(cls, *values):
+        """Construit l'ensemble des valeurs données."""
+        return cls((value, value + 1) for value in values)
+
+    @classmethod
+    def range(cls, low, high):
+        """Construit l'intervalle [low, high[."""
+        return cls([(low, high)])
+
+    def __bool__(self):
+        return bool(self.intervals)
+
+    def __eq__(self, other):
+        return isinstance(other, IntervalSet) and self.intervals == other.intervals
+
+    def __hash__(self):
+        return hash(self.intervals)
+
+    def __repr__(self):
+        return "IntervalSet(" + ", ".join(f"[{low}, {high}[" for low, high in self.intervals) + ")"
+
+    def __contains__(self, value):
+        position = bisect_right(self.intervals, (value, float("inf"))) - 1
+        return position >= 0 and value < self.intervals[position][1]
+
+    def __len__(self):
+        return sum(high - low for low, high in self.intervals)
+
+    def __or__(self, other):
+        return IntervalSet(self.intervals + other.intervals)
+
+    def __and__(self, other):
+        result = []
+        i = j = 0
+        left, right = self.intervals, other.intervals
+        while i < len(left) and j < len(right):
+            low = max(left[i][0], right[j][0])
+            high = min(left[i][1], right[j][1])
+            if low < high:
+                result.append((low, high))
+            if left[i][1] < right[j][1]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet(result)
+
+    def __sub__(self, other):
+        result = []
+        for low, high in self.intervals:
+            for other_low, other_high in other.intervals:
+                if other_high <= low or other_low >= high:
+                    continue
+                if other_low > low:
+                    result.append((low, other_low))
+                low = max(low, other_high)
+                if low >= high:
+                    break
+            if low < high:
+                result.append((low, high))
+        return IntervalSet(result)
+
+    def sample(self):
+        """Retourne une valeur de l'ensemble (la plus petite), ou None s'il est vide."""
+        return self.intervals[0][0] if self.intervals else None
+
+def minterms(predicates, domain):
+    """
+    Partitionne le domaine en minterms : chaque minterm est entièrement contenu dans
+    chaque prédicat ou disjoint de lui. Les segments élémentaires délimités par les bornes
+    des prédicats sont regroupés par signature d'appartenance.
+    :param predicates: Itérable de IntervalSet.
+    :param domain: IntervalSet des entrées possibles.
+    :return: Liste de IntervalSet non vides, dans l'ordre de leur plus petite valeur.
+    """
+    predicates = list(dict.fromkeys(predicates))
+    bounds = {bound for low, high in domain.intervals for bound in (low, high)}
+    for predicate in predicates:
+        for low, high in predicate.intervals:
+            bounds.update((low, high))
+    bounds = sorted(bounds)
+    groups = {}
+    for low, high in zip(bounds, bounds[1:]):
+        if low not in domain:
+            continue
+        signature = tuple(low in predicate for predicate in predicates)
+        groups.setdefault(signature, []).append((low, high))
+    return sorted((IntervalSet(segments) for segments in groups.values()), key=IntervalSet.sample)
+
+# Machine de Mealy dont les transitions sont étiquetées par des prédicats
+class SymbolicMealy:
+    def __init__(self, transitions, initial_state, domain):
+        """
+        Initialise une machine de Mealy symbolique.
+        :param transitions: Dictionnaire {(état, IntervalSet): (état_suivant, sortie)}.
+        :param initial_state: État initial.
+        :param domain: IntervalSet des entrées possibles.
+        :raises ValueError: si deux gardes d'un même état se recouvrent.
+        """
+        self.transitions = transitions
+        self.initial_state = initial_state
+        self.current_state = initial_state
+        self.domain = domain
+        self.guards = {}
+        for (state, guard), value in transitions.items():
+            for other, _ in self.guards.get(state, ()):
+                if guard & other:
+                    raise ValueError(f"Gardes non disjointes pour l'état {state} : {guard} et {other}")
+            self.guards.setdefault(state, []).append((guard, value))
+
+    def reset(self):
+        """Réinitialise l'état courant à l'état initial."""
+        self.current_state = self.initial_state
+
+    def step(self, state, predicate):
+        """
+        Applique un prédicat contenu dans une seule garde (par exemple un minterm).
+        :return: Tuple (état suivant, sortie), ou None si aucune garde ne le contient.
+        """
+        for guard, value in self.guards.get(state, ()):
+            if guard & predicate:
+                return value
+        return None
+
+    def process_input(self, input_sequence):
+        """
+        Traite une séquence d'entrées concrètes.
+        :param input_sequence: Liste d'entiers.
+        :return: Tuple (liste des sorties, liste des états visités).
+        """
+        outputs = []
+        states = [self.current_state]
+        for value in input_sequence:
+            for guard, (next_state, output) in self.guards.get(self.current_state, ()):
+                if value in guard:
+                    outputs.append(output)
+                    self.current_state = next_state
+                    states.append(next_state)
+                    break
+            else:
+                raise ValueError(f"Transition inconnue pour ({self.current_state}, {value})")
+        return outputs, states
+
+# NFA dont les transitions sont étiquetées par des prédicats
+class SymbolicNFA:
+    def __init__(self, states, domain, transitions, initial_state, accepting_states):
+        """
+        Initialise un NFA symbolique.
+        :param states: Liste des états.
+        :param domain: IntervalSet des entrées possibles.
+        :param transitions: Dictionnaire {(état, IntervalSet): [états suivants]}.
+        :param initial_state: État initial.
+        :param accepting_states: Ensemble des états acceptants.
+        """
+        self.states = states
+        self.domain = domain
+        self.transitions = transitions
+        self.initial_state = initial_state
+        self.accepting_states = accepting_states
+        self.guards = {}
+        for (state, guard), next_states in transitions.items():
+            self.guards.setdefault(state, []).append((guard, next_states))
+
+    def step(self, subset, predicate):
+        """
+        Calcule les états atteints depuis `subset` par une entrée de `predicate`.
+        Le résultat est exact lorsque le prédicat est un minterm des gardes.
+        :return: frozenset des états atteints.
+        """
+        result = set()
+        for state in subset:
+            for guard, next_states in self.guards.get(state, ()):
+                if guard & predicate:
+                    result.update(next_states)
+        return frozenset(result)
+
+    def is_accepted(self, input_sequence):
+        """
+        Vérifie si une séquence d'entrées concrètes est acceptée.
+        :param input_sequence: Liste d'entiers.
+        :return: True si acceptée, False sinon.
+        """
+        return self.accepts([IntervalSet.of(value) for value in input_sequence])
+
+    def accepts(self, predicates):
+        """Vérifie si une séquence de minterms (ou de singletons) est acceptée."""
+        subset = frozenset([self.initial_state])
+        for predicate in predicates:
+            subset = self.step(subset, predicate)
+        return bool(subset & set(self.accepting_states))
+
+    def live_states(self):
+        """Retourne les états depuis lesquels un état acceptant est atteignable."""
+        predecessors = {}
+        for (state, _), next_states in self.transitions.items():
+            for next_state in next_states:
+                predecessors.setdefault(next_state, set()).add(state)
+        live = set(self.accepting_states)
+        stack = list(live)
+        while stack:
+            for state in predecessors.get(stack.pop(), ()):
+                if state not in live:
+                    live.add(state)
+                    stack.append(state)
+        return live
+
+def symbolic_alphabet(mealy_machine, nfa=None):
+    """
+    Calcule l'alphabet de minterms commun à la machine et à la restriction.
+    :param mealy_machine: Instance de SymbolicMealy.
+    :param nfa: Instance de SymbolicNFA (facultatif).
+    :return: Liste de IntervalSet.
+    """
+    guards = [guard for _, guard in mealy_machine.transitions]
+    domain = mealy_machine.domain
+    if nfa is not None:
+        guards.extend(guard for _, guard in nfa.transitions)
+        domain = domain & nfa.domain
+    return minterms(guards, domain)
+
+def generate_symbolic_tests(mealy_machine, nfa=None, max_length=1):
+    """
+    Génère les séquences de minterms définies dans la machine (et acceptées par la
+    restriction) jusqu'à une longueur donnée, sans énumérer les entrées concrètes.
+    Les préfixes qui ne peuvent plus mener à un état acceptant du NFA sont élagués.
+    :param mealy_machine: Instance de SymbolicMealy.
+    :param nfa: Instance de SymbolicNFA (facultatif).
+    :param max_length: Longueur maximale des séquences.
+    :return: Liste des séquences de IntervalSet.
+    """
+    letters = symbolic_alphabet(mealy_machine, nfa)
+    live = nfa.live_states() if nfa is not None else None
+    accepting = set(nfa.accepting_states) if nfa is not None else None
+    tests = []
+    start = frozenset([nfa.initial_state]) & live if nfa is not None else None
+    stack = [([], mealy_machine.initial_state, start)]
+    while stack:
+        prefix, state, subset = stack.pop()
+        if len(prefix) == max_length:
+            continue
+        for letter in reversed(letters):
+            step = mealy_machine.step(state, letter)
+            if step is None:
+                continue
+            next_subset = None
+            if nfa is not None:
+                next_subset = nfa.step(subset, letter) & live
+                if not next_subset:
+                    continue
+            sequence = prefix + [letter]
+            if nfa is None or next_subset & accepting:
+                tests.append(sequence)
+            stack.append((sequence, step[0], next_subset))
+    tests.sort(key=lambda sequence: (len(sequence), [letter.sample() for letter in sequence]))
+    return tests
+
+def concretize(tests):
+    """
+    Choisit une entrée concrète dans chaque minterm des séquences.
+    :param tests: Liste des séquences de IntervalSet.
+    :return: Liste des séquences d'entiers.
+    """
+    return [[letter.sample() for letter in sequence] for sequence in tests]
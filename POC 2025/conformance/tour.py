@@ -0,0 +1,276 @@
+import heapq
+from collections import deque
+
+from .compiled import NULL_STATE
+from .graphs import strongly_connected_components
+from .transfer import TransferIndex
+
+def _distances(successors, source):
+    """Distances en nombre d'arcs depuis `source` (parcours en largeur)."""
+    distance = {source: 0}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        for next_node in successors[node]:
+            if next_node not in distance:
+                distance[next_node] = distance[node] + 1
+                queue.append(next_node)
+    return distance
+
+def _nearest(index, sources, goals):
+    """Plus court chemin d'un nœud de `sources` vers un nœud de `goals` (parcours en largeur multi-source)."""
+    parents = {node: None for node in sources}
+    queue = deque(parents)
+    while queue:
+        node = queue.popleft()
+        for input_id, next_node in index.edges[node]:
+            if next_node in parents:
+                continue
+            parents[next_node] = (node, input_id)
+            if next_node in goals:
+                path = []
+                current = next_node
+                while parents[current] is not None:
+                    current, step = parents[current]
+                    path.append(step)
+                path.reverse()
+                return current, path, next_node
+            queue.append(next_node)
+    raise ValueError("Aucun chemin entre les composantes de la tournée")
+
+def min_cost_transport(supply, demand, cost):
+    """
+    Flot de coût minimal des nœuds excédentaires vers les nœuds déficitaires
+    (plus courts chemins successifs avec potentiels).
+    :param supply: Dictionnaire {nœud: quantité à envoyer}.
+    :param demand: Dictionnaire {nœud: quantité à recevoir}.
+    :param cost: Fonction (nœud source, nœud cible) -> coût, ou None si aucun chemin.
+    :return: Liste de triplets (source, cible, quantité).
+    :raises ValueError: si la demande ne peut pas être satisfaite.
+    """
+    sources, targets = list(supply), list(demand)
+    count = len(sources) + len(targets) + 2
+    start, sink = count - 2, count - 1
+    graph = [[] for _ in range(count)]
+
+    def add_edge(u, v, capacity, weight):
+        graph[u].append([v, capacity, weight, len(graph[v])])
+        graph[v].append([u, 0, -weight, len(graph[u]) - 1])
+
+    for i, node in enumerate(sources):
+        add_edge(start, i, supply[node], 0)
+        for j, other in enumerate(targets):
+            weight = cost(node, other)
+            if weight is not None:
+                add_edge(i, len(sources) + j, supply[node], weight)
+    for j, node in enumerate(targets):
+        add_edge(len(sources) + j, sink, demand[node], 0)
+
+    required = sum(demand.values())
+    potential = [0] * count
+    flow = 0
+    while flow < required:
+        distance = [None] * count
+        previous = [None] * count
+        distance[start] = 0
+        heap = [(0, start)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > distance[u]:
+                continue
+            for position, (v, capacity, weight, _) in enumerate(graph[u]):
+                if capacity <= 0:
+                    continue
+                candidate = d + weight + potential[u] - potential[v]
+                if distance[v] is None or candidate < distance[v]:
+                    distance[v] = candidate
+                    previous[v] = (u, position)
+                    heapq.heappush(heap, (candidate, v))
+        if distance[sink] is None:
+            raise ValueError("Impossible d'équilibrer les degrés : graphe non fortement connexe")
+        for node in range(count):
+            if distance[node] is not None:
+                potential[node] += distance[node]
+        # Capacité résiduelle du chemin trouvé
+        amount = required - flow
+        node = sink
+        while node != start:
+            u, position = previous[node]
+            amount = min(amount, graph[u][position][1])
+            node = u
+        node = sink
+        while node != start:
+            u, position = previous[node]
+            edge = graph[u][position]
+            edge[1] -= amount
+            graph[node][edge[3]][1] += amount
+            node = u
+        flow += amount
+
+    result = []
+    for i, node in enumerate(sources):
+        for v, capacity, weight, reverse in graph[i]:
+            if len(sources) <= v < start:
+                sent = graph[v][reverse][1]
+                if sent > 0:
+                    result.append((node, targets[v - len(sources)], sent))
+    return result
+
+def _euler_tour(index, required):
+    """
+    Marche eulérienne depuis le nœud initial couvrant les arcs requis, les degrés étant
+    équilibrés par un flot de coût minimal sur les distances du produit (postier rural).
+    La marche est ouverte : le nœud initial doit une sortie de plus et une unité peut
+    rester, sans coût, au nœud où la marche se termine.
+    """
+    out_edges = [[] for _ in range(len(index))]
+    balance = [0] * len(index)
+
+    def add_path(source, input_ids):
+        node = source
+        for input_id in input_ids:
+            next_node = next(n for i, n in index.edges[node] if i == input_id)
+            out_edges[node].append((input_id, next_node))
+            balance[node] -= 1
+            balance[next_node] += 1
+            node = next_node
+        return node
+
+    for node, input_id in required:
+        add_path(node, [input_id])
+
+    # Équilibrage des degrés : chemins des nœuds excédentaires vers les nœuds déficitaires,
+    # la demande None représentant la fin de la marche
+    balance[0] += 1
+    supply = {node: value for node, value in enumerate(balance) if value > 0}
+    demand = {node: -value for node, value in enumerate(balance) if value < 0}
+    demand[None] = 1
+    distances = {node: _distances(index.successors, node) for node in supply}
+    for source, target, amount in min_cost_transport(
+            supply, demand, lambda u, v: 0 if v is None else distances[u].get(v)):
+        if target is None:
+            continue
+        path = index.path(source, target)
+        for _ in range(amount):
+            add_path(source, path)
+
+    # Connexion des composantes de la tournée au nœud initial (aller-retour)
+    while True:
+        connected = {0}
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            for _, next_node in out_edges[node]:
+                if next_node not in connected:
+                    connected.add(next_node)
+                    stack.append(next_node)
+        isolated = {node for node in range(len(index)) if out_edges[node] and node not in connected}
+        if not isolated:
+            break
+        source, path, target = _nearest(index, connected, isolated)
+        add_path(source, path)
+        _, path, _ = _nearest(index, [target], connected)
+        add_path(target, path)
+
+    # Algorithme de Hierholzer
+    positions = [0] * len(index)
+    stack = [(0, None)]
+    tour = []
+    while stack:
+        node, input_id = stack[-1]
+        if positions[node] < len(out_edges[node]):
+            next_input, next_node = out_edges[node][positions[node]]
+            positions[node] += 1
+            stack.append((next_node, next_input))
+        else:
+            stack.pop()
+            if input_id is not None:
+                tour.append(input_id)
+    tour.reverse()
+    return tour
+
+def transition_tour(mealy_machine, nfa=None, complete=True):
+    """
+    Construit une tournée de transitions : une marche couvrant chaque transition de la
+    machine empruntable sous la restriction.
+    Si le produit (état, ensemble du NFA) est fortement connexe, la tournée est
+    obtenue par équilibrage des degrés (flot de coût minimal) puis chemin eulérien
+    ouvert, tronqué après la dernière transition nouvellement couverte ; elle est de
+    longueur minimale sans restriction, où chaque transition est un arc du produit
+    (postier chinois). Avec une restriction, les arcs requis ne sont qu'une partie
+    du produit (postier rural, NP-difficile) et la longueur n'est pas garantie
+    minimale. Sinon, la marche va
+    vers la plus proche transition non couverte et se réinitialise lorsqu'il n'en
+    reste plus d'atteignable.
+    :param mealy_machine: Instance de MealyMachine ou de CompiledMealy.
+    :param nfa: Restriction (NFA ou CompiledNFA), facultative.
+    :param complete: Prolonger chaque séquence jusqu'à un mot accepté par la restriction.
+    :return: Dictionnaire {"sequences", "length", "resets", "covered", "strongly_connected", "simple"}.
+    """
+    index = TransferIndex(mealy_machine, nfa)
+    product, machine = index.product, index.machine
+    k = machine.num_inputs
+    # Un arc requis par transition : celui du nœud le plus proche du nœud initial
+    required = [(node, transition % k) for transition, node in sorted(index.transitions.items())]
+    components = strongly_connected_components(range(len(index)), index.successors.__getitem__)
+    strongly_connected = len(components) == 1
+
+    sequences = []
+
+    def finish(sequence, node):
+        if complete and not product.is_accepting(node):
+            found = product.shortest_path(node, product.is_accepting)
+            if found is not None:
+                sequence.extend(found[0])
+        sequences.append(sequence)
+
+    if strongly_connected:
+        tour = _euler_tour(index, required)
+        # Troncature après la dernière transition nouvellement couverte
+        covered = set()
+        node, end = 0, 0
+        for position, input_id in enumerate(tour):
+            transition = index.nodes[node][0] * k + input_id
+            if transition not in covered:
+                covered.add(transition)
+                end = position + 1
+            node = next(n for i, n in index.edges[node] if i == input_id)
+        tour = tour[:end]
+        finish(tour, product.run(product.initial, tour)[1])
+    else:
+        remaining = set(index.transitions)
+
+        def pending(node):
+            return any(node[0] * k + input_id in remaining for input_id, _, _ in product.successors(node))
+
+        node, sequence = product.initial, []
+        while remaining:
+            found = product.shortest_path(node, pending)
+            if found is None:
+                finish(sequence, node)
+                node, sequence = product.initial, []
+                found = product.shortest_path(node, pending)
+                if found is None:
+                    break
+            path, node = found
+            sequence.extend(path)
+            input_id, _, next_node = next(edge for edge in product.successors(node)
+                                          if node[0] * k + edge[0] in remaining)
+            remaining.discard(node[0] * k + input_id)
+            sequence.append(input_id)
+            node = next_node
+        finish(sequence, node)
+
+    inputs = machine.inputs
+    symbol_sequences = [[inputs[input_id] for input_id in sequence] for sequence in sequences if sequence]
+    length = sum(len(sequence) for sequence in symbol_sequences)
+    # Suite naïve de simple_method : une réinitialisation et une entrée par transition
+    simple = machine.num_states * k - list(machine.next_state).count(NULL_STATE)
+    return {
+        "sequences": symbol_sequences,
+        "length": length,
+        "resets": len(symbol_sequences),
+        "covered": len(index.transitions),
+        "strongly_connected": strongly_connected,
+        "simple": {"tests": simple, "length": simple},
+    }
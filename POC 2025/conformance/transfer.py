@@ -0,0 +1,170 @@
+from array import array
+from collections import deque
+
+from .product import RestrictedProduct
+
+# Index des plus courtes séquences de transfert entre nœuds du produit restreint
+class TransferIndex:
+    def __init__(self, mealy_machine, nfa=None):
+        """
+        Indexe, par un parcours en largeur depuis chaque nœud atteignable
+        (état de la machine, ensemble d'états du NFA), les plus courtes séquences de
+        transfert vers tous les autres nœuds. Chaque source conserve un tableau
+        d'entiers des prédécesseurs ; l'entrée empruntée est retrouvée parmi les arcs du
+        prédécesseur. Les arbres sont calculés à la demande (voir precompute).
+        :param mealy_machine: Instance de MealyMachine ou de CompiledMealy.
+        :param nfa: Restriction (NFA ou CompiledNFA), facultative.
+        """
+        self.product = product = RestrictedProduct(mealy_machine, nfa)
+        self.machine = product.machine
+        self.nodes = product.nodes()
+        self.ids = {node: index for index, node in enumerate(self.nodes)}
+        count = len(self.nodes)
+        # Graphe du produit en indices : [(entrée, nœud suivant)]
+        self.edges = [[(input_id, self.ids[next_node]) for input_id, _, next_node in product.successors(node)]
+                      for node in self.nodes]
+        self.successors = [[next_id for _, next_id in edges] for edges in self.edges]
+        self.parents = [None] * count
+        # Transitions de la machine, avec le nœud le plus proche du nœud initial qui les emprunte
+        # (les nœuds sont énumérés en largeur depuis le nœud initial)
+        k = self.machine.num_inputs
+        self.transitions = {}
+        for node_id, edges in enumerate(self.edges):
+            state = self.nodes[node_id][0]
+            for input_id, _ in edges:
+                self.transitions.setdefault(state * k + input_id, node_id)
+
+    def tree(self, source):
+        """
+        Retourne le tableau des prédécesseurs de l'arbre des plus courts chemins issu
+        de `source` (-1 pour un nœud non atteignable), calculé au premier appel.
+        :param source: Indice du nœud de départ.
+        :return: array d'entiers indexé par nœud.
+        """
+        parent = self.parents[source]
+        if parent is None:
+            parent = array("l", [-1]) * len(self.nodes)
+            parent[source] = source
+            successors = self.successors
+            queue = deque([source])
+            while queue:
+                node_id = queue.popleft()
+                for next_id in successors[node_id]:
+                    if parent[next_id] < 0:
+                        parent[next_id] = node_id
+                        queue.append(next_id)
+            self.parents[source] = parent
+        return parent
+
+    def precompute(self):
+        """Calcule les arbres de tous les nœuds (index complet, en O(nœuds × arcs))."""
+        for source in range(len(self.nodes)):
+            self.tree(source)
+        return self
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def path(self, source, target):
+        """
+        Retourne la plus courte séquence d'indices d'entrées de `source` à `target`,
+        en temps proportionnel à sa longueur.
+        :param source: Nœud ou indice de nœud de départ.
+        :param target: Nœud ou indice de nœud d'arrivée.
+        :return: Liste des indices d'entrées, ou None si `target` n'est pas atteignable.
+        """
+        source = source if isinstance(source, int) else self.ids[source]
+        target = target if isinstance(target, int) else self.ids[target]
+        parent = self.tree(source)
+        if parent[target] < 0:
+            return None
+        edges = self.edges
+        path = []
+        while target != source:
+            previous = parent[target]
+            path.append(next(input_id for input_id, next_id in edges[previous] if next_id == target))
+            target = previous
+        path.reverse()
+        return path
+
+    def reach_transition(self, state, input_symbol, source=None):
+        """
+        Retourne la plus courte séquence (en symboles) menant à la transition
+        (état, entrée) sous la restriction puis l'empruntant.
+        Depuis le nœud initial, le nœud d'arrivée est précalculé ; depuis un autre nœud,
+        il est cherché en largeur parmi les nœuds de l'état qui autorisent l'entrée.
+        :param state: État de départ de la transition.
+        :param input_symbol: Entrée de la transition.
+        :param source: Nœud ou indice de nœud de départ (par défaut, le nœud initial).
+        :return: Liste des symboles d'entrée, ou None si la transition n'est pas atteignable.
+        """
+        machine = self.machine
+        state_id = machine.states.index(state)
+        input_id = machine.inputs.index(input_symbol)
+        index = state_id * machine.num_inputs + input_id
+        source = 0 if source is None else source if isinstance(source, int) else self.ids[source]
+        if source == 0:
+            target = self.transitions.get(index)
+        else:
+            # Premier nœud de l'état autorisant l'entrée rencontré en largeur depuis `source`
+            goal = self.product.shortest_path(
+                self.nodes[source],
+                lambda node: node[0] == state_id and self.product.allows(node, input_id))
+            target = None if goal is None else self.ids[goal[1]]
+        if target is None:
+            return None
+        inputs = machine.inputs
+        return [inputs[step] for step in self.path(source, target)] + [input_symbol]
+
+    def transition_cover(self):
+        """
+        Construit une suite de couverture des transitions : pour chaque transition
+        empruntable sous la restriction, la plus courte séquence d'accès suivie de l'entrée.
+        :return: Liste des séquences de symboles, dans l'ordre des indices de transitions.
+        """
+        machine = self.machine
+        inputs = machine.inputs
+        k = machine.num_inputs
+        tests = []
+        for index in sorted(self.transitions):
+            path = self.path(0, self.transitions[index])
+            tests.append([inputs[step] for step in path] + [inputs[index % k]])
+        return tests
+
+def transition_cover(mealy_machine, nfa=None):
+    """
+    Génère une suite de couverture des transitions avec séquences d'accès sous la restriction.
+    :param mealy_machine: Instance de MealyMachine ou de CompiledMealy.
+    :param nfa: Restriction (NFA ou CompiledNFA), facultative.
+    :return: Liste des séquences de symboles.
+    """
+    return TransferIndex(mealy_machine, nfa).transition_cover()
+
+def k_complete_tests(mealy_machine, nfa=None, k=1):
+    """
+    Génère une suite k-complète sous la restriction : la plus courte séquence d'accès de
+    chaque nœud atteignable (état, ensemble du NFA), prolongée par chaque séquence
+    autorisée de longueur 1 à k depuis ce nœud.
+    :param mealy_machine: Instance de MealyMachine ou de CompiledMealy.
+    :param nfa: Restriction (NFA ou CompiledNFA), facultative.
+    :param k: Longueur maximale des prolongements.
+    :return: Liste des séquences de symboles (sans doublons).
+    """
+    index = TransferIndex(mealy_machine, nfa)
+    product, inputs = index.product, index.machine.inputs
+    tests = []
+    seen = set()
+    for node_id, node in enumerate(index.nodes):
+        access = index.path(0, node_id)
+        stack = [(access, node, 0)]
+        while stack:
+            sequence, current, depth = stack.pop()
+            if depth:
+                key = tuple(sequence)
+                if key not in seen:
+                    seen.add(key)
+                    tests.append([inputs[step] for step in sequence])
+            if depth < k:
+                for input_id, _, next_node in reversed(product.successors(current)):
+                    stack.append((sequence + [input_id], next_node, depth + 1))
+    return tests
@@ -0,0 +1,84 @@
+from collections import deque
+
+from .compiled import NULL_STATE
+from .product import RestrictedProduct
+
+def find_uio(product, node, max_length=None):
+    """
+    Cherche la plus courte séquence d'entrées unique (UIO) de l'état de `node`,
+    en n'utilisant que des entrées autorisées par la restriction à chaque pas.
+    Parcours en largeur sur (nœud du produit, ensemble des états candidats encore
+    confondus), les candidats étant codés en bits. Un nœud est élagué si un nœud déjà
+    visité de même position a un sous-ensemble de ses candidats (il est dominé), ou si
+    un candidat rejoint l'état suivi (il ne pourra plus être distingué).
+    :param product: Instance de RestrictedProduct.
+    :param node: Nœud (état, ensemble) de départ.
+    :param max_length: Longueur maximale (par défaut, le nombre d'états).
+    :return: Liste des indices d'entrées, ou None si aucune UIO n'existe dans la borne.
+    """
+    machine = product.machine
+    k = machine.num_inputs
+    next_table, output_table = machine.next_state, machine.output
+    state = node[0]
+    candidates = 0
+    for other in range(machine.num_states):
+        if other != state and machine.states[other] is not None:
+            candidates |= 1 << other
+    if not candidates:
+        return []
+    max_length = machine.num_states if max_length is None else max_length
+    seen = {node: [candidates]}
+    parents = {(node, candidates): None}
+    queue = deque([(node, candidates, 0)])
+    while queue:
+        current, candidates, depth = queue.popleft()
+        if depth == max_length:
+            continue
+        for input_id, output, next_node in product.successors(current):
+            target_bit = 1 << next_node[0]
+            remaining = 0
+            mask = candidates
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                index = (low.bit_length() - 1) * k + input_id
+                candidate_next = next_table[index]
+                if candidate_next != NULL_STATE and output_table[index] == output:
+                    remaining |= 1 << candidate_next
+            if remaining & target_bit:
+                continue
+            visited = seen.setdefault(next_node, [])
+            if any(previous & ~remaining == 0 for previous in visited):
+                continue
+            visited.append(remaining)
+            parents[(next_node, remaining)] = ((current, candidates), input_id)
+            if not remaining:
+                path = []
+                key = (next_node, remaining)
+                while parents[key] is not None:
+                    key, input_id = parents[key]
+                    path.append(input_id)
+                path.reverse()
+                return path
+            queue.append((next_node, remaining, depth + 1))
+    return None
+
+def uio_sequences(mealy_machine, nfa=None, max_length=None):
+    """
+    Calcule la plus courte UIO de chaque état atteignable sous la restriction.
+    Pour chaque état, la restriction est prise dans l'état où le place sa plus courte
+    séquence d'accès (premier nœud du produit rencontré en largeur).
+    :param mealy_machine: Instance de MealyMachine ou de CompiledMealy.
+    :param nfa: Restriction (NFA ou CompiledNFA), facultative.
+    :param max_length: Longueur maximale des UIO.
+    :return: Dictionnaire {état: liste des entrées, ou None si aucune UIO dans la borne}.
+    """
+    product = RestrictedProduct(mealy_machine, nfa)
+    machine = product.machine
+    result = {}
+    for node in product.nodes():
+        name = machine.states[node[0]]
+        if name not in result:
+            uio = find_uio(product, node, max_length)
+            result[name] = None if uio is None else [machine.inputs[input_id] for input_id in uio]
+    return result
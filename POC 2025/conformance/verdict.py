@@ -0,0 +1,76 @@
+from .compiled import CompiledMealy
+from .core import MealyMachine
+
+# Verdicts d'un test
+PASS = "pass"
+FAIL = "fail"
+# La spécification n'est pas définie sur le test : il ne permet pas de conclure
+INCONCLUSIVE = "inconclusive"
+
+def transition_table(machine):
+    """
+    Retourne le dictionnaire des transitions et l'état initial d'une machine.
+    :param machine: Instance de MealyMachine, de CompiledMealy ou de Mealy.
+    :return: Tuple ({(état, entrée): (état_suivant, sortie)}, état initial).
+    """
+    if not isinstance(machine, MealyMachine):
+        if not isinstance(machine, CompiledMealy):
+            machine = machine.to_compiled()
+        machine = machine.to_mealy()
+    return machine.transitions, machine.initial_state
+
+def iter_verdicts(specification, implementation, test_sequences, start=0):
+    """
+    Exécute chaque test pas à pas sur la spécification et l'implémentation, et
+    s'arrête à la première sortie différente. Seul le verdict est conservé : la
+    mémoire par test est constante et un test en échec n'est pas exécuté jusqu'au bout.
+    :param specification: Machine de référence (MealyMachine, CompiledMealy ou Mealy).
+    :param implementation: Machine testée.
+    :param test_sequences: Itérable de séquences d'entrées.
+    :param start: Identifiant du premier test.
+    :return: Itérateur de tuples (identifiant, verdict, indice de divergence, sortie attendue,
+             sortie observée) ; l'indice vaut -1 et les sorties None pour un test réussi.
+             Une transition absente de l'implémentation est observée comme None.
+    """
+    expected_table, expected_initial = transition_table(specification)
+    observed_table, observed_initial = transition_table(implementation)
+    for test_id, sequence in enumerate(test_sequences, start):
+        expected_state, observed_state = expected_initial, observed_initial
+        for index, input_symbol in enumerate(sequence):
+            expected = expected_table.get((expected_state, input_symbol))
+            if expected is None:
+                yield test_id, INCONCLUSIVE, index, None, None
+                break
+            observed = observed_table.get((observed_state, input_symbol))
+            if observed is None:
+                yield test_id, FAIL, index, expected[1], None
+                break
+            if observed[1] != expected[1]:
+                yield test_id, FAIL, index, expected[1], observed[1]
+                break
+            expected_state, observed_state = expected[0], observed[0]
+        else:
+            yield test_id, PASS, -1, None, None
+
+def execute_verdicts(specification, implementation, test_sequences, stop_on_failure=False):
+    """
+    Exécute une suite en mode verdict (voir iter_verdicts).
+    :param specification: Machine de référence.
+    :param implementation: Machine testée.
+    :param test_sequences: Itérable de séquences d'entrées.
+    :param stop_on_failure: Interrompre la suite au premier test en échec.
+    :return: Liste des verdicts, dans l'ordre des tests.
+    """
+    verdicts = []
+    for verdict in iter_verdicts(specification, implementation, test_sequences):
+        verdicts.append(verdict)
+        if stop_on_failure and verdict[1] == FAIL:
+            break
+    return verdicts
+
+def verdict_record(verdict):
+    """Convertit un verdict en dictionnaire {"test", "verdict", "index", "expected", "observed"}."""
+    test_id, result, index, expected, observed = verdict
+    if result == PASS:
+        return {"test": test_id, "verdict": result}
+    return {"test": test_id, "verdict": result, "index": index, "expected": expected, "observed": observed}